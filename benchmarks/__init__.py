@@ -0,0 +1 @@
+"""EAF benchmarks."""
@@ -0,0 +1,144 @@
+"""Benchmark suite runner.
+
+Runs all cases headless, prints results and optionally writes them as JSON
+and compares them with stored baseline. Exit code is 1 if any case is slower
+than baseline by more than threshold.
+
+.. code-block:: console
+
+   $ python -m benchmarks --output results.json
+   $ python -m benchmarks --baseline benchmarks/baseline.json --threshold 0.3
+   $ python -m benchmarks --baseline benchmarks/baseline.json --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from benchmarks.cases import CASES
+
+
+def measure(name: str, size: int, repeat: int, min_time: float) -> float:
+    """Return the best operations per second of case."""
+
+    func, ops = CASES[name][0](size)
+
+    # Calibrate number of runs so each measurement takes at least min_time
+    runs = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(runs):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        runs *= 2
+
+    best = elapsed
+    gc.disable()
+    try:
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(runs):
+                func()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    return runs * ops / best
+
+
+def run(
+    pattern: str = "",
+    repeat: int = 5,
+    min_time: float = 0.05,
+) -> dict[str, dict[str, Any]]:
+    """Run cases containing pattern in name."""
+
+    results = {}
+    for name, (_, sizes) in CASES.items():
+        for size in sizes:
+            key = f"{name}[{size}]"
+            if pattern not in key:
+                continue
+
+            results[key] = {"value": measure(name, size, repeat, min_time), "unit": "ops/s"}
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float,
+) -> list[str]:
+    """Return names of cases that regressed against baseline.
+
+    :param threshold: allowed relative slowdown, e.g. 0.2 for 20%
+    """
+
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference and result["value"] < reference["value"] * (1 - threshold):
+            regressions.append(name)
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("-k", dest="pattern", default="", help="run cases containing pattern")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per case")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per measurement")
+    parser.add_argument("--output", type=Path, help="write results to JSON file")
+    parser.add_argument("--baseline", type=Path, help="baseline JSON file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.3, help="allowed slowdown")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write results to baseline file instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.repeat, args.min_time)
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.baseline and args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        baseline: dict[str, dict[str, Any]] = {}
+    elif args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+    else:
+        baseline = {}
+
+    print(f"{'case':<32}{'ops/s':>16}{'baseline':>12}")
+    for name, result in results.items():
+        reference = baseline.get(name)
+        ratio = f"{result['value'] / reference['value']:>11.2f}x" if reference else ""
+        print(f"{name:<32}{result['value']:>16,.0f}{ratio:>12}")
+
+    regressions = compare(results, baseline, args.threshold)
+    for name in regressions:
+        print(f"REGRESSION: {name} is slower than baseline by more than {args.threshold:.0%}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
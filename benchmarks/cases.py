@@ -0,0 +1,168 @@
+"""Benchmark cases.
+
+Each case prepares its data, then returns function doing `ops` operations.
+Runner measures the function and reports operations per second.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from benchmarks import vec3
+from eaf.app import Application
+from eaf.core import Vec3
+from eaf.render import Renderable, Renderer
+from eaf.spatial import SpatialHash
+from eaf.state import State
+from eaf.timer import Scheduler, Timer
+
+
+Case = Callable[[int], tuple[Callable[[], None], int]]
+"""Case takes size and returns measured function and number of its ops."""
+
+CASES: dict[str, tuple[Case, tuple[int, ...]]] = {}
+"""Registered cases with sizes to run them with."""
+
+
+def case(*sizes: int) -> Callable[[Case], Case]:
+    """Register benchmark case to be run with every size."""
+
+    def decorator(func: Case) -> Case:
+        CASES[func.__name__] = (func, sizes)
+        return func
+
+    return decorator
+
+
+class Mover(Renderable):
+    """Typical object moving every frame."""
+
+    def __init__(self, pos: Vec3) -> None:
+        super().__init__(pos)
+        self.velocity = Vec3(1.0, 0.5, 0.0)
+
+    def update(self, dt: float) -> None:
+        # Assign back so observers (damage tracking, spatial index) are notified
+        pos = self.pos
+        pos.add_scaled(self.velocity, dt / 1000)
+        self.pos = pos
+
+
+class BenchState(State):
+    """State without input."""
+
+    def events(self) -> None:
+        pass
+
+
+@case(100, 1000, 10000)
+def app_tick(size: int) -> tuple[Callable[[], None], int]:
+    """Full frames of headless application with dummy renderer."""
+
+    app = Application(renderer=Renderer("dummy"))
+    app.register(BenchState)
+    app.state.add([Mover(Vec3(i, i, 0)) for i in range(size)])
+
+    ticks = 10
+
+    def run() -> None:
+        for _ in range(ticks):
+            app.tick()
+
+    return run, ticks
+
+
+@case(1000, 10000)
+def state_churn(size: int) -> tuple[Callable[[], None], int]:
+    """Adding and removing objects to state with size objects."""
+
+    app = Application(renderer=Renderer("dummy"))
+    app.register(BenchState)
+    state = app.state
+    state.add([Mover(Vec3()) for _ in range(size)])
+
+    bullets = [Mover(Vec3()) for _ in range(100)]
+
+    def run() -> None:
+        for bullet in bullets:
+            state.add(bullet)
+        for bullet in bullets:
+            state.remove(bullet)
+
+    return run, 2 * len(bullets)
+
+
+@case(1000, 10000)
+def spatial_pairs(size: int) -> tuple[Callable[[], None], int]:
+    """Broad phase collision of objects spread over 100 cells per side."""
+
+    index = SpatialHash(cell_size=10)
+    for i in range(size):
+        index.insert(Renderable(Vec3(i * 7 % 1000, i * 13 % 1000, 0)))
+
+    def run() -> None:
+        for _ in index.pairs():
+            pass
+
+    return run, size
+
+
+@case(1000)
+def vec3_add_scaled(size: int) -> tuple[Callable[[], None], int]:
+    """In-place position integration."""
+
+    operation = vec3.operations()["pos.add_scaled(vel, dt)"]
+
+    def run() -> None:
+        for _ in range(size):
+            operation()
+
+    return run, size
+
+
+@case(1000)
+def vec3_binary(size: int) -> tuple[Callable[[], None], int]:
+    """Allocating position integration."""
+
+    operation = vec3.operations()["pos = pos + vel * dt"]
+
+    def run() -> None:
+        for _ in range(size):
+            operation()
+
+    return run, size
+
+
+@case(1000, 10000)
+def scheduler_advance(size: int) -> tuple[Callable[[], None], int]:
+    """Frames of scheduler with size pending timers, none of them due."""
+
+    scheduler = Scheduler()
+    for _ in range(size):
+        scheduler.call_later(3600.0, lambda: None)
+
+    frames = 100
+
+    def run() -> None:
+        for _ in range(frames):
+            scheduler.advance(16)
+
+    return run, frames
+
+
+@case(1000, 10000)
+def timer_polling(size: int) -> tuple[Callable[[], None], int]:
+    """Frames of manually updated timers, none of them due."""
+
+    timers = [Timer(3600.0, lambda: None) for _ in range(size)]
+    for timer in timers:
+        timer.start()
+
+    frames = 10
+
+    def run() -> None:
+        for _ in range(frames):
+            for timer in timers:
+                timer.update(16)
+
+    return run, frames
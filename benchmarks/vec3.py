@@ -0,0 +1,100 @@
+"""Vec3 operations benchmark.
+
+Reports time and number of Vec3 objects allocated per operation.
+
+.. code-block:: console
+
+   $ python -m benchmarks.vec3
+"""
+
+from __future__ import annotations
+
+import timeit
+from collections.abc import Callable
+
+from eaf.core import Vec3
+
+
+NUMBER = 200_000
+"""Number of operation runs for measurements."""
+
+
+def count_allocations(operation: Callable[[], object], number: int) -> float:
+    """Return average number of Vec3 objects created by operation."""
+
+    allocations = 0
+    original_init = Vec3.__init__
+
+    def counting_init(self: Vec3, *args, **kwargs) -> None:
+        nonlocal allocations
+        allocations += 1
+        original_init(self, *args, **kwargs)
+
+    Vec3.__init__ = counting_init  # type: ignore[method-assign]
+    try:
+        for _ in range(number):
+            operation()
+    finally:
+        Vec3.__init__ = original_init  # type: ignore[method-assign]
+
+    return allocations / number
+
+
+def operations() -> dict[str, Callable[[], object]]:
+    """Typical movement code written in different ways."""
+
+    pos = Vec3(1.0, 2.0, 3.0)
+    vel = Vec3(0.5, 0.5, 0.5)
+    dt = 0.016
+
+    def binary() -> None:
+        nonlocal pos
+        pos = pos + vel * dt
+
+    def augmented() -> None:
+        nonlocal pos
+        pos += vel * dt
+
+    def add_scaled() -> None:
+        pos.add_scaled(vel, dt)
+
+    def distance_sq() -> None:
+        pos.distance_sq(vel)
+
+    def length_via_sub() -> None:
+        (pos - vel).length()
+
+    return {
+        "pos = pos + vel * dt": binary,
+        "pos += vel * dt": augmented,
+        "pos.add_scaled(vel, dt)": add_scaled,
+        "pos.distance_sq(other)": distance_sq,
+        "(pos - other).length()": length_via_sub,
+    }
+
+
+def run(number: int = NUMBER) -> dict[str, dict[str, float]]:
+    """Measure all operations.
+
+    :return: mapping of operation name to ns per op and allocations per op
+    """
+
+    results = {}
+    for name, operation in operations().items():
+        seconds = min(timeit.repeat(operation, number=number, repeat=3))
+        results[name] = {
+            "ns_per_op": seconds / number * 1e9,
+            "allocs_per_op": count_allocations(operation, number),
+        }
+
+    return results
+
+
+def main() -> None:
+    print(f"{'operation':<28}{'ns/op':>10}{'allocs/op':>12}")
+    for name, result in run().items():
+        print(f"{name:<28}{result['ns_per_op']:>10.1f}{result['allocs_per_op']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
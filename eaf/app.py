@@ -1,91 +1,313 @@
 """Base application class for all your needs.
 
-Only one application can exist in one interpreter instance.
+Several applications can exist in one interpreter instance, e.g. headless
+simulations. The first created one is current by default, other ones are
+current while they run frames or are activated, see `Application.activate`.
 You can use instance of this class without being inherited, but expect reduced
 functionality.
 """
 
 from __future__ import annotations
 
+import contextlib
+import contextvars
+import time
 import typing
 import weakref
-
-# TODO: move out into ioloop integration framework
-from tornado import ioloop
+from collections.abc import Callable, Coroutine, Iterator
+from typing import Any
 
 import eaf.core
 import eaf.errors
-from eaf.clock import Clock
+from eaf.clock import Clock, FramePacer, FrameRateController
+from eaf.events import EventQueue
+from eaf.inbox import Inbox
+from eaf.loop import Handle, Loop, TornadoLoop
+from eaf.pipeline import RenderPipeline
+from eaf.profiler import FrameProfiler
 from eaf.render import Renderer
+from eaf.timer import Scheduler
 
 
 if typing.TYPE_CHECKING:
+    import asyncio  # pragma: no cover
+
     from eaf.state import State  # pragma: no cover
 
 
+Pacing = typing.Literal["periodic", "deadline"]
+"""Frame scheduling strategies.
+
+* periodic: frames are driven by periodic callback of the loop
+* deadline: each frame schedules the next one via Loop.call_at
+"""
+
+
+def _weak_callback(method: Callable[[], None]) -> Callable[[], None]:
+    """Wrap bound method so callback doesn't keep its object alive."""
+
+    ref = weakref.WeakMethod(method)
+
+    def callback() -> None:
+        func = ref()
+        if func is not None:
+            func()
+
+    return callback
+
+
+_current: contextvars.ContextVar[weakref.ref[Application] | None] = contextvars.ContextVar(
+    "eaf_current_application", default=None
+)
+"""Application activated in the current context, overrides the global one."""
+
+
+def _cancel_all(handles: list[Handle]) -> None:
+    for handle in handles:
+        handle.cancel()
+
+
 class Application:
     """Base application class.
 
     Provides state manipulation routines. Subclasses are required to provide
-    renderer and event queue because there is no enterprise solutions without
-    input and output.
+    renderer and push input to event queue because there is no enterprise
+    solutions without input and output. Calls posted to inbox by other
+    threads and pending events of the queue are handled once per frame
+    before `State.events`.
+
+    With `pipeline_depth` set, frames are rendered on render thread from
+    snapshots made by `State.snapshot` instead of `State.render`, see
+    `eaf.pipeline`.
     """
 
-    __instance__ = None
-    """Instance of the current application."""
+    __instance__: weakref.ref[Application] | None = None
+    """The first created application, current unless other one is activated."""
 
     def __init__(
         self,
         renderer: Renderer | None = None,
-        event_queue: None = None,  # TODO: implement event queue abstraction
+        event_queue: EventQueue | None = None,
         fps: int = 30,
+        fixed_step: float | None = None,
+        max_steps: int = 5,
+        pacing: Pacing = "periodic",
+        loop: Loop | None = None,
+        min_fps: int | None = None,
+        pipeline_depth: int | None = None,
     ) -> None:
         self._renderer = renderer or Renderer("dummy")
         self._event_queue = event_queue
 
+        self._pipeline: RenderPipeline | None = None
+        if pipeline_depth is not None:
+            self._pipeline = RenderPipeline(self._renderer, pipeline_depth)
+            weakref.finalize(self, self._pipeline.close)
+
         self._state: State | None = None
         self._states: dict[str, State] = {}
         self._fps = fps
+        self._rate = FrameRateController(fps, min_fps)
 
         self._clock = Clock()
+        self._scheduler = Scheduler()
+        self._inbox = Inbox()
+        self._profiler: FrameProfiler | None = None
         self._frames = 0
 
-        self._ioloop = ioloop.IOLoop.current()
-        tick = weakref.WeakMethod(self.tick)
-        self._pc = ioloop.PeriodicCallback(tick(), fps)
-        self._pc.start()
-
+        # Fixed timestep mode: update runs with constant dt, render interpolates
+        self._fixed_step: float | None = None
+        self._max_steps = max_steps
+        self._accumulator = 0.0
+        self._alpha = 1.0
+        self.fixed_step = fixed_step
+
+        if pacing not in typing.get_args(Pacing):
+            raise ValueError(f"Unknown pacing: {pacing}")
+
+        self._loop = loop if loop is not None else TornadoLoop()
+        self._pacing = pacing
+        self._pacer = FramePacer(fps)
+        self._tick_callback = _weak_callback(self.tick)
+        self._periodic_handles: list[Handle] = []
+        weakref.finalize(self, _cancel_all, self._periodic_handles)
+        self._periodic: Handle | None = None
+        self._timeout: Handle | None = None
+        self._running = True
+
+        self._frame_callback = _weak_callback(self._frame)
+        self._start_frames()
+
+        self._ref = weakref.ref(self)
         if Application.__instance__ is None or Application.__instance__() is None:
-            Application.__instance__ = weakref.ref(self)
+            Application.__instance__ = self._ref
 
-    def tick(self) -> None:
-        """Executes every frame."""
+    def tick(self, dt: float | None = None) -> None:
+        """Executes every frame.
+
+        Application is current while frame runs, see `activate`.
+
+        :param dt: time passed since previous frame in milliseconds, measured
+                   by clock if not set, e.g. headless simulations pass
+                   constant one
+        """
 
+        token = _current.set(self._ref)
+        try:
+            self._tick(dt)
+        finally:
+            _current.reset(token)
+
+    def _tick(self, dt: float | None) -> None:
         if not self._state:
             return
 
-        dt = self._clock.tick()
+        clock_dt = self._clock.tick()
+        if dt is None:
+            dt = clock_dt
+        start = time.perf_counter_ns()
+
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.begin_frame(self._state)
+
+        self._scheduler.advance(dt)
+        if profiler is not None:
+            profiler.lap("timers")
 
+        self._inbox.drain()
+        if self._event_queue is not None:
+            self._event_queue.process()
         self._state.events()
-        self._state.update(dt)
-        self._state.render()
+        if profiler is not None:
+            profiler.lap("events")
+
+        if self._fixed_step is None:
+            self._state.update(dt)
+        else:
+            self._alpha = self._fixed_update(self._state, dt, self._fixed_step)
+        if profiler is not None:
+            profiler.lap("update")
+
+        if self._pipeline is not None:
+            self._pipeline.submit(self._state.snapshot(self._alpha))
+        elif self._fixed_step is None:
+            self._state.render()
+        else:
+            self._state.render(self._alpha)
+        if profiler is not None:
+            profiler.lap("render")
+            profiler.end_frame()
 
         self._frames += 1
+        if self._rate.record(time.perf_counter_ns() - start):
+            self._apply_rate()
+
+    def _start_frames(self) -> None:
+        """Start running frames according to pacing."""
+
+        if self._pacing == "periodic":
+            self._start_periodic()
+        else:
+            self._pacer.reset()
+            self._loop.call_soon(self._frame_callback)
+
+    def _apply_rate(self) -> None:
+        """Reschedule frames with the current rate of frame rate controller."""
+
+        self._pacer.period = self._rate.period
+        if self._periodic is not None:
+            self._periodic.cancel()
+            self._start_periodic()
+
+    def _start_periodic(self) -> None:
+        """Run tick every frame period."""
+
+        self._periodic = self._loop.call_every(self._rate.period, self._tick_callback)
+        # Callback is weak, finalizer stops it firing after application is gone
+        self._periodic_handles[:] = [self._periodic]
+
+    def _schedule_frame(self) -> None:
+        """Schedule next frame to the nearest deadline."""
+
+        deadline = self._pacer.next_deadline(self._loop.time())
+        self._timeout = self._loop.call_at(deadline, self._frame_callback)
+
+    def _frame(self) -> None:
+        """Run frame and schedule the next one, loop is free in between."""
+
+        self._timeout = None
+        if not self._running:
+            return
+
+        try:
+            self.tick()
+        finally:
+            if self._running:
+                self._schedule_frame()
+
+    def _fixed_update(self, state: State, dt: float, step: float) -> float:
+        """Run zero or more updates with constant step.
+
+        Number of catch-up steps per frame is limited by max_steps, the rest of
+        accumulated time is dropped to avoid death spiral on slow machines.
+
+        :param state: state to update
+        :param dt: time passed since previous frame
+        :param step: simulation step
+        :return: interpolation factor between two last simulation steps
+        """
+
+        self._accumulator += dt
+        steps = 0
+        while self._accumulator >= step:
+            if steps >= self._max_steps:
+                self._accumulator %= step
+                break
+
+            state.update(step)
+            self._accumulator -= step
+            steps += 1
+
+        return self._accumulator / step
 
     @classmethod
     def current(cls) -> Application:
-        """Return the current application instance."""
+        """Return the current application instance.
+
+        Application activated in the current context takes precedence over
+        the first created one, so several applications can coexist in one
+        process.
+        """
 
-        if cls.__instance__ is None:
+        ref = _current.get()
+        if ref is None:
+            ref = cls.__instance__
+
+        if ref is None:
             raise eaf.errors.ApplicationNotInitializedError()
 
-        application = cls.__instance__()
+        application = ref()
 
         if application is None:
             raise eaf.errors.ApplicationNotInitializedError()
 
         return application
 
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[Application]:
+        """Make application current within the block and current context.
+
+        Frames activate their application automatically, activation is
+        needed for code running outside of frames, e.g. state registration.
+        """
+
+        token = _current.set(self._ref)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
     @property
     def state(self) -> State:
         """Current state getter."""
@@ -163,11 +385,23 @@ class Application:
         return self._renderer
 
     @property
-    def event_queue(self) -> None:
+    def pipeline(self) -> RenderPipeline | None:
+        """Render pipeline, None if frames are rendered in loop thread."""
+
+        return self._pipeline
+
+    @property
+    def event_queue(self) -> EventQueue | None:
         """Application's event queue getter."""
 
         return self._event_queue
 
+    @property
+    def inbox(self) -> Inbox:
+        """Calls posted from other threads, handled every frame."""
+
+        return self._inbox
+
     @property
     def fps(self) -> int:
         """Desired FPS getter."""
@@ -176,9 +410,71 @@ class Application:
 
     @fps.setter
     def fps(self, val: int) -> None:
-        """Desired FPS setter."""
+        """Desired FPS setter.
+
+        :raises ValueError: if FPS is not a positive number
+        """
+
+        fps = int(val)
+        if fps <= 0:
+            raise ValueError(f"FPS must be positive: {val}")
+
+        self._fps = fps
+        self._rate.target = fps
+        self._apply_rate()
+
+    @property
+    def frame_rate(self) -> FrameRateController:
+        """Frame rate controller, its rate is the one frames are run with."""
+
+        return self._rate
+
+    @property
+    def achieved_fps(self) -> float:
+        """Frame rate measured over last frames."""
+
+        return self._clock.fps
+
+    @property
+    def fixed_step(self) -> float | None:
+        """Fixed simulation step getter, None when variable timestep is used."""
+
+        return self._fixed_step
+
+    @fixed_step.setter
+    def fixed_step(self, val: float | None) -> None:
+        """Fixed simulation step setter, resets accumulated time."""
+
+        if val is not None and val <= 0:
+            raise ValueError(f"Fixed step must be positive: {val}")
+
+        self._fixed_step = val
+        self._accumulator = 0.0
+        self._alpha = 1.0
 
-        self._fps = int(val)
+    @property
+    def alpha(self) -> float:
+        """Interpolation factor passed to the last State.render call."""
+
+        return self._alpha
+
+    @property
+    def loop(self) -> Loop:
+        """Event loop backend running frames."""
+
+        return self._loop
+
+    @property
+    def pacing(self) -> Pacing:
+        """Frame scheduling strategy."""
+
+        return self._pacing
+
+    @property
+    def pacer(self) -> FramePacer:
+        """Frame deadlines calculator used by deadline pacing."""
+
+        return self._pacer
 
     @property
     def frame_count(self) -> int:
@@ -192,19 +488,59 @@ class Application:
 
         return self._clock
 
+    @property
+    def profiler(self) -> FrameProfiler | None:
+        """Frame profiler getter, None if profiling is disabled."""
+
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, profiler: FrameProfiler | None) -> None:
+        """Enable profiling with profiler or disable it with None."""
+
+        self._profiler = profiler
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """Return scheduler of timers advanced every frame."""
+
+        return self._scheduler
+
     def start(self) -> None:
         """Start main application loop."""
 
         if not self._state:
             raise eaf.errors.ApplicationIsEmpty()
 
-        self._ioloop.start()
+        if not self._running:
+            self._running = True
+            self._start_frames()
+
+        self._loop.run()
 
     def stop(self) -> None:
         """Stop application."""
 
-        self._pc.stop()
-        self._ioloop.add_callback(self._ioloop.stop)
+        self._running = False
+        if self._periodic is not None:
+            self._periodic.cancel()
+            self._periodic = None
+        if self._timeout is not None:
+            self._timeout.cancel()
+            self._timeout = None
+        if self._pipeline is not None:
+            self._pipeline.close()
+
+        self._loop.call_soon(self._loop.stop)
+
+    def spawn(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Future[Any]:
+        """Run coroutine on application's loop concurrently with frames.
+
+        States can await IO, timers and other coroutines without blocking
+        frames, e.g. ``self.app.spawn(self.load_level())``.
+        """
+
+        return self._loop.create_task(coro)
 
 
 def current() -> Application:
@@ -1,75 +1,383 @@
 """Default clock implementation."""
 
+import bisect
+import math
 import time
+from array import array
+from collections.abc import Iterator, Sequence
+
+
+class RingBuffer:
+    """Fixed-size buffer of integer samples.
+
+    Keeps running sum of stored samples, so mean is computed in constant time
+    and no memory is allocated on append.
+    """
+
+    __slots__ = ("_count", "_index", "_size", "_total", "_values")
+
+    def __init__(self, size: int) -> None:
+        if size <= 0:
+            raise ValueError(f"Ring buffer size must be positive: {size}")
+
+        self._values = array("q", bytes(8 * size))
+        self._size = size
+        self._index = 0
+        self._count = 0
+        self._total = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over samples from the oldest to the newest."""
+
+        if self._count < self._size:
+            yield from self._values[: self._count]
+        else:
+            yield from self._values[self._index :]
+            yield from self._values[: self._index]
+
+    def append(self, value: int) -> None:
+        """Save sample, overwrite the oldest one if buffer is full."""
+
+        if self._count == self._size:
+            self._total -= self._values[self._index]
+        else:
+            self._count += 1
+
+        self._values[self._index] = value
+        self._total += value
+        self._index = (self._index + 1) % self._size
+
+    def clear(self) -> None:
+        """Drop all samples."""
+
+        self._index = 0
+        self._count = 0
+        self._total = 0
+
+    @property
+    def total(self) -> int:
+        """Sum of stored samples."""
+
+        return self._total
+
+    @property
+    def mean(self) -> float:
+        """Average of stored samples, 0 if empty."""
+
+        return self._total / self._count if self._count else 0.0
+
+    @property
+    def min(self) -> int:
+        """The smallest stored sample, 0 if empty."""
+
+        return min(self._values[: self._count]) if self._count else 0
+
+    @property
+    def max(self) -> int:
+        """The greatest stored sample, 0 if empty."""
+
+        return max(self._values[: self._count]) if self._count else 0
+
+    def percentile(self, p: float) -> int:
+        """Return nearest-rank percentile of stored samples, 0 if empty.
+
+        :param float p: percentile in range [0, 100]
+        """
+
+        if not 0 <= p <= 100:
+            raise ValueError(f"Percentile must be in range [0, 100]: {p}")
+
+        if not self._count:
+            return 0
+
+        values = sorted(self._values[: self._count])
+        rank = max(math.ceil(p * self._count / 100), 1)
+        return values[rank - 1]
+
+    def histogram(self, edges: Sequence[int]) -> list[int]:
+        """Count samples falling into bins.
+
+        :param edges: sorted bin edges, n edges make n + 1 bins, the first bin
+                      is (-inf, edges[0]), the last is [edges[-1], +inf)
+        """
+
+        counts = [0] * (len(edges) + 1)
+        for value in self._values[: self._count]:
+            counts[bisect.bisect_right(edges, value)] += 1
+
+        return counts
 
 
 class Clock:
     """Object that helps to track time.
 
-    All calculations are performed in milliseconds.
+    Time is measured in nanoseconds with performance counter. Frame time is
+    available in milliseconds (default), nanoseconds and seconds.
     """
 
-    FPS_COUNT_NUMBER = 10
-    """Number of FPS values to keep for calculating average FPS."""
+    FPS_COUNT_NUMBER = 60
+    """Number of frame times to keep for calculating FPS and statistics."""
 
     def __init__(self) -> None:
-        self._mspf = 0
-        self._previous_tick = 0
-        self._current_tick = self._get_ticks_ms()
+        self._current_tick = time.perf_counter_ns()
         self._tick_time = 0
-        self._fps_values: list[int] = []
+        self._frame_times = RingBuffer(self.FPS_COUNT_NUMBER)
 
-    @staticmethod
-    def _get_ticks_ms() -> int:
-        """Return ticks clock are rely on."""
+    def tick_ns(self, framerate: float = 0.0) -> int:
+        """Update the clock, return time passed from the previous tick.
 
-        return int(time.monotonic() * 1000)
+        If framerate is set clock sleeps the rest of the frame.
 
-    def _save_fps(self, value: int) -> None:
-        """Save FPS value and crop list if needed."""
+        :param float framerate: expected FPS
+        :return: tick duration in nanoseconds
+        """
+
+        previous_tick = self._current_tick
+        now = time.perf_counter_ns()
+
+        if framerate:
+            remaining = int(1_000_000_000 / framerate) - (now - previous_tick)
+            if remaining > 0:
+                time.sleep(remaining / 1_000_000_000)
+                now = time.perf_counter_ns()
 
-        self._fps_values.append(value)
-        if len(self._fps_values) > self.FPS_COUNT_NUMBER:
-            self._fps_values.pop(0)
+        self._current_tick = now
+        self._tick_time = now - previous_tick
+        self._frame_times.append(self._tick_time)
 
-    def tick(self, framerate: float = 0.0) -> int:
+        return self._tick_time
+
+    def tick(self, framerate: float = 0.0) -> float:
         """Update the clock.
 
         :param float framerate: expected FPS
+        :return: tick duration in milliseconds
+        """
+
+        return self.tick_ns(framerate) / 1_000_000
+
+    @property
+    def fps(self) -> float:
+        """Compute the clock framerate.
+
+        :return: FPS averaged over last FPS_COUNT_NUMBER frames
         """
 
-        self._previous_tick = self._current_tick
-        self._current_tick = self._get_ticks_ms()
-        delta = self._current_tick - self._previous_tick
+        mean = self._frame_times.mean
+        return 1_000_000_000 / mean if mean else 0.0
+
+    @property
+    def delta(self) -> float:
+        """Time used in previous tick.
 
-        self._mspf = int(1.0 / framerate * 1000.0) if framerate else delta
+        :return: tick duration in milliseconds
+        """
 
-        time_s = (self._mspf - delta) / 1000.0
-        time.sleep(time_s)
+        return self._tick_time / 1_000_000
 
-        self._tick_time = self._get_ticks_ms() - self._previous_tick
-        self._save_fps(int(1000 / self._tick_time) if self._tick_time != 0 else 0)
+    @property
+    def delta_ns(self) -> int:
+        """Time used in previous tick in nanoseconds."""
 
         return self._tick_time
 
     @property
-    def fps(self) -> int:
-        """Compute the clock framerate.
+    def delta_s(self) -> float:
+        """Time used in previous tick in seconds."""
+
+        return self._tick_time / 1_000_000_000
+
+    @property
+    def frame_times(self) -> RingBuffer:
+        """Durations of last frames in nanoseconds for statistics."""
+
+        return self._frame_times
 
-        :return: FPS
-        :rtype: float
+
+class FramePacer:
+    """Computes frame deadlines for scheduling frames in event loop.
+
+    Deadlines are placed on a fixed grid with period of one frame, so delays
+    of event loop callbacks don't accumulate. Frames that were missed because
+    of overrun are skipped rather than run back to back.
+
+    All calculations are performed in seconds of the event loop time.
+    """
+
+    def __init__(self, fps: float) -> None:
+        self._period = 1.0 / fps
+        self._deadline: float | None = None
+        self._skipped = 0
+
+    def reset(self) -> None:
+        """Forget previous deadline, next frame will be scheduled from now."""
+
+        self._deadline = None
+
+    def next_deadline(self, now: float) -> float:
+        """Return the time next frame must start at.
+
+        :param float now: current event loop time
         """
 
-        if not self._fps_values:
-            return 0
+        if self._deadline is None:
+            self._deadline = now
 
-        return int(sum(self._fps_values) / len(self._fps_values))
+        self._deadline += self._period
+        if self._deadline <= now:
+            missed = int((now - self._deadline) // self._period) + 1
+            self._deadline += missed * self._period
+            self._skipped += missed
+
+        return self._deadline
 
     @property
-    def delta(self) -> int:
-        """Time used in previous tick.
+    def period(self) -> float:
+        """Frame duration in seconds."""
 
-        :return: tick duration in milliseconds
-        :rtype: int
-        """
-        return self._tick_time
+        return self._period
+
+    @period.setter
+    def period(self, val: float) -> None:
+        """Frame duration setter."""
+
+        self._period = val
+
+    @property
+    def skipped(self) -> int:
+        """Number of frames skipped because of overruns."""
+
+        return self._skipped
+
+
+class FrameRateController:
+    """Chooses frame rate between floor and target depending on load.
+
+    Load is the share of frame period spent on frame work. When frames
+    overrun for several frames in a row the rate is lowered, but not below
+    the floor, when there is enough headroom for long enough it's raised back
+    up to the target. Without floor the rate always equals the target.
+    """
+
+    OVERRUN = 0.9
+    """Load above which frame is considered overrun."""
+
+    HEADROOM = 0.5
+    """Load below which frame is considered having headroom."""
+
+    DOWN_AFTER = 3
+    """Number of overrun frames in a row after which rate is lowered."""
+
+    UP_AFTER = 30
+    """Number of frames with headroom in a row after which rate is raised."""
+
+    STEP = 1.25
+    """Factor rate is lowered or raised by."""
+
+    def __init__(self, target: float, floor: float | None = None, history: int = 60) -> None:
+        self._target = self._check(target)
+        self._floor: float | None = None
+        self._rate = self._target
+        self._work_times = RingBuffer(history)
+        self._over = 0
+        self._under = 0
+        self.floor = floor
+
+    @staticmethod
+    def _check(rate: float) -> float:
+        if rate <= 0:
+            raise ValueError(f"Frame rate must be positive: {rate}")
+
+        return rate
+
+    @property
+    def target(self) -> float:
+        """Desired frame rate."""
+
+        return self._target
+
+    @target.setter
+    def target(self, val: float) -> None:
+        """Desired frame rate setter, current rate is reset to it."""
+
+        self._target = self._check(val)
+        if self._floor is not None and self._floor > val:
+            self._floor = val
+        self._reset()
+
+    @property
+    def floor(self) -> float | None:
+        """The lowest rate to adapt to, None disables adaptation."""
+
+        return self._floor
+
+    @floor.setter
+    def floor(self, val: float | None) -> None:
+        """Floor setter, current rate is reset to target."""
+
+        if val is not None and not 0 < val <= self._target:
+            raise ValueError(f"Floor must be within (0, {self._target}]: {val}")
+
+        self._floor = val
+        self._reset()
+
+    def _reset(self) -> None:
+        self._rate = self._target
+        self._over = self._under = 0
+
+    @property
+    def rate(self) -> float:
+        """Current frame rate."""
+
+        return self._rate
+
+    @property
+    def period(self) -> float:
+        """Current frame period in seconds."""
+
+        return 1.0 / self._rate
+
+    @property
+    def load(self) -> float:
+        """Mean share of the current frame period spent on frame work."""
+
+        return self._work_times.mean * self._rate / 1_000_000_000
+
+    @property
+    def work_times(self) -> RingBuffer:
+        """Durations of work of last frames in nanoseconds."""
+
+        return self._work_times
+
+    def record(self, work_ns: int) -> bool:
+        """Account duration of frame work, return whether rate changed."""
+
+        self._work_times.append(work_ns)
+        if self._floor is None:
+            return False
+
+        load = work_ns * self._rate / 1_000_000_000
+        if load > self.OVERRUN:
+            self._over += 1
+            self._under = 0
+        elif load < self.HEADROOM:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        rate = self._rate
+        if self._over >= self.DOWN_AFTER:
+            rate = max(self._floor, rate / self.STEP)
+        elif self._under >= self.UP_AFTER:
+            rate = min(self._target, rate * self.STEP)
+
+        if rate == self._rate:
+            return False
+
+        self._rate = rate
+        self._over = self._under = 0
+        return True
@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
+import math
 from typing import Any
 
 
 class Vec3:
-    """3D vector representation."""
+    """3D vector representation.
+
+    Vector is mutable: in-place operators (``+=``, ``-=``, ``*=``, ``/=``)
+    and methods like `add_scaled` change the vector itself instead of
+    rebinding the name to a new one. If the same vector is shared, e.g.
+    passed as position to several renderables, changing it in place moves all
+    of them, copy it (``pos + 0`` or ``Vec3(*pos.as_tuple())``) to keep them
+    independent.
+
+    Vectors are hashed by value, so vector changed in place while being a
+    key of dict or member of set can't be found by either old or new value.
+    Use `as_tuple` for keys instead.
+    """
 
     __slots__ = ("x", "y", "z")
 
@@ -58,12 +71,66 @@ class Vec3:
 
     __div__ = __truediv__
 
+    # In-place operators change vector without allocating a new one
+    def __iadd__(self, other: object) -> Vec3:
+        if isinstance(other, int | float):
+            self.x += other
+            self.y += other
+            self.z += other
+        elif isinstance(other, Vec3):
+            self.x += other.x
+            self.y += other.y
+            self.z += other.z
+        else:
+            raise self._value_error("add", other)
+
+        return self
+
+    def __isub__(self, other: object) -> Vec3:
+        if isinstance(other, int | float):
+            self.x -= other
+            self.y -= other
+            self.z -= other
+        elif isinstance(other, Vec3):
+            self.x -= other.x
+            self.y -= other.y
+            self.z -= other.z
+        else:
+            raise self._value_error("sub", other)
+
+        return self
+
+    def __imul__(self, other: object) -> Vec3:
+        if isinstance(other, int | float):
+            self.x *= other
+            self.y *= other
+            self.z *= other
+        else:
+            raise self._value_error("mul", other)
+
+        return self
+
+    def __itruediv__(self, other: object) -> Vec3:
+        if isinstance(other, int | float):
+            self.x /= other
+            self.y /= other
+            self.z /= other
+        else:
+            raise self._value_error("div", other)
+
+        return self
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Vec3):
-            raise self._value_error("eq", other)
+            return NotImplemented
 
         return self.x == other.x and self.y == other.y and self.z == other.z
 
+    def __hash__(self) -> int:
+        """Hash by value, don't change vector while it's used as a key."""
+
+        return hash((self.x, self.y, self.z))
+
     def __getitem__(self, cons: type) -> Vec3:
         """Cast vector items to selected type."""
 
@@ -78,3 +145,70 @@ class Vec3:
         return (self.x, self.y, self.z)
 
     as_tuple = as_tuple3
+
+    def set(self, x: int | float, y: int | float, z: int | float = 0) -> Vec3:
+        """Assign all coordinates in place."""
+
+        self.x = x
+        self.y = y
+        self.z = z
+
+        return self
+
+    def add_scaled(self, other: Vec3, k: int | float) -> Vec3:
+        """Add other multiplied by k in place, e.g. `pos.add_scaled(vel, dt)`.
+
+        Like other in-place changes it bypasses `Renderable.pos` setter, so
+        observers of renderable (damage tracking, spatial index) aren't
+        notified.
+        """
+
+        self.x += other.x * k
+        self.y += other.y * k
+        self.z += other.z * k
+
+        return self
+
+    def dot(self, other: Vec3) -> int | float:
+        """Dot product."""
+
+        return self.x * other.x + self.y * other.y + self.z * other.z
+
+    def cross(self, other: Vec3) -> Vec3:
+        """Cross product."""
+
+        return Vec3(
+            x=self.y * other.z - self.z * other.y,
+            y=self.z * other.x - self.x * other.z,
+            z=self.x * other.y - self.y * other.x,
+        )
+
+    def length_sq(self) -> int | float:
+        """Squared length, cheaper than length for comparisons."""
+
+        return self.x * self.x + self.y * self.y + self.z * self.z
+
+    def length(self) -> float:
+        """Vector length."""
+
+        return math.sqrt(self.length_sq())
+
+    def normalize(self) -> Vec3:
+        """Scale vector to unit length in place, zero vector stays zero."""
+
+        length = self.length()
+        if length:
+            self.x /= length
+            self.y /= length
+            self.z /= length
+
+        return self
+
+    def distance_sq(self, other: Vec3) -> int | float:
+        """Squared distance to other point."""
+
+        dx = self.x - other.x
+        dy = self.y - other.y
+        dz = self.z - other.z
+
+        return dx * dx + dy * dy + dz * dz
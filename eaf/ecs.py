@@ -0,0 +1,309 @@
+"""Entity-component-system storage.
+
+Alternative to keeping heterogeneous objects in State: entities are plain
+integer ids, their components are stored in columns grouped by archetype (set
+of component types), and systems process whole columns of entities that have
+required components.
+
+World can be attached to State, then State runs its systems on update and
+passes renderable components to renderer.
+"""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from eaf.render import Renderable
+
+
+Entity = int
+"""Entity identifier."""
+
+
+class Archetype:
+    """Columnar storage of entities with the same set of component types."""
+
+    __slots__ = ("columns", "entities", "types")
+
+    def __init__(self, types: frozenset[type]) -> None:
+        self.types = types
+        self.entities: list[Entity] = []
+        self.columns: dict[type, list[Any]] = {type_: [] for type_ in types}
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def append(self, entity: Entity, components: dict[type, Any]) -> int:
+        """Store entity components, return row index."""
+
+        self.entities.append(entity)
+        for type_, column in self.columns.items():
+            column.append(components[type_])
+
+        return len(self.entities) - 1
+
+    def row(self, index: int) -> dict[type, Any]:
+        """Return components of entity stored in row."""
+
+        return {type_: column[index] for type_, column in self.columns.items()}
+
+    def swap_remove(self, index: int) -> Entity | None:
+        """Remove row by moving the last row in its place.
+
+        :return: entity that was moved to index, if any
+        """
+
+        last = len(self.entities) - 1
+        moved = None
+        if index != last:
+            moved = self.entities[index] = self.entities[last]
+            for column in self.columns.values():
+                column[index] = column[last]
+
+        self.entities.pop()
+        for column in self.columns.values():
+            column.pop()
+
+        return moved
+
+
+class System:
+    """Base class for systems.
+
+    Subclasses declare required component types and implement `process`,
+    which is called once per archetype with columns of required components in
+    declared order.
+    """
+
+    components: tuple[type, ...] = ()
+    """Component types entity must have to be processed."""
+
+    def update(self, world: World, dt: float) -> None:
+        """Process all matching entities."""
+
+        for columns in world.query(*self.components):
+            self.process(dt, *columns)
+
+    def process(self, dt: float, *columns: list[Any]) -> None:
+        """Process columns of one archetype."""
+
+        raise NotImplementedError()
+
+
+class World:
+    """Container of entities, their components and systems.
+
+    Structural changes (creating and destroying entities, adding and removing
+    components) requested while systems run are applied after all systems
+    finish.
+    """
+
+    def __init__(self) -> None:
+        self._ids = itertools.count()
+        self._archetypes: dict[frozenset[type], Archetype] = {}
+        self._locations: dict[Entity, tuple[Archetype, int]] = {}
+        self._queries: dict[tuple[type, ...], list[Archetype]] = {}
+        self._systems: list[System] = []
+
+        self._pending: list[tuple[Callable[..., None], tuple[Any, ...]]] = []
+        self._updating = False
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, entity: object) -> bool:
+        return entity in self._locations
+
+    def _archetype(self, types: frozenset[type]) -> Archetype:
+        """Get or create archetype for set of component types."""
+
+        archetype = self._archetypes.get(types)
+        if archetype is None:
+            archetype = self._archetypes[types] = Archetype(types)
+            self._queries.clear()
+
+        return archetype
+
+    def _place(self, entity: Entity, components: dict[type, Any]) -> None:
+        """Store entity components in matching archetype."""
+
+        archetype = self._archetype(frozenset(components))
+        self._locations[entity] = (archetype, archetype.append(entity, components))
+
+    def _take(self, entity: Entity) -> dict[type, Any]:
+        """Remove entity from its archetype, return its components."""
+
+        archetype, index = self._locations.pop(entity)
+        components = archetype.row(index)
+
+        moved = archetype.swap_remove(index)
+        if moved is not None:
+            self._locations[moved] = (archetype, index)
+
+        return components
+
+    def _defer(self, func: Callable[..., None], *args: Any) -> bool:  # noqa: ANN401
+        """Queue structural change if systems are running."""
+
+        if self._updating:
+            self._pending.append((func, args))
+
+        return self._updating
+
+    def create(self, *components: object) -> Entity:
+        """Create entity with components, one component per type."""
+
+        entity = next(self._ids)
+        by_type = {type(component): component for component in components}
+        if not self._defer(self._place, entity, by_type):
+            self._place(entity, by_type)
+
+        return entity
+
+    def destroy(self, entity: Entity) -> None:
+        """Remove entity with all its components."""
+
+        if not self._defer(self._destroy, entity):
+            self._destroy(entity)
+
+    def _destroy(self, entity: Entity) -> None:
+        if entity not in self._locations:
+            raise KeyError(f"Entity {entity} doesn't exist")
+
+        self._take(entity)
+
+    def add_component(self, entity: Entity, component: object) -> None:
+        """Add component to entity or replace component of the same type."""
+
+        if not self._defer(self._add_component, entity, component):
+            self._add_component(entity, component)
+
+    def _add_component(self, entity: Entity, component: object) -> None:
+        archetype, index = self._locations[entity]
+        if type(component) in archetype.types:
+            archetype.columns[type(component)][index] = component
+            return
+
+        components = self._take(entity)
+        components[type(component)] = component
+        self._place(entity, components)
+
+    def remove_component(self, entity: Entity, type_: type) -> None:
+        """Remove component of type from entity."""
+
+        if not self._defer(self._remove_component, entity, type_):
+            self._remove_component(entity, type_)
+
+    def _remove_component(self, entity: Entity, type_: type) -> None:
+        components = self._take(entity)
+        del components[type_]
+        self._place(entity, components)
+
+    def get(self, entity: Entity, type_: type) -> Any:  # noqa: ANN401
+        """Return entity's component of type.
+
+        :raises KeyError: if entity or component doesn't exist
+        """
+
+        archetype, index = self._locations[entity]
+        return archetype.columns[type_][index]
+
+    def has(self, entity: Entity, type_: type) -> bool:
+        """Whether entity has component of type."""
+
+        location = self._locations.get(entity)
+        return location is not None and type_ in location[0].types
+
+    def query(self, *types: type) -> Iterator[tuple[list[Any], ...]]:
+        """Iterate over columns of entities having all component types.
+
+        Yields one tuple of columns per non-empty archetype, columns are in
+        requested order and rows of columns belong to the same entity.
+        """
+
+        archetypes = self._queries.get(types)
+        if archetypes is None:
+            required = frozenset(types)
+            archetypes = self._queries[types] = [
+                archetype
+                for archetype_types, archetype in self._archetypes.items()
+                if required <= archetype_types
+            ]
+
+        for archetype in archetypes:
+            if archetype.entities:
+                yield tuple(archetype.columns[type_] for type_ in types)
+
+    def entities(self, *types: type) -> Iterator[Entity]:
+        """Iterate over entities having all component types."""
+
+        required = frozenset(types)
+        for archetype_types, archetype in self._archetypes.items():
+            if required <= archetype_types:
+                yield from archetype.entities
+
+    @property
+    def systems(self) -> list[System]:
+        """Registered systems in order of running."""
+
+        return self._systems
+
+    def add_system(self, system: System) -> None:
+        """Register system, systems run in order of registration."""
+
+        self._systems.append(system)
+
+    def remove_system(self, system: System) -> None:
+        """Deregister system."""
+
+        self._systems.remove(system)
+
+    def update(self, dt: float) -> None:
+        """Run all systems and apply changes they requested."""
+
+        self._updating = True
+        try:
+            for system in self._systems:
+                system.update(self, dt)
+        finally:
+            self._updating = False
+            self.flush()
+
+    def flush(self) -> None:
+        """Apply postponed structural changes.
+
+        Failed change doesn't prevent the rest from being applied, the first
+        error is raised after all changes are processed.
+        """
+
+        pending, self._pending = self._pending, []
+        error: Exception | None = None
+        for func, args in pending:
+            try:
+                func(*args)
+            except Exception as exc:
+                if error is None:
+                    error = exc
+
+        if error is not None:
+            raise error
+
+    def renderables(self) -> Iterator[Renderable]:
+        """Iterate over renderable components in render order.
+
+        Render priority is taken from component type, so columns are sorted
+        instead of single components.
+        """
+
+        columns = [
+            (type_.render_priority, column)
+            for archetype in self._archetypes.values()
+            for type_, column in archetype.columns.items()
+            if issubclass(type_, Renderable) and column
+        ]
+        columns.sort(key=lambda item: item[0])
+
+        for _, column in columns:
+            yield from column
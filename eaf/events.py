@@ -0,0 +1,269 @@
+"""Event queue.
+
+Input backends push events, Application drains the queue once per frame and
+dispatches events to handlers subscribed to event types. Queue has bounded
+capacity, what happens when it's full is defined by overflow policy, so input
+storms can't make frames arbitrarily long.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing
+from collections.abc import Callable, Iterable
+from typing import ClassVar
+
+
+Overflow = typing.Literal["drop_oldest", "drop_newest", "block"]
+"""What to do with pushed event when queue is full.
+
+* drop_oldest: discard the oldest pending event
+* drop_newest: discard pushed event
+* block: wait until consumer drains the queue, only for producer threads:
+  pushes from the thread that drains the queue would never be woken up, so
+  they don't wait and drop pushed event instead
+"""
+
+Handler = Callable[["Event"], None]
+"""Event handler."""
+
+
+class Event:
+    """Base class for events.
+
+    Subclasses should declare `__slots__` to keep records compact. Event types
+    with `coalesce` set replace pending event of the same type instead of
+    being queued, e.g. only the latest mouse position matters to the frame.
+    """
+
+    __slots__ = ()
+
+    coalesce: ClassVar[bool] = False
+    """Whether newer event replaces pending one of the same type."""
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class EventQueue:
+    """Bounded ring buffer of events with typed dispatch.
+
+    Queue is safe to push from other threads, handlers are always called from
+    the thread that drains the queue.
+    """
+
+    def __init__(self, capacity: int = 1024, overflow: Overflow = "drop_oldest") -> None:
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive: {capacity}")
+        if overflow not in typing.get_args(Overflow):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self._capacity = capacity
+        self._overflow = overflow
+        self._buffer: list[Event | None] = [None] * capacity
+        self._head = 0
+        self._count = 0
+        # Absolute sequence number of the oldest pending event
+        self._seq = 0
+        # Coalescing event type -> sequence number of its pending event
+        self._pending: dict[type, int] = {}
+        self._lock = threading.Condition()
+        # Thread that drained the queue last, it must never block on push
+        self._consumer: int | None = None
+
+        self._handlers: dict[type, list[Handler]] = {}
+        self._dispatch: dict[type, tuple[Handler, ...]] = {}
+
+        self._dropped = 0
+        self._coalesced = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of pending events."""
+
+        return self._capacity
+
+    @property
+    def overflow(self) -> Overflow:
+        """Overflow policy."""
+
+        return self._overflow
+
+    @property
+    def dropped(self) -> int:
+        """Number of events discarded because queue was full."""
+
+        return self._dropped
+
+    @property
+    def coalesced(self) -> int:
+        """Number of events merged into pending ones."""
+
+        return self._coalesced
+
+    def push(self, event: Event, timeout: float | None = None) -> bool:
+        """Add event to the queue.
+
+        :param timeout: seconds to wait for free space with block policy,
+                        event is dropped after timeout, consumer thread
+                        never waits
+        :return: whether event was queued
+        """
+
+        with self._lock:
+            return self._push(event, timeout)
+
+    def push_many(self, events: Iterable[Event], timeout: float | None = None) -> int:
+        """Add events to the queue, return number of queued ones.
+
+        :param timeout: seconds to wait for free space for the whole batch
+                        with block policy, the rest is dropped after timeout
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            queued = 0
+            for event in events:
+                if deadline is not None:
+                    timeout = max(deadline - time.monotonic(), 0.0)
+                queued += self._push(event, timeout)
+
+            return queued
+
+    def _push(self, event: Event, timeout: float | None) -> bool:
+        type_ = type(event)
+        if type_.coalesce:
+            seq = self._pending.get(type_)
+            if seq is not None:
+                self._buffer[(self._head + seq - self._seq) % self._capacity] = event
+                self._coalesced += 1
+                return True
+
+        if self._count == self._capacity:
+            if self._overflow == "drop_newest":
+                self._dropped += 1
+                return False
+            if self._overflow == "block":
+                if threading.get_ident() == self._consumer or not self._lock.wait_for(
+                    lambda: self._count < self._capacity, timeout
+                ):
+                    self._dropped += 1
+                    return False
+            else:
+                self._pop()
+                self._dropped += 1
+
+        self._buffer[(self._head + self._count) % self._capacity] = event
+        if type_.coalesce:
+            self._pending[type_] = self._seq + self._count
+        self._count += 1
+
+        return True
+
+    def _pop(self) -> None:
+        event = self._buffer[self._head]
+        self._buffer[self._head] = None
+        if self._pending.get(type(event)) == self._seq:
+            del self._pending[type(event)]
+
+        self._head = (self._head + 1) % self._capacity
+        self._count -= 1
+        self._seq += 1
+
+    def drain(self, limit: int | None = None) -> list[Event]:
+        """Remove and return pending events, oldest first.
+
+        :param limit: maximum number of events to take, the rest stay queued
+        """
+
+        with self._lock:
+            self._consumer = threading.get_ident()
+            count = self._count if limit is None else min(limit, self._count)
+            head, capacity = self._head, self._capacity
+            end = head + count
+
+            if end <= capacity:
+                events = self._buffer[head:end]
+                self._buffer[head:end] = [None] * count
+            else:
+                end -= capacity
+                events = self._buffer[head:] + self._buffer[:end]
+                self._buffer[head:] = [None] * (capacity - head)
+                self._buffer[:end] = [None] * end
+
+            self._head = end % capacity
+            self._count -= count
+            self._seq += count
+            if self._pending:
+                self._pending = {
+                    type_: seq for type_, seq in self._pending.items() if seq >= self._seq
+                }
+
+            self._lock.notify_all()
+
+        return events  # type: ignore
+
+    def clear(self) -> None:
+        """Discard pending events."""
+
+        self.drain()
+
+    def subscribe(self, event_type: type[Event], handler: Handler) -> None:
+        """Call handler with every dispatched event of type or its subclass."""
+
+        self._handlers.setdefault(event_type, []).append(handler)
+        self._dispatch.clear()
+
+    def unsubscribe(self, event_type: type[Event], handler: Handler) -> None:
+        """Stop calling handler with events of type.
+
+        :raises ValueError: if handler isn't subscribed to type
+        """
+
+        handlers = self._handlers.get(event_type, [])
+        handlers.remove(handler)
+        if not handlers:
+            del self._handlers[event_type]
+        self._dispatch.clear()
+
+    def handlers(self, event_type: type[Event]) -> tuple[Handler, ...]:
+        """Return handlers of event type including handlers of its bases.
+
+        Result is cached per type until subscriptions change.
+        """
+
+        handlers = self._dispatch.get(event_type)
+        if handlers is None:
+            handlers = self._dispatch[event_type] = tuple(
+                handler for type_ in event_type.__mro__ for handler in self._handlers.get(type_, ())
+            )
+
+        return handlers
+
+    def dispatch(self, events: Iterable[Event]) -> None:
+        """Call subscribed handlers with events."""
+
+        dispatch = self._dispatch
+        for event in events:
+            handlers = dispatch.get(type(event))
+            if handlers is None:
+                handlers = self.handlers(type(event))
+            for handler in handlers:
+                handler(event)
+
+    def process(self, limit: int | None = None) -> int:
+        """Drain pending events and dispatch them, return their number."""
+
+        events = self.drain(limit)
+        self.dispatch(events)
+
+        return len(events)
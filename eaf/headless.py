@@ -0,0 +1,235 @@
+"""Headless simulations.
+
+Runs many independent applications without output, e.g. bots, replays or
+load tests. `Batch` steps several applications in one process, `Runner`
+shards batches across worker processes and collects per-shard statistics.
+
+Simulations use the dummy renderer, manual loop and constant frame time, so
+they run as fast as frames are computed and don't depend on wall clock.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import multiprocessing
+import time
+import typing
+from multiprocessing.connection import Connection
+from typing import Any
+
+from eaf.app import Application
+from eaf.clock import RingBuffer
+from eaf.loop import ManualLoop
+from eaf.render import Renderer
+
+
+if typing.TYPE_CHECKING:
+    from eaf.state import State  # pragma: no cover
+
+
+Mode = typing.Literal["lockstep", "free"]
+"""How shards are stepped.
+
+* lockstep: all shards finish a frame before any of them starts the next one
+* free: every shard runs all frames at its own pace
+"""
+
+
+class ShardStats:
+    """Statistics of one shard after run."""
+
+    __slots__ = ("apps", "elapsed", "frame_times", "frames", "results", "shard")
+
+    def __init__(self, shard: int, apps: int) -> None:
+        self.shard = shard
+        self.apps = apps
+        self.frames = 0
+        self.elapsed = 0
+        self.frame_times: list[int] = []
+        self.results: list[Any] = []
+
+    @property
+    def fps(self) -> float:
+        """Frames per second of every application of shard."""
+
+        return self.frames * 1_000_000_000 / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return stats as dict."""
+
+        return {
+            "shard": self.shard,
+            "apps": self.apps,
+            "frames": self.frames,
+            "elapsed": self.elapsed,
+            "fps": self.fps,
+            "results": self.results,
+        }
+
+
+class Batch:
+    """Applications of one state type simulated in the same process.
+
+    Every application is activated while it runs, so `Application.current`
+    returns the right one.
+
+    :param state: state class to register in every application
+    :param apps: number of applications
+    :param dt: frame time in milliseconds passed to every frame
+    :param history: number of frame times to keep
+    """
+
+    def __init__(self, state: type[State], apps: int, dt: float, history: int = 1000) -> None:
+        self._dt = dt
+        self._apps: list[Application] = []
+        self._frames = 0
+        self._elapsed = 0
+        self._frame_times = RingBuffer(history)
+
+        for _ in range(apps):
+            app = Application(renderer=Renderer("dummy"), loop=ManualLoop())
+            with app.activate():
+                app.register(state)
+            self._apps.append(app)
+
+    @property
+    def apps(self) -> list[Application]:
+        """Simulated applications."""
+
+        return self._apps
+
+    def step(self, frames: int = 1) -> None:
+        """Run frames of every application."""
+
+        apps, dt = self._apps, self._dt
+        for _ in range(frames):
+            start = time.perf_counter_ns()
+            for app in apps:
+                app.tick(dt)
+            elapsed = time.perf_counter_ns() - start
+
+            self._frame_times.append(elapsed)
+            self._elapsed += elapsed
+        self._frames += frames
+
+    def stats(self, shard: int = 0) -> ShardStats:
+        """Return statistics of steps made so far and results of states."""
+
+        stats = ShardStats(shard, len(self._apps))
+        stats.frames = self._frames
+        stats.elapsed = self._elapsed
+        stats.frame_times = list(self._frame_times)
+        for app in self._apps:
+            with app.activate():
+                stats.results.append(app.state.result())
+
+        return stats
+
+    def close(self) -> None:
+        """Stop all applications."""
+
+        for app in self._apps:
+            app.stop()
+        self._apps.clear()
+
+
+def _worker(conn: Connection, shard: int, state: type[State], apps: int, dt: float) -> None:
+    """Serve commands of runner until it's closed."""
+
+    batch = Batch(state, apps, dt)
+    try:
+        while True:
+            command, arg = conn.recv()
+            if command == "step":
+                batch.step(arg)
+                conn.send(None)
+            elif command == "stats":
+                conn.send(batch.stats(shard))
+            else:
+                break
+    finally:
+        batch.close()
+        conn.close()
+
+
+class Runner:
+    """Runs simulations of state sharded across worker processes.
+
+    Each shard is a worker process running a `Batch` of applications, runner
+    communicates with workers through pipes.
+
+    :param state: state class, must be importable by worker processes
+    :param shards: number of worker processes
+    :param apps: number of applications per shard
+    :param dt: frame time in milliseconds
+    :param mode: lockstep or free running
+    """
+
+    def __init__(
+        self,
+        state: type[State],
+        shards: int,
+        apps: int = 1,
+        dt: float = 1000 / 30,
+        mode: Mode = "free",
+    ) -> None:
+        if mode not in typing.get_args(Mode):
+            raise ValueError(f"Unknown mode: {mode}")
+        if shards <= 0 or apps <= 0:
+            raise ValueError(f"Shards and apps must be positive: {shards}, {apps}")
+
+        self._state = state
+        self._shards = shards
+        self._apps = apps
+        self._dt = dt
+        self._mode = mode
+
+    @property
+    def mode(self) -> Mode:
+        """How shards are stepped."""
+
+        return self._mode
+
+    def run(self, frames: int) -> list[ShardStats]:
+        """Run frames in every application, return stats ordered by shard."""
+
+        context = multiprocessing.get_context()
+        conns: list[Connection] = []
+        processes = []
+        try:
+            for shard in range(self._shards):
+                parent, child = context.Pipe()
+                process = context.Process(
+                    target=_worker,
+                    args=(child, shard, self._state, self._apps, self._dt),
+                    daemon=True,
+                )
+                process.start()
+                child.close()
+                conns.append(parent)
+                processes.append(process)
+
+            if self._mode == "lockstep":
+                for _ in range(frames):
+                    self._broadcast(conns, "step", 1)
+            else:
+                self._broadcast(conns, "step", frames)
+
+            return self._broadcast(conns, "stats", None)
+        finally:
+            for conn in conns:
+                # Worker may be already gone if it failed
+                with contextlib.suppress(OSError):
+                    conn.send(("close", None))
+                conn.close()
+            for process in processes:
+                process.join()
+
+    @staticmethod
+    def _broadcast(conns: list[Connection], command: str, arg: Any) -> list[Any]:  # noqa: ANN401
+        """Send command to every shard and wait for all replies."""
+
+        for conn in conns:
+            conn.send((command, arg))
+
+        return [conn.recv() for conn in conns]
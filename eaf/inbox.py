@@ -0,0 +1,87 @@
+"""Cross-thread message inbox.
+
+Worker threads post calls to the inbox, application runs them in its own
+thread once per frame. Posting doesn't take locks: deque appends are atomic,
+so producers never wait for the frame or each other.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from eaf.clock import RingBuffer
+
+
+Message = tuple[Callable[..., Any], tuple[Any, ...]]
+"""Function and its positional arguments."""
+
+
+class Inbox:
+    """Queue of calls posted from other threads.
+
+    Keeps rolling window of queue depth at every drain and of latency from
+    posting to handling of every message, in nanoseconds.
+    """
+
+    def __init__(self, history: int = 120) -> None:
+        self._queue: deque[tuple[int, Callable[..., Any], tuple[Any, ...]]] = deque()
+        self._depth = RingBuffer(history)
+        self._latency = RingBuffer(history)
+        self._handled = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def post(self, func: Callable[..., Any], *args: Any) -> None:  # noqa: ANN401
+        """Call func with args in application thread, safe from any thread."""
+
+        self._queue.append((time.perf_counter_ns(), func, args))
+
+    def post_many(self, messages: Iterable[Message]) -> None:
+        """Post batch of calls at once, safe from any thread."""
+
+        now = time.perf_counter_ns()
+        self._queue.extend([(now, func, args) for func, args in messages])
+
+    def drain(self) -> int:
+        """Run calls posted before drain, return their number.
+
+        Calls posted by other threads or by handlers while draining are left
+        for the next drain, so single drain takes bounded time.
+        """
+
+        queue = self._queue
+        count = len(queue)
+        self._depth.append(count)
+        if not count:
+            return 0
+
+        latency = self._latency
+        for _ in range(count):
+            posted, func, args = queue.popleft()
+            latency.append(time.perf_counter_ns() - posted)
+            func(*args)
+
+        self._handled += count
+        return count
+
+    @property
+    def handled(self) -> int:
+        """Total number of handled messages."""
+
+        return self._handled
+
+    @property
+    def depth(self) -> RingBuffer:
+        """Rolling window of number of pending messages at drain."""
+
+        return self._depth
+
+    @property
+    def latency(self) -> RingBuffer:
+        """Rolling window of nanoseconds from posting to handling."""
+
+        return self._latency
@@ -0,0 +1,301 @@
+"""Event loop backends.
+
+Application doesn't depend on particular event loop: it schedules frames
+through the backend interface. Tornado backend is the default one, asyncio
+backend runs frames directly on asyncio (or uvloop) loop without Tornado
+layers, manual backend runs callbacks in virtual time for headless runs and
+tests. Backend modules are imported only when backend is created.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import typing
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+
+if typing.TYPE_CHECKING:
+    from tornado import ioloop  # pragma: no cover
+
+
+Callback = Callable[[], None]
+"""Loop callback."""
+
+
+class Handle(typing.Protocol):
+    """Scheduled callback."""
+
+    def cancel(self) -> None:
+        """Don't run callback if it's not run yet."""
+
+
+class Loop:
+    """Event loop backend interface.
+
+    All times are in seconds of loop's monotonic clock.
+    """
+
+    def time(self) -> float:
+        """Return current loop time."""
+
+        raise NotImplementedError()
+
+    def call_soon(self, callback: Callback) -> None:
+        """Run callback on the next loop iteration."""
+
+        raise NotImplementedError()
+
+    def call_at(self, when: float, callback: Callback) -> Handle:
+        """Run callback at loop time."""
+
+        raise NotImplementedError()
+
+    def call_every(self, period: float, callback: Callback) -> Handle:
+        """Run callback every period, missed runs are skipped."""
+
+        return _Periodic(self, period, callback)
+
+    def create_task(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Future[Any]:
+        """Run coroutine concurrently with frames."""
+
+        raise NotImplementedError(f"{type(self).__name__} can't run coroutines")
+
+    def run(self) -> None:
+        """Run loop until stop is called."""
+
+        raise NotImplementedError()
+
+    def stop(self) -> None:
+        """Stop running loop."""
+
+        raise NotImplementedError()
+
+
+class _Periodic:
+    """Periodic callback built upon call_at, keeps fixed grid of run times."""
+
+    def __init__(self, loop: Loop, period: float, callback: Callback) -> None:
+        self._loop = loop
+        self._period = period
+        self._callback = callback
+        self._next = loop.time() + period
+        self._handle: Handle | None = loop.call_at(self._next, self._run)
+
+    def _run(self) -> None:
+        try:
+            self._callback()
+        finally:
+            if self._handle is not None:
+                now = self._loop.time()
+                self._next += self._period
+                if self._next <= now:
+                    self._next += math.ceil((now - self._next) / self._period) * self._period
+                self._handle = self._loop.call_at(self._next, self._run)
+
+    def cancel(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+
+class TornadoLoop(Loop):
+    """Backend running on Tornado IOLoop.
+
+    Allows to mix application with other Tornado code running on the same
+    IOLoop.
+    """
+
+    def __init__(self, loop: ioloop.IOLoop | None = None) -> None:
+        from tornado import ioloop
+
+        self._ioloop = loop if loop is not None else ioloop.IOLoop.current()
+
+    @property
+    def ioloop(self) -> ioloop.IOLoop:
+        """Underlying Tornado IOLoop."""
+
+        return self._ioloop
+
+    def time(self) -> float:
+        return self._ioloop.time()
+
+    def call_soon(self, callback: Callback) -> None:
+        self._ioloop.add_callback(callback)
+
+    def call_at(self, when: float, callback: Callback) -> Handle:
+        return _TornadoTimeout(self._ioloop, self._ioloop.call_at(when, callback))
+
+    def call_every(self, period: float, callback: Callback) -> Handle:
+        from tornado import ioloop
+
+        periodic = ioloop.PeriodicCallback(callback, period * 1000)
+        periodic.start()
+
+        return _TornadoPeriodic(periodic)
+
+    def create_task(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Future[Any]:
+        return asyncio.ensure_future(coro, loop=self._ioloop.asyncio_loop)  # type: ignore
+
+    def run(self) -> None:
+        self._ioloop.start()
+
+    def stop(self) -> None:
+        self._ioloop.stop()
+
+
+class _TornadoTimeout:
+    def __init__(self, loop: ioloop.IOLoop, timeout: object) -> None:
+        self._loop = loop
+        self._timeout = timeout
+
+    def cancel(self) -> None:
+        self._loop.remove_timeout(self._timeout)
+
+
+class _TornadoPeriodic:
+    def __init__(self, periodic: ioloop.PeriodicCallback) -> None:
+        self._periodic = periodic
+
+    def cancel(self) -> None:
+        self._periodic.stop()
+
+
+class AsyncioLoop(Loop):
+    """Backend running directly on asyncio event loop.
+
+    :param loop: asyncio loop to use, new one is created by default
+    :param use_uvloop: create uvloop loop instead of default one
+    :raises ImportError: if uvloop is requested but not installed
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop | None = None,
+        use_uvloop: bool = False,
+    ) -> None:
+        if loop is None:
+            if use_uvloop:
+                import uvloop
+
+                loop = uvloop.new_event_loop()
+            else:
+                loop = asyncio.new_event_loop()
+
+        self._loop = loop
+
+    @property
+    def asyncio_loop(self) -> asyncio.AbstractEventLoop:
+        """Underlying asyncio loop."""
+
+        return self._loop
+
+    def time(self) -> float:
+        return self._loop.time()
+
+    def call_soon(self, callback: Callback) -> None:
+        self._loop.call_soon_threadsafe(callback)
+
+    def call_at(self, when: float, callback: Callback) -> Handle:
+        return self._loop.call_at(when, callback)
+
+    def create_task(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Future[Any]:
+        return self._loop.create_task(coro)
+
+    def run(self) -> None:
+        self._loop.run_forever()
+
+    def stop(self) -> None:
+        self._loop.stop()
+
+
+class _ManualHandle:
+    __slots__ = ("callback", "cancelled")
+
+    def __init__(self, callback: Callback) -> None:
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class ManualLoop(Loop):
+    """Backend running callbacks in virtual time, without waiting.
+
+    `run` jumps straight to the next deadline, so headless application runs
+    as fast as frames are computed. `advance` runs callbacks due in given
+    amount of virtual time, which makes frame scheduling deterministic in
+    tests.
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self._time = start
+        self._heap: list[tuple[float, int, _ManualHandle]] = []
+        self._seq = itertools.count()
+        self._running = False
+
+    def time(self) -> float:
+        return self._time
+
+    def call_soon(self, callback: Callback) -> None:
+        self.call_at(self._time, callback)
+
+    def call_at(self, when: float, callback: Callback) -> Handle:
+        handle = _ManualHandle(callback)
+        heapq.heappush(self._heap, (when, next(self._seq), handle))
+
+        return handle
+
+    def _run_next(self, until: float) -> bool:
+        """Run the earliest callback due until time, return whether it ran."""
+
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        if not heap or heap[0][0] > until:
+            return False
+
+        when, _, handle = heapq.heappop(heap)
+        self._time = max(self._time, when)
+        handle.callback()
+
+        return True
+
+    def advance(self, seconds: float) -> None:
+        """Move virtual time forward running due callbacks."""
+
+        until = self._time + seconds
+        while self._run_next(until):
+            pass
+
+        self._time = until
+
+    def run(self) -> None:
+        """Run callbacks until stop is called or nothing is scheduled."""
+
+        self._running = True
+        while self._running and self._run_next(math.inf):
+            pass
+        self._running = False
+
+    def stop(self) -> None:
+        self._running = False
+
+
+def create_loop(name: str) -> Loop:
+    """Create backend by name: tornado, asyncio, uvloop or manual."""
+
+    if name == "tornado":
+        return TornadoLoop()
+    if name == "asyncio":
+        return AsyncioLoop()
+    if name == "uvloop":
+        return AsyncioLoop(use_uvloop=True)
+    if name == "manual":
+        return ManualLoop()
+
+    raise ValueError(f"Unknown loop backend: {name}")
@@ -0,0 +1,187 @@
+"""Pipelined rendering.
+
+Render pipeline draws frame snapshots on a worker thread, so the loop thread
+updates the next frame while the previous one is rendered and render time
+doesn't add to frame time. It pays off with renderers that release the GIL
+(I/O, C extensions) and on free-threaded Python.
+
+Snapshot is made of draw commands, see `State.snapshot`. Renderer used by
+pipeline must draw only from command fields and never touch renderables.
+Snapshots are built on the loop thread while render thread draws. Loop
+thread only asks renderer for screen size (viewport culling) and for
+`batch_key` of every object, so `batch_key` must be pure and thread-safe:
+depend only on the renderable, not on renderer's drawing state.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import typing
+from collections import deque
+
+from eaf.clock import RingBuffer
+from eaf.render import Renderer
+
+
+if typing.TYPE_CHECKING:
+    from eaf.render import Batch  # pragma: no cover
+
+
+Snapshot = tuple["Batch", ...]
+"""Render data of a frame."""
+
+
+class RenderPipeline:
+    """Draws snapshots on render thread.
+
+    Pipeline has `depth` snapshot buffers: one is being rendered, the rest
+    wait for render thread. When all of them are taken, the oldest waiting
+    snapshot is dropped, so simulation never waits for renderer and shown
+    frame lags behind simulation by at most `depth` frames.
+
+    Errors raised by renderer are re-raised by the next `submit` or `wait`.
+
+    :param renderer: immediate mode renderer implementing `render_batch`
+    :param depth: number of snapshot buffers, 2 for double buffering, 3 for
+                  triple buffering
+    :param history: number of latencies to keep
+    :raises ValueError: if renderer can't draw snapshots or depth is less
+                        than 2
+    """
+
+    def __init__(self, renderer: Renderer, depth: int = 2, history: int = 120) -> None:
+        cls = type(renderer)
+        if renderer.retained or (
+            cls.render_batch is Renderer.render_batch
+            and cls.render_objects is not Renderer.render_objects
+        ):
+            raise ValueError(f"{cls.__name__} can't render snapshots, implement render_batch")
+        if depth < 2:
+            raise ValueError(f"Depth must be at least 2: {depth}")
+
+        self._renderer = renderer
+        self._depth = depth
+        self._pending: deque[tuple[int, Snapshot]] = deque()
+        self._lock = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._busy = False
+        self._closing = False
+        self._error: BaseException | None = None
+
+        self._rendered = 0
+        self._dropped = 0
+        self._latency = RingBuffer(history)
+
+    @property
+    def renderer(self) -> Renderer:
+        """Renderer drawing snapshots."""
+
+        return self._renderer
+
+    @property
+    def depth(self) -> int:
+        """Number of snapshot buffers."""
+
+        return self._depth
+
+    @property
+    def rendered(self) -> int:
+        """Number of presented snapshots."""
+
+        return self._rendered
+
+    @property
+    def dropped(self) -> int:
+        """Number of snapshots dropped because all buffers were taken."""
+
+        return self._dropped
+
+    @property
+    def latency(self) -> RingBuffer:
+        """Rolling window of nanoseconds from submit to present."""
+
+        return self._latency
+
+    def submit(self, snapshot: Snapshot) -> None:
+        """Hand snapshot to render thread, starting it if needed.
+
+        :raises Exception: error raised by renderer since the previous call
+        """
+
+        with self._lock:
+            self._raise_error()
+            if self._thread is None:
+                self._closing = False
+                self._thread = threading.Thread(target=self._run, name="eaf-render", daemon=True)
+                self._thread.start()
+
+            if len(self._pending) + self._busy >= self._depth:
+                self._pending.popleft()
+                self._dropped += 1
+            self._pending.append((time.perf_counter_ns(), snapshot))
+            self._lock.notify_all()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until submitted snapshots are rendered, return whether they are.
+
+        :raises Exception: error raised by renderer
+        """
+
+        with self._lock:
+            done = self._lock.wait_for(lambda: not self._pending and not self._busy, timeout)
+            self._raise_error()
+
+            return done
+
+    def close(self) -> None:
+        """Render pending snapshots and stop render thread.
+
+        Pipeline can be used again, the next submit starts new thread.
+        """
+
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._closing = True
+            self._lock.notify_all()
+
+        if thread is not threading.current_thread():
+            thread.join()
+        with self._lock:
+            self._thread = None
+
+    def _raise_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        """Render thread: draw snapshots until pipeline is closed."""
+
+        renderer = self._renderer
+        while True:
+            with self._lock:
+                self._lock.wait_for(lambda: self._pending or self._closing)
+                if not self._pending:
+                    return
+                submitted, snapshot = self._pending.popleft()
+                self._busy = True
+
+            try:
+                renderer.begin_frame()
+                renderer.clear()
+                renderer.draw(snapshot)
+                renderer.present()
+            except Exception as error:
+                with self._lock:
+                    if self._error is None:
+                        self._error = error
+            else:
+                self._latency.append(time.perf_counter_ns() - submitted)
+                self._rendered += 1
+            finally:
+                with self._lock:
+                    self._busy = False
+                    self._lock.notify_all()
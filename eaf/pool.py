@@ -0,0 +1,156 @@
+"""Object pooling.
+
+Short-lived objects like bullets and particles can be taken from pool and
+returned to it instead of being created and collected every time, which
+reduces allocation churn and GC pauses. Pooled renderables are spawned with
+`State.spawn` and returned to their pool when removed from state.
+
+Don't keep references to objects after they are returned to pool, the same
+object will be reinitialized and used again.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gc
+import typing
+from collections.abc import Callable, Iterator
+from typing import Any, Generic, TypeVar
+
+
+class Poolable(typing.Protocol):
+    """Object that can be reused by pool."""
+
+    def reinit(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Initialize object taken from pool, as constructor does."""
+
+    def reset(self) -> None:
+        """Drop references to other objects when returning to pool."""
+
+
+T = TypeVar("T", bound=Poolable)
+
+
+class Pool(Generic[T]):
+    """Pool of reusable objects of one type.
+
+    :param factory: creates new objects, called with `acquire` arguments
+    :param limit: maximum number of free objects to keep, the rest is left to
+                  GC, unlimited by default
+    """
+
+    def __init__(self, factory: Callable[..., T], limit: int | None = None) -> None:
+        self._factory = factory
+        self._limit = limit
+        self._free: list[T] = []
+        # Identities of acquired objects, they are alive until released
+        self._acquired: set[int] = set()
+
+        self._in_use = 0
+        self._high_water = 0
+        self._created = 0
+        self._reused = 0
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def preallocate(self, count: int, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Create free objects in advance, e.g. during level loading."""
+
+        for _ in range(count):
+            obj = self._factory(*args, **kwargs)
+            obj.reset()
+            self._created += 1
+            self._free.append(obj)
+
+    def acquire(self, *args: Any, **kwargs: Any) -> T:  # noqa: ANN401
+        """Take free object reinitialized with arguments or create new one."""
+
+        if self._free:
+            obj = self._free.pop()
+            obj.reinit(*args, **kwargs)
+            self._reused += 1
+        else:
+            obj = self._factory(*args, **kwargs)
+            self._created += 1
+
+        self._acquired.add(id(obj))
+        self._in_use += 1
+        if self._in_use > self._high_water:
+            self._high_water = self._in_use
+
+        return obj
+
+    def release(self, obj: T) -> None:
+        """Return object to pool.
+
+        :raises ValueError: if object is already released or wasn't acquired
+                            from this pool
+        """
+
+        key = id(obj)
+        if key not in self._acquired:
+            raise ValueError(f"Object {obj} is not acquired from pool")
+
+        self._acquired.remove(key)
+        obj.reset()
+        self._in_use -= 1
+        if self._limit is None or len(self._free) < self._limit:
+            self._free.append(obj)
+
+    @property
+    def in_use(self) -> int:
+        """Number of acquired and not yet released objects."""
+
+        return self._in_use
+
+    @property
+    def high_water(self) -> int:
+        """The largest number of objects in use at once."""
+
+        return self._high_water
+
+    @property
+    def created(self) -> int:
+        """Number of objects created by pool."""
+
+        return self._created
+
+    @property
+    def reused(self) -> int:
+        """Number of acquisitions served by free objects."""
+
+        return self._reused
+
+
+@contextlib.contextmanager
+def gc_tuned(
+    freeze: bool = True,
+    threshold: tuple[int, int, int] | None = (50_000, 50, 100),
+) -> Iterator[None]:
+    """Tune garbage collector for the block, e.g. around `Application.start`.
+
+    Objects existing at the start (loaded assets, pools) are frozen and not
+    scanned by collections anymore, higher threshold makes collections rarer.
+    Previous settings are restored on exit. Frozen objects are unfrozen on
+    exit only if nothing was frozen before the block, e.g. by pre-fork
+    `gc.freeze()`, because gc can't unfreeze objects selectively.
+
+    :param freeze: move existing objects to permanent generation
+    :param threshold: gc thresholds, None to keep current ones
+    """
+
+    previous = gc.get_threshold()
+    unfreeze = freeze and not gc.get_freeze_count()
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    if threshold is not None:
+        gc.set_threshold(*threshold)
+
+    try:
+        yield
+    finally:
+        gc.set_threshold(*previous)
+        if unfreeze:
+            gc.unfreeze()
@@ -0,0 +1,208 @@
+"""Frame profiler.
+
+Measures how much time each phase of `Application.tick` takes. Profiler is
+disabled by default, when it isn't set to application the only cost is a few
+None checks per frame.
+
+All timings are in nanoseconds.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Callable
+from typing import IO, Any
+
+from eaf.clock import RingBuffer
+
+
+PHASES = ("timers", "events", "update", "render")
+"""Phases of Application.tick in order of execution."""
+
+
+class FrameRecord:
+    """Timings of single profiled frame."""
+
+    __slots__ = ("frame", "objects", "phases", "state", "total")
+
+    def __init__(self, frame: int, state: str) -> None:
+        self.frame = frame
+        self.state = state
+        self.phases: dict[str, int] = {}
+        self.objects: dict[str, int] = {}
+        self.total = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return record as JSON-serializable dict."""
+
+        return {
+            "frame": self.frame,
+            "state": self.state,
+            "total": self.total,
+            "phases": self.phases,
+            "objects": self.objects,
+        }
+
+
+class FrameProfiler:
+    """Collects per-phase timings of frames.
+
+    Keeps rolling window of timings per phase, per state and phase and per
+    type of updated objects if `track_objects` is set. Listeners receive
+    record of every frame.
+    """
+
+    def __init__(self, history: int = 120, track_objects: bool = False) -> None:
+        self._history = history
+        self._track_objects = track_objects
+
+        self._phases: dict[str, RingBuffer] = {}
+        self._states: dict[str, dict[str, RingBuffer]] = {}
+        self._objects: dict[str, RingBuffer] = {}
+        self._totals = RingBuffer(history)
+        self._listeners: list[Callable[[FrameRecord], None]] = []
+
+        self._frames = 0
+        self._record: FrameRecord | None = None
+        self._frame_start = 0
+        self._mark = 0
+
+    def _buffer(self, buffers: dict[str, RingBuffer], key: str) -> RingBuffer:
+        buffer = buffers.get(key)
+        if buffer is None:
+            buffer = buffers[key] = RingBuffer(self._history)
+
+        return buffer
+
+    def _get(self, buffers: dict[str, RingBuffer], key: str) -> RingBuffer:
+        """Return buffer or empty one if nothing was measured."""
+
+        buffer = buffers.get(key)
+        return buffer if buffer is not None else RingBuffer(1)
+
+    def begin_frame(self, state: object) -> None:
+        """Start measuring frame of state."""
+
+        self._record = FrameRecord(self._frames, str(state))
+        self._frame_start = self._mark = time.perf_counter_ns()
+
+    def lap(self, phase: str) -> None:
+        """Finish measuring phase, the next one starts right after."""
+
+        now = time.perf_counter_ns()
+        elapsed = now - self._mark
+        self._mark = now
+
+        record = self._record
+        if record is None:
+            return
+
+        record.phases[phase] = record.phases.get(phase, 0) + elapsed
+        self._buffer(self._phases, phase).append(elapsed)
+        self._buffer(self._states.setdefault(record.state, {}), phase).append(elapsed)
+
+    def record_object(self, type_name: str, elapsed: int) -> None:
+        """Account time spent in update of single object."""
+
+        record = self._record
+        if record is not None:
+            record.objects[type_name] = record.objects.get(type_name, 0) + elapsed
+
+    def end_frame(self) -> FrameRecord | None:
+        """Finish measuring frame and pass its record to listeners."""
+
+        record, self._record = self._record, None
+        if record is None:
+            return None
+
+        record.total = time.perf_counter_ns() - self._frame_start
+        self._totals.append(record.total)
+        for type_name, elapsed in record.objects.items():
+            self._buffer(self._objects, type_name).append(elapsed)
+
+        self._frames += 1
+        for listener in self._listeners:
+            listener(record)
+
+        return record
+
+    @property
+    def track_objects(self) -> bool:
+        """Whether time of every object update is measured."""
+
+        return self._track_objects
+
+    @track_objects.setter
+    def track_objects(self, val: bool) -> None:
+        self._track_objects = val
+
+    @property
+    def frames(self) -> int:
+        """Number of profiled frames."""
+
+        return self._frames
+
+    @property
+    def total(self) -> RingBuffer:
+        """Rolling window of whole frame timings."""
+
+        return self._totals
+
+    def phase(self, phase: str, state: str | None = None) -> RingBuffer:
+        """Rolling window of phase timings, optionally for single state."""
+
+        buffers = self._phases if state is None else self._states.get(state, {})
+        return self._get(buffers, phase)
+
+    def object_type(self, type_name: str) -> RingBuffer:
+        """Rolling window of per-frame update time of objects of type."""
+
+        return self._get(self._objects, type_name)
+
+    @property
+    def states(self) -> list[str]:
+        """Names of profiled states."""
+
+        return list(self._states)
+
+    @property
+    def object_types(self) -> list[str]:
+        """Names of profiled object types."""
+
+        return list(self._objects)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Return mean, p50, p99 and max of total and phase timings."""
+
+        buffers = {"total": self._totals, **self._phases}
+        return {
+            name: {
+                "mean": buffer.mean,
+                "p50": buffer.percentile(50),
+                "p99": buffer.percentile(99),
+                "max": buffer.max,
+            }
+            for name, buffer in buffers.items()
+        }
+
+    def add_listener(self, listener: Callable[[FrameRecord], None]) -> None:
+        """Call listener with record of every profiled frame."""
+
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[FrameRecord], None]) -> None:
+        """Stop calling listener."""
+
+        self._listeners.remove(listener)
+
+
+class JsonLinesExporter:
+    """Profiler listener that writes frame records to file, one JSON per line."""
+
+    def __init__(self, stream: IO[str]) -> None:
+        self._stream = stream
+
+    def __call__(self, record: FrameRecord) -> None:
+        self._stream.write(json.dumps(record.as_dict()))
+        self._stream.write("\n")
@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
+import bisect
+import itertools
+import sys
 import typing
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from typing import Any
+
+from eaf.core import Vec3
 
 
 if typing.TYPE_CHECKING:
-    from eaf.core import Vec3
+    from eaf.pool import Pool
+
+
+Rect = tuple[float, float, float, float]
+"""Screen rectangle: x, y, width, height."""
 
 
 class Image:
@@ -15,10 +28,165 @@ class Image:
     Image must implement protocol between Renderer and Renderable itself.
     """
 
+    width: int = 0
+    """Image width in renderer units, used for culling and damage tracking."""
+
+    height: int = 0
+    """Image height in renderer units, used for culling and damage tracking."""
+
+    nbytes: int = 0
+    """Approximate memory used by image, counted by image cache budget."""
+
+
+class ImageCache:
+    """Shared images by key, e.g. file name of sprite.
+
+    Identical images are loaded once and shared by all renderables that use
+    them. Images are loaded lazily on the first request. If budget is set,
+    least recently requested images are evicted when resident bytes exceed
+    it. Evicted image stays alive while renderables refer to it, the next
+    request loads it again.
+
+    :param loader: creates image by key when it's not cached
+    :param budget: maximum total `nbytes` of cached images, unlimited by
+                   default
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Hashable], Image] | None = None,
+        budget: int | None = None,
+    ) -> None:
+        if budget is not None and budget <= 0:
+            raise ValueError(f"Budget must be positive: {budget}")
+
+        self._loader = loader
+        self._budget = budget
+        self._images: OrderedDict[Hashable, Image] = OrderedDict()
+
+        self._resident = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._images
+
+    def get(self, key: Hashable, loader: Callable[[Hashable], Image] | None = None) -> Image:
+        """Return cached image or load it.
+
+        :param loader: used instead of cache's loader for this key
+        :raises KeyError: if image is not cached and there is no loader
+        """
+
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            self._hits += 1
+            return image
+
+        self._misses += 1
+        loader = loader or self._loader
+        if loader is None:
+            raise KeyError(f"Image {key!r} is not cached and there is no loader")
+
+        image = loader(key)
+        self.put(key, image)
+
+        return image
+
+    def put(self, key: Hashable, image: Image) -> None:
+        """Cache loaded image, replacing image cached by the same key."""
+
+        self.discard(key)
+        self._images[key] = image
+        self._resident += image.nbytes
+        self._evict()
+
+    def discard(self, key: Hashable) -> None:
+        """Remove image from cache if it's cached."""
+
+        image = self._images.pop(key, None)
+        if image is not None:
+            self._resident -= image.nbytes
+
+    def clear(self) -> None:
+        """Remove all images."""
+
+        self._images.clear()
+        self._resident = 0
+
+    def _evict(self) -> None:
+        """Remove least recently used images until budget is met.
+
+        The most recent image is kept even if it alone exceeds the budget.
+        """
+
+        if self._budget is None:
+            return
+
+        images = self._images
+        while self._resident > self._budget and len(images) > 1:
+            _, image = images.popitem(last=False)
+            self._resident -= image.nbytes
+            self._evictions += 1
+
+    @property
+    def budget(self) -> int | None:
+        """Maximum total bytes of cached images."""
+
+        return self._budget
+
+    @property
+    def resident(self) -> int:
+        """Total bytes of cached images."""
+
+        return self._resident
+
+    @property
+    def hits(self) -> int:
+        """Number of requests served from cache."""
+
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of requests that loaded image."""
+
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """Number of images evicted to meet the budget."""
+
+        return self._evictions
+
+
+class RenderableObserver(typing.Protocol):
+    """Object that must know when renderable changes (e.g. its State)."""
+
+    def renderable_changed(self, obj: Renderable) -> None:
+        """Called after position or image of renderable was set."""
+
+    def renderable_attached(self, obj: Renderable) -> None:
+        """Called after child with its descendants was attached to renderable."""
+
+    def renderable_detached(self, obj: Renderable) -> None:
+        """Called after child with its descendants was detached from renderable."""
+
 
 class Renderable:
     """Base class for renderable objects.
 
+    Renderables form a scene graph: children attached to a renderable store
+    position relative to their parent and move with it. World position of a
+    child is cached and recomputed only after position of the child or one of
+    its ancestors changes, either via setter or in place. Children are added
+    to and removed from state with their parent, don't add them separately.
+
     .. class-variables::
 
     * compound:
@@ -27,13 +195,29 @@ class Renderable:
 
     # TODO: this is not the place
     compound: bool = False
-    """Whether an object consists of other renderables."""
+    """Whether an object consists of other renderables.
+
+    Deprecated in favour of children, see `attach`.
+    """
 
     render_priority: int = 0
     """A priority value for renderer, greater -> rendered later."""
 
+    _observer: RenderableObserver | None = None
+    """Who is notified about changes made via pos and image setters."""
+
+    _pool: Pool[Any] | None = None
+    """Pool object is returned to when it's removed from state."""
+
     def __init__(self, pos: Vec3) -> None:
+        # Offset from parent, the same as world position for root objects
         self._pos = pos
+        # Cached world position of child, None if it must be recomputed
+        self._world: Vec3 | None = None
+        # Parent position, offset and world position the cache was made with
+        self._cached: tuple[float, ...] = ()
+        self._parent: Renderable | None = None
+        self._children: list[Renderable] = []
 
         # Image is not required by constructor, but renderable entity should
         # provide it via setter or directly assign to _image.
@@ -41,11 +225,161 @@ class Renderable:
 
     @property
     def pos(self) -> Vec3:
-        return self._pos
+        """World position.
+
+        Position of child is cached and recomputed when parent's position or
+        child's offset differ from ones the cache was made with, so changes
+        made in place (e.g. `parent.pos.add_scaled(vel, dt)`) move children
+        too. Changing child's position in place moves child by the same
+        offset relative to parent.
+        """
+
+        parent = self._parent
+        if parent is None:
+            return self._pos
+
+        origin = parent.pos
+        local = self._pos
+        world = self._world
+        if world is None:
+            world = self._world = origin + local
+        else:
+            cached = self._cached
+            if (world.x, world.y, world.z) != cached[6:]:
+                # Cached position was changed in place, keep the change
+                local = self._pos = Vec3(
+                    local.x + world.x - cached[6],
+                    local.y + world.y - cached[7],
+                    local.z + world.z - cached[8],
+                )
+            elif (origin.x, origin.y, origin.z, local.x, local.y, local.z) == cached[:6]:
+                return world
+            world.set(origin.x + local.x, origin.y + local.y, origin.z + local.z)
+
+        self._cached = (
+            origin.x, origin.y, origin.z,
+            local.x, local.y, local.z,
+            world.x, world.y, world.z,
+        )  # fmt: skip
+
+        return world
 
     @pos.setter
     def pos(self, pos: Vec3) -> None:
+        """Move object to world position, children move with it."""
+
+        if self._parent is None:
+            self._pos = pos
+        else:
+            self._pos = pos - self._parent.pos
+        self._moved()
+
+    @property
+    def local_pos(self) -> Vec3:
+        """Position relative to parent, world position for root objects."""
+
+        if self._parent is not None:
+            # Apply in-place change of world position, if any
+            self.pos  # noqa: B018
+
+        return self._pos
+
+    @local_pos.setter
+    def local_pos(self, pos: Vec3) -> None:
+        """Move object relative to parent, children move with it."""
+
         self._pos = pos
+        self._moved()
+
+    def _moved(self) -> None:
+        """Drop cached world position and notify observers of subtree.
+
+        World positions of descendants are revalidated when they are read.
+        """
+
+        self._world = None
+        if not self._children:
+            if self._observer is not None:
+                self._observer.renderable_changed(self)
+            return
+
+        for node in self.walk():
+            if node._observer is not None:
+                node._observer.renderable_changed(node)
+
+    @property
+    def parent(self) -> Renderable | None:
+        """Renderable this object is attached to."""
+
+        return self._parent
+
+    @property
+    def children(self) -> tuple[Renderable, ...]:
+        """Attached renderables in order of attachment."""
+
+        return tuple(self._children)
+
+    def walk(self) -> Iterator[Renderable]:
+        """Iterate over object and all its descendants, parents first."""
+
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node._children))
+
+    def attach(self, child: Renderable, local_pos: Vec3 | None = None) -> None:
+        """Make child move with this object.
+
+        Child attached to another object is detached from it first. If object
+        is in state, child with its descendants is added to the state.
+
+        :param local_pos: offset of child, by default child keeps its world
+                          position
+        :raises ValueError: if child is this object or one of its ancestors
+        """
+
+        node: Renderable | None = self
+        while node is not None:
+            if node is child:
+                raise ValueError(f"Can't attach {child} to its descendant {self}")
+            node = node._parent
+
+        if child._parent is not None:
+            child._parent.detach(child)
+
+        if local_pos is None:
+            local_pos = child._pos - self.pos
+        child._parent = self
+        child._pos = local_pos
+        self._children.append(child)
+        child._moved()
+
+        if self._observer is not None:
+            self._observer.renderable_attached(child)
+
+    def detach(self, child: Renderable) -> None:
+        """Make child a root object keeping its world position.
+
+        If object is in state, child with its descendants is removed from it.
+
+        :raises ValueError: if child is not attached to this object
+        """
+
+        self._unlink(child)
+        if self._observer is not None:
+            self._observer.renderable_detached(child)
+
+    def _unlink(self, child: Renderable) -> None:
+        """Remove child from children without notifying observer."""
+
+        if child._parent is not self:
+            raise ValueError(f"{child} is not attached to {self}")
+
+        self._children.remove(child)
+        child._pos = child.pos
+        child._parent = None
+        child._world = None
 
     @property
     def image(self) -> Image:
@@ -62,6 +396,31 @@ class Renderable:
 
         self._image = image
 
+        if self._observer is not None:
+            self._observer.renderable_changed(self)
+
+    def bounds(self) -> Rect:
+        """Screen rectangle occupied by object."""
+
+        pos = self.pos
+        image = self._image
+        if image is None:
+            return (pos.x, pos.y, 0, 0)
+
+        return (pos.x, pos.y, image.width, image.height)
+
+    def reinit(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Initialize object taken from pool.
+
+        Runs constructor again by default, subclasses can override it to
+        reuse expensive parts like images.
+        """
+
+        type(self).__init__(self, *args, **kwargs)
+
+    def reset(self) -> None:
+        """Drop references to other objects when returning to pool."""
+
     @property
     def type(self) -> str:
         return self.__class__.__name__
@@ -73,15 +432,187 @@ class Renderable:
         raise NotImplementedError()
 
 
+class RenderList:
+    """Renderable objects kept in render order.
+
+    Objects are bucketed by render priority, buckets keep insertion order, so
+    objects with equal priority are rendered in order of addition. Objects are
+    indexed by identity, adding and removing doesn't require full sort and
+    costs O(1) for existing priorities.
+
+    Renderers can iterate over the list directly without copying it.
+    """
+
+    def __init__(self, objects: Iterable[Renderable] = ()) -> None:
+        self._buckets: dict[int, dict[int, Renderable]] = {}
+        self._priorities: list[int] = []
+        self._index: dict[int, tuple[int, int]] = {}
+        self._counter = itertools.count()
+
+        self.extend(objects)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, obj: object) -> bool:
+        return id(obj) in self._index
+
+    def __iter__(self) -> Iterator[Renderable]:
+        for priority in self._priorities:
+            yield from self._buckets[priority].values()
+
+    def add(self, obj: Renderable) -> None:
+        """Add object, do nothing if it's already in the list."""
+
+        key = id(obj)
+        if key in self._index:
+            return
+
+        priority = obj.render_priority
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            bucket = self._buckets[priority] = {}
+            bisect.insort(self._priorities, priority)
+
+        bucket[key] = obj
+        self._index[key] = (priority, next(self._counter))
+
+    def extend(self, objects: Iterable[Renderable]) -> None:
+        """Add several objects."""
+
+        for obj in objects:
+            self.add(obj)
+
+    def remove(self, obj: Renderable) -> None:
+        """Remove object.
+
+        :raises ValueError: if object is not in the list
+        """
+
+        key = id(obj)
+        order = self._index.pop(key, None)
+        if order is None:
+            raise ValueError(f"{obj} is not in render list")
+
+        priority = order[0]
+        bucket = self._buckets[priority]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[priority]
+            del self._priorities[bisect.bisect_left(self._priorities, priority)]
+
+    def sort(self, objects: Iterable[Renderable]) -> list[Renderable]:
+        """Return subset of list's objects in render order."""
+
+        index = self._index
+        return sorted(objects, key=lambda obj: index[id(obj)])
+
+    def clear(self) -> None:
+        """Remove all objects."""
+
+        self._buckets.clear()
+        self._priorities.clear()
+        self._index.clear()
+
+
+class DamageTracker:
+    """Collects renderables changed since the last frame.
+
+    Remembers bounds each object had when it was rendered, so damaged regions
+    include both where object was and where it is now. Positions changed in
+    place (e.g. `obj.pos.x += 1` or `obj.pos.add_scaled(vel, dt)`) don't
+    notify observers, such objects are noticed only if pos setter is called.
+    """
+
+    def __init__(self) -> None:
+        self._bounds: dict[int, Rect] = {}
+        self._changed: dict[int, Renderable] = {}
+        self._removed: dict[int, Renderable] = {}
+
+    def add(self, obj: Renderable) -> None:
+        """Start tracking object, it's damaged until rendered."""
+
+        self._removed.pop(id(obj), None)
+        self._changed[id(obj)] = obj
+
+    def remove(self, obj: Renderable) -> None:
+        """Stop tracking object, its last bounds are damaged."""
+
+        key = id(obj)
+        self._changed.pop(key, None)
+        if key in self._bounds:
+            self._removed[key] = obj
+
+    def mark(self, obj: Renderable) -> None:
+        """Mark object as changed."""
+
+        self._changed[id(obj)] = obj
+
+    def take(self) -> tuple[list[Renderable], list[Renderable], list[Rect]]:
+        """Return changes since the previous call and forget them.
+
+        :return: changed objects, removed objects and damaged regions
+        """
+
+        regions = []
+        for key in self._removed:
+            regions.append(self._bounds.pop(key))
+
+        for key, obj in self._changed.items():
+            previous = self._bounds.get(key)
+            current = self._bounds[key] = obj.bounds()
+            if previous is not None and previous != current:
+                regions.append(previous)
+            regions.append(current)
+
+        changed = list(self._changed.values())
+        removed = list(self._removed.values())
+        self._changed.clear()
+        self._removed.clear()
+
+        return changed, removed, regions
+
+
+class DrawCommand(typing.NamedTuple):
+    """Position and image of renderable taken when it was submitted."""
+
+    x: float
+    y: float
+    image: Image | None
+    obj: Renderable
+
+
+Batch = tuple[Hashable, list[DrawCommand]]
+"""Draw commands of the same render priority sharing batch key."""
+
+# Batch key that differs from any key, so the first batch is a state switch
+_NO_KEY = object()
+
+
 class Renderer:
     """Base renderer class. Instance can be used as dummy renderer.
 
     Each renderer have screen to render to. This is the only assumption this
     class makes.
+
+    Renderers that keep their own copy of the scene may set `retained`, then
+    instead of the whole scene every frame they receive only changes via
+    `render_changes`.
+
+    Immediate mode renderers receive objects via `submit`, which converts them
+    to draw commands and groups commands of the same render priority by
+    `batch_key`, so backend switches its state (texture, color pair) once per
+    group instead of once per object. Every group is drawn by `render_batch`.
     """
 
+    retained: bool = False
+    """Whether renderer receives only changed objects."""
+
     def __init__(self, screen) -> None:
         self._screen = screen
+        self._draw_calls = 0
+        self._state_switches = 0
+        self._last_key: Hashable = _NO_KEY
 
     @property
     def screen(self):
@@ -90,14 +621,327 @@ class Renderer:
     def clear(self) -> None:
         pass
 
-    def render_objects(self, objects: list[Renderable]) -> None:
+    def render_objects(self, objects: Iterable[Renderable]) -> None:
         pass
 
+    def begin_frame(self) -> None:
+        """Reset per-frame counters, called before objects are submitted."""
+
+        self._draw_calls = 0
+        self._state_switches = 0
+        self._last_key = _NO_KEY
+
+    def batch_key(self, obj: Renderable) -> Hashable:
+        """Return render state object is drawn with, e.g. texture.
+
+        Within the same render priority objects are drawn grouped by key, so
+        overlapping objects with different keys should differ in priority.
+        The same key for all objects (default) keeps objects in order.
+
+        Key must depend only on object: with pipelined rendering it's called
+        on the loop thread while render thread draws.
+        """
+
+        return None
+
+    def submit(self, objects: Iterable[Renderable]) -> None:
+        """Draw objects in render order in batches grouped by `batch_key`.
+
+        Renderers that don't implement `render_batch` receive all objects by
+        single `render_objects` call.
+        """
+
+        if type(self).render_batch is Renderer.render_batch:
+            self._draw_calls += 1
+            self.render_objects(objects)
+            return
+
+        self.draw(self.build_batches(objects))
+
+    def build_batches(self, objects: Iterable[Renderable]) -> Iterator[Batch]:
+        """Convert objects to draw commands grouped by priority and key.
+
+        Commands keep position and image objects had at the moment they were
+        converted, so batches can be drawn later, e.g. by render thread.
+        """
+
+        batch_key = self.batch_key
+        groups: dict[Hashable, list[DrawCommand]] = {}
+        layer = None
+        for obj in objects:
+            priority = obj.render_priority
+            if priority != layer:
+                yield from groups.items()
+                groups = {}
+                layer = priority
+
+            pos = obj.pos
+            command = DrawCommand(pos.x, pos.y, obj._image, obj)
+            group = groups.get(key := batch_key(obj))
+            if group is None:
+                groups[key] = [command]
+            else:
+                group.append(command)
+
+        yield from groups.items()
+
+    def draw(self, batches: Iterable[Batch]) -> None:
+        """Draw batches counting draw calls and state switches."""
+
+        for key, commands in batches:
+            if key != self._last_key:
+                self._state_switches += 1
+                self._last_key = key
+            self._draw_calls += 1
+            self.render_batch(key, commands)
+
+    def render_batch(self, key: Hashable, commands: list[DrawCommand]) -> None:
+        """Draw commands sharing the same render state."""
+
+        self.render_objects([command.obj for command in commands])
+
+    @property
+    def draw_calls(self) -> int:
+        """Number of batches drawn since the frame began."""
+
+        return self._draw_calls
+
+    @property
+    def state_switches(self) -> int:
+        """Number of times batch key changed since the frame began."""
+
+        return self._state_switches
+
+    def render_changes(
+        self,
+        changed: list[Renderable],
+        removed: list[Renderable],
+        regions: list[Rect],
+    ) -> None:
+        """Update retained scene, called only if something changed.
+
+        :param changed: objects added, moved or changed image
+        :param removed: objects removed from scene
+        :param regions: damaged screen regions to redraw
+        """
+
     def present(self) -> None:
         pass
 
-    def get_width(self) -> None:
+    def get_width(self) -> int | None:
         pass
 
-    def get_height(self) -> None:
+    def get_height(self) -> int | None:
         pass
+
+
+class CellBuffer:
+    """Grid of text cells stored in flat arrays.
+
+    Each cell has a character, stored as code point, and an integer attribute
+    which meaning is defined by renderer (e.g. color pair and style flags).
+    Drawing outside of the grid is clipped.
+    """
+
+    __slots__ = ("_blank_attrs", "_blank_chars", "attrs", "chars", "height", "width")
+
+    def __init__(self, width: int, height: int, fill: str = " ", attr: int = 0) -> None:
+        self.width = width
+        self.height = height
+        self._blank_chars = array("I", [ord(fill)]) * (width * height)
+        self._blank_attrs = array("I", [attr]) * (width * height)
+        self.chars = array("I", self._blank_chars)
+        self.attrs = array("I", self._blank_attrs)
+
+    def clear(self) -> None:
+        """Fill grid with blank cells."""
+
+        self.chars[:] = self._blank_chars
+        self.attrs[:] = self._blank_attrs
+
+    def copy_from(self, other: CellBuffer) -> None:
+        """Copy cells of buffer of the same size."""
+
+        self.chars[:] = other.chars
+        self.attrs[:] = other.attrs
+
+    def put(self, x: int, y: int, char: str, attr: int = 0) -> None:
+        """Set single cell."""
+
+        if 0 <= x < self.width and 0 <= y < self.height:
+            index = y * self.width + x
+            self.chars[index] = ord(char)
+            self.attrs[index] = attr
+
+    def write(self, x: int, y: int, text: str, attr: int = 0) -> None:
+        """Write text starting from cell, text doesn't wrap."""
+
+        if not 0 <= y < self.height or x >= self.width:
+            return
+
+        if x < 0:
+            text = text[-x:]
+            x = 0
+
+        text = text[: self.width - x]
+        start = y * self.width + x
+        end = start + len(text)
+        self.chars[start:end] = array("I", map(ord, text))
+        self.attrs[start:end] = array("I", [attr]) * len(text)
+
+    def get(self, x: int, y: int) -> tuple[str, int]:
+        """Return character and attribute of cell."""
+
+        index = y * self.width + x
+        return chr(self.chars[index]), self.attrs[index]
+
+    def diff(self, previous: CellBuffer, gap: int = 0) -> Iterator[tuple[int, int, str, int]]:
+        """Iterate over runs of cells which differ from previous buffer.
+
+        Run is a sequence of cells in the same row with the same attribute.
+        Unchanged cells between two changed ones are included into a run if
+        there are at most `gap` of them, because rewriting few cells is cheaper
+        than moving cursor.
+
+        :return: iterator over (x, y, text, attribute)
+        """
+
+        width = self.width
+        chars, attrs = self.chars, self.attrs
+        old_chars, old_attrs = previous.chars, previous.attrs
+
+        for y in range(self.height):
+            row = y * width
+            end = row + width
+            if chars[row:end] == old_chars[row:end] and attrs[row:end] == old_attrs[row:end]:
+                continue
+
+            start = -1
+            last = -1
+            for index in range(row, end):
+                if chars[index] == old_chars[index] and attrs[index] == old_attrs[index]:
+                    continue
+
+                attr = attrs[index]
+                skipped = index - last - 1
+                if start >= 0 and (
+                    skipped > gap
+                    or attr != attrs[start]
+                    or attrs[last + 1 : index].count(attr) != skipped
+                ):
+                    yield start - row, y, "".join(map(chr, chars[start : last + 1])), attrs[start]
+                    start = -1
+
+                if start < 0:
+                    start = index
+                last = index
+
+            if start >= 0:
+                yield start - row, y, "".join(map(chr, chars[start : last + 1])), attrs[start]
+
+
+class TextImage(Image):
+    """Image made of lines of text with single attribute."""
+
+    def __init__(self, text: str | list[str], attr: int = 0) -> None:
+        self.lines = text.splitlines() if isinstance(text, str) else list(text)
+        self.attr = attr
+        self.width = max(map(len, self.lines), default=0)
+        self.height = len(self.lines)
+        self.nbytes = sum(map(sys.getsizeof, self.lines))
+
+
+class TextRenderer(Renderer):
+    """Double-buffered renderer for text terminals.
+
+    Objects are drawn into back buffer, `present` compares it with the front
+    buffer (what is on the screen now) and writes only changed runs of cells
+    to the screen stream with single write call.
+
+    Subclasses may override `render_objects` to draw images other than
+    TextImage and `move`/`format_attr` for terminals other than ANSI. All
+    characters are assumed to occupy single cell.
+    """
+
+    GAP = 4
+    """Maximum number of unchanged cells rewritten to avoid cursor movement."""
+
+    def __init__(self, screen: typing.TextIO, width: int, height: int) -> None:
+        super().__init__(screen)
+        self._back = CellBuffer(width, height)
+        # Nothing is known about screen contents, first frame is written fully
+        self._front = CellBuffer(width, height, fill="\0")
+        self._written = 0
+
+    @property
+    def buffer(self) -> CellBuffer:
+        """Buffer of the frame being drawn."""
+
+        return self._back
+
+    @property
+    def written(self) -> int:
+        """Number of characters written by the last present call."""
+
+        return self._written
+
+    def clear(self) -> None:
+        self._back.clear()
+
+    def render_objects(self, objects: Iterable[Renderable]) -> None:
+        for obj in objects:
+            image = obj._image
+            if isinstance(image, TextImage):
+                self._draw(obj.pos.x, obj.pos.y, image)
+
+    def render_batch(self, key: Hashable, commands: list[DrawCommand]) -> None:
+        for command in commands:
+            if isinstance(command.image, TextImage):
+                self._draw(command.x, command.y, command.image)
+
+    def _draw(self, x: float, y: float, image: TextImage) -> None:
+        x, y = int(x), int(y)
+        for offset, line in enumerate(image.lines):
+            self._back.write(x, y + offset, line, image.attr)
+
+    def move(self, x: int, y: int) -> str:
+        """Return control sequence that moves cursor to cell."""
+
+        return f"\x1b[{y + 1};{x + 1}H"
+
+    def format_attr(self, attr: int) -> str:
+        """Return control sequence that sets attribute, ANSI SGR by default."""
+
+        return f"\x1b[0;{attr}m" if attr else "\x1b[0m"
+
+    def present(self) -> None:
+        parts = []
+        current_attr = -1
+        cursor = (-1, -1)
+        for x, y, text, attr in self._back.diff(self._front, self.GAP):
+            if cursor != (x, y):
+                parts.append(self.move(x, y))
+            cursor = (x + len(text), y)
+            if attr != current_attr:
+                parts.append(self.format_attr(attr))
+                current_attr = attr
+            parts.append(text)
+
+        output = "".join(parts)
+        self._written = len(output)
+        if output:
+            self._screen.write(output)
+            self._screen.flush()
+
+        self._front.copy_from(self._back)
+
+    def invalidate(self) -> None:
+        """Forget screen contents, the next frame is written fully."""
+
+        self._front.chars[:] = array("I", [0]) * len(self._front.chars)
+
+    def get_width(self) -> int:
+        return self._back.width
+
+    def get_height(self) -> int:
+        return self._back.height
@@ -0,0 +1,246 @@
+"""Spatial indexing of renderables.
+
+Index is maintained by State incrementally: objects are reindexed when their
+position or image is set, queries cost proportionally to the number of
+objects in the queried area instead of the whole scene. Positions changed in
+place (e.g. `obj.pos.add_scaled(vel, dt)`) don't notify observers, State
+picks them up by refreshing the index after every update.
+"""
+
+from __future__ import annotations
+
+import math
+import typing
+from collections.abc import Iterator
+
+from eaf.core import Vec3
+
+
+if typing.TYPE_CHECKING:
+    from eaf.render import Rect, Renderable, Renderer
+
+
+CellRange = tuple[int, int, int, int]
+"""Cells occupied by object: first column, first row, last column, last row."""
+
+
+def overlaps(a: Rect, b: Rect) -> bool:
+    """Whether rectangles intersect, zero-sized rectangle is a point."""
+
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+
+    return _overlaps_1d(ax, aw, bx, bw) and _overlaps_1d(ay, ah, by, bh)
+
+
+def _overlaps_1d(a: float, a_size: float, b: float, b_size: float) -> bool:
+    if not a_size:
+        return b <= a < b + b_size or (not b_size and a == b)
+    if not b_size:
+        return a <= b < a + a_size
+
+    return a < b + b_size and b < a + a_size
+
+
+class SpatialHash:
+    """Uniform grid of cells, each cell holds objects intersecting it.
+
+    Cell size should be comparable with typical object size: too small cells
+    make large objects occupy many cells, too large ones make queries check
+    many objects outside of area.
+    """
+
+    def __init__(self, cell_size: float = 64.0) -> None:
+        if cell_size <= 0:
+            raise ValueError(f"Cell size must be positive: {cell_size}")
+
+        self._cell_size = cell_size
+        self._cells: dict[tuple[int, int], dict[int, Renderable]] = {}
+        self._ranges: dict[int, CellRange] = {}
+        self._objects: dict[int, Renderable] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, obj: object) -> bool:
+        return id(obj) in self._ranges
+
+    @property
+    def cell_size(self) -> float:
+        """Size of grid cell."""
+
+        return self._cell_size
+
+    def _range(self, rect: Rect) -> CellRange:
+        """Return cells covered by rectangle."""
+
+        x, y, w, h = rect
+        size = self._cell_size
+
+        return (
+            math.floor(x / size),
+            math.floor(y / size),
+            math.floor((x + w) / size),
+            math.floor((y + h) / size),
+        )
+
+    def _link(self, key: int, obj: Renderable, cells: CellRange) -> None:
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self._cells.get((cx, cy))
+                if cell is None:
+                    cell = self._cells[cx, cy] = {}
+                cell[key] = obj
+
+    def _unlink(self, key: int, cells: CellRange) -> None:
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self._cells[cx, cy]
+                del cell[key]
+                if not cell:
+                    del self._cells[cx, cy]
+
+    def insert(self, obj: Renderable) -> None:
+        """Index object, reindex it if it's already indexed."""
+
+        key = id(obj)
+        if key in self._ranges:
+            self.update(obj)
+            return
+
+        cells = self._ranges[key] = self._range(obj.bounds())
+        self._objects[key] = obj
+        self._link(key, obj, cells)
+
+    def remove(self, obj: Renderable) -> None:
+        """Remove object from index.
+
+        :raises KeyError: if object is not indexed
+        """
+
+        key = id(obj)
+        self._unlink(key, self._ranges.pop(key))
+        del self._objects[key]
+
+    def update(self, obj: Renderable) -> None:
+        """Reindex object after it moved, cheap if it stays in the same cells."""
+
+        key = id(obj)
+        cells = self._range(obj.bounds())
+        previous = self._ranges[key]
+        if cells == previous:
+            return
+
+        self._unlink(key, previous)
+        self._ranges[key] = cells
+        self._link(key, obj, cells)
+
+    def refresh(self) -> None:
+        """Reindex all objects, picks up positions changed in place."""
+
+        for obj in self._objects.values():
+            self.update(obj)
+
+    def clear(self) -> None:
+        """Remove all objects."""
+
+        self._cells.clear()
+        self._ranges.clear()
+        self._objects.clear()
+
+    def query_rect(self, rect: Rect) -> list[Renderable]:
+        """Return objects intersecting rectangle, each object once."""
+
+        found: dict[int, Renderable] = {}
+        x0, y0, x1, y1 = self._range(rect)
+        cells = self._cells
+
+        # Iterate over the smaller of queried area and occupied cells
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(cells):
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    cell = cells.get((cx, cy))
+                    if cell is not None:
+                        found.update(cell)
+        else:
+            for (cx, cy), cell in cells.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    found.update(cell)
+
+        return [obj for obj in found.values() if overlaps(obj.bounds(), rect)]
+
+    def query_radius(self, center: Vec3, radius: float) -> list[Renderable]:
+        """Return objects which bounds are within radius from center."""
+
+        cx, cy = center.x, center.y
+        candidates = self.query_rect((cx - radius, cy - radius, 2 * radius, 2 * radius))
+        radius_sq = radius * radius
+
+        result = []
+        for obj in candidates:
+            x, y, w, h = obj.bounds()
+            dx = max(x - cx, 0, cx - x - w)
+            dy = max(y - cy, 0, cy - y - h)
+            if dx * dx + dy * dy <= radius_sq:
+                result.append(obj)
+
+        return result
+
+    def pairs(self, exact: bool = True) -> Iterator[tuple[Renderable, Renderable]]:
+        """Iterate over pairs of objects sharing a cell, each pair once.
+
+        This is broad phase of collision detection: cost is proportional to
+        the number of objects and their neighbours instead of n^2.
+
+        :param exact: yield only pairs which bounds intersect, otherwise all
+                      pairs of neighbours are yielded
+        """
+
+        ranges = self._ranges
+        for (cx, cy), cell in self._cells.items():
+            if len(cell) < 2:
+                continue
+
+            items = list(cell.items())
+            for i, (key_a, obj_a) in enumerate(items):
+                ax0, ay0, _, _ = ranges[key_a]
+                for key_b, obj_b in items[i + 1 :]:
+                    bx0, by0, _, _ = ranges[key_b]
+                    # Pair sharing several cells is reported in the first one
+                    if (cx, cy) != (max(ax0, bx0), max(ay0, by0)):
+                        continue
+                    if exact and not overlaps(obj_a.bounds(), obj_b.bounds()):
+                        continue
+
+                    yield obj_a, obj_b
+
+
+class Viewport:
+    """Visible area of the scene, used by State to cull objects.
+
+    Position is the top left corner of the area in scene coordinates. Size
+    defaults to renderer's screen size. Renderers that translate scene to
+    screen coordinates may use viewport position as camera offset.
+    """
+
+    def __init__(
+        self,
+        pos: Vec3 | None = None,
+        width: float | None = None,
+        height: float | None = None,
+    ) -> None:
+        self.pos = pos if pos is not None else Vec3()
+        self.width = width
+        self.height = height
+
+    def rect(self, renderer: Renderer) -> Rect | None:
+        """Return visible rectangle, None if size is unknown."""
+
+        width = self.width if self.width is not None else renderer.get_width()
+        height = self.height if self.height is not None else renderer.get_height()
+        if width is None or height is None:
+            return None
+
+        return (self.pos.x, self.pos.y, width, height)
@@ -2,25 +2,36 @@
 
 from __future__ import annotations
 
+import contextlib
 import logging
+import time
 import typing
-from operator import attrgetter
+from collections.abc import Callable, Iterable, Iterator
+
+from eaf.render import DamageTracker, RenderList
+from eaf.spatial import SpatialHash
 
 
 if typing.TYPE_CHECKING:
     from eaf.app import Application
-    from eaf.render import Renderable, Renderer
+    from eaf.ecs import World
+    from eaf.pool import Pool
+    from eaf.render import Batch, Renderable
+    from eaf.spatial import Viewport
 
 
 LOG = logging.getLogger(__name__)
 
+R = typing.TypeVar("R", bound="Renderable")
+
 
 class State:
     """Base class for application states.
 
     State is a container for objects. User should add and remove objects via
     state methods. Other systems (e.g. collision or animation) must carefully
-    refer to state objects to not cause memory leaks.
+    refer to state objects to not cause memory leaks. Such systems can find
+    objects by position via spatial index, see `enable_spatial_index`.
     """
 
     def __init__(self, app: Application) -> None:
@@ -29,7 +40,21 @@ class State:
         self._app = app
         self._actor = None
 
-        self._objects: list[Renderable] = []
+        self._objects = RenderList()
+
+        # Changes of objects made while state iterates over them
+        self._pending: list[tuple[Callable[[typing.Any], None], typing.Any]] = []
+        self._deferring = 0
+
+        # Optional entity-component-system storage
+        self._world: World | None = None
+
+        # Retained mode renderers receive only changes
+        self._damage = DamageTracker() if app.renderer.retained else None
+
+        # Spatial index is created on demand, e.g. for culling
+        self._index: SpatialHash | None = None
+        self._viewport: Viewport | None = None
 
     def postinit(self) -> None:
         """Do all instantiations that require prepared State object."""
@@ -59,23 +84,141 @@ class State:
 
         self._actor = val
 
+    @property
+    def world(self) -> World | None:
+        """ECS world getter, None if state doesn't use ECS."""
+
+        return self._world
+
+    @world.setter
+    def world(self, world: World | None) -> None:
+        """ECS world setter, its systems run and components render with state."""
+
+        self._world = world
+
+    @property
+    def spatial_index(self) -> SpatialHash | None:
+        """Spatial index of state's objects, None if not enabled."""
+
+        return self._index
+
+    def enable_spatial_index(self, cell_size: float = 64.0) -> SpatialHash:
+        """Create spatial index of state's objects, maintained automatically.
+
+        Index is rebuilt if it already exists.
+        """
+
+        self._index = SpatialHash(cell_size)
+        for obj in self._objects:
+            self._index.insert(obj)
+
+        return self._index
+
+    @property
+    def viewport(self) -> Viewport | None:
+        """Visible area, objects outside of it are not rendered."""
+
+        return self._viewport
+
+    @viewport.setter
+    def viewport(self, viewport: Viewport | None) -> None:
+        """Visible area setter, enables spatial index if needed."""
+
+        if viewport is not None and self._index is None:
+            self.enable_spatial_index()
+
+        self._viewport = viewport
+
+    def result(self) -> typing.Any:  # noqa: ANN401
+        """Outcome of simulation collected by headless runner."""
+
+        return None
+
     def events(self) -> None:
         """Event handler, called by `Application.loop` method."""
 
         raise NotImplementedError()
 
-    def update(self, dt: int) -> None:
-        """Update handler, called every frame."""
+    def update(self, dt: float) -> None:
+        """Update handler, called every frame.
 
-        for obj in self._objects:
-            obj.update(dt)
+        Objects added or removed by other objects during update are applied
+        after all objects are updated. Systems of ECS world run after objects.
+        Spatial index is refreshed afterwards, so objects moved in place are
+        culled and queried by their actual positions.
+        """
 
-    def render(self) -> None:
-        """Render handler, called every frame."""
+        profiler = self._app.profiler
+        with self.deferred():
+            if profiler is not None and profiler.track_objects:
+                for obj in self._objects:
+                    start = time.perf_counter_ns()
+                    obj.update(dt)  # type: ignore
+                    profiler.record_object(type(obj).__name__, time.perf_counter_ns() - start)
+            else:
+                for obj in self._objects:
+                    obj.update(dt)  # type: ignore
+
+        if self._world is not None:
+            self._world.update(dt)
+
+        if self._index is not None:
+            self._index.refresh()
+
+    def render(self, alpha: float = 1.0) -> None:
+        """Render handler, called every frame.
+
+        Retained mode renderers receive only objects changed since the previous
+        frame, nothing is rendered if nothing changed. Immediate mode renderers
+        receive only objects within viewport if it's set. Components of ECS
+        world are neither culled nor passed to retained mode renderers.
+
+        :param alpha: interpolation factor between two last fixed updates,
+                      always 1.0 for variable timestep
+        """
 
-        self.app.renderer.clear()
-        self.app.renderer.render_objects(self._objects)
-        self.app.renderer.present()
+        renderer = self.app.renderer
+        if self._damage is not None:
+            changed, removed, regions = self._damage.take()
+            if changed or removed:
+                renderer.render_changes(changed, removed, regions)
+                renderer.present()
+            return
+
+        renderer.begin_frame()
+        renderer.clear()
+        renderer.submit(self._visible())
+        if self._world is not None:
+            renderer.submit(self._world.renderables())
+        renderer.present()
+
+    def snapshot(self, alpha: float = 1.0) -> tuple[Batch, ...]:
+        """Render data of frame, used instead of `render` in pipelined mode.
+
+        Objects are converted to draw commands by the same rules as `render`
+        uses for immediate mode renderers, render thread draws them while
+        the next frame is updated. Only `batch_key` and screen size of
+        renderer are used here.
+
+        :param alpha: interpolation factor, see `render`
+        """
+
+        renderer = self.app.renderer
+        batches = list(renderer.build_batches(self._visible()))
+        if self._world is not None:
+            batches.extend(renderer.build_batches(self._world.renderables()))
+
+        return tuple(batches)
+
+    def _visible(self) -> Iterable[Renderable]:
+        """Objects within viewport in render order."""
+
+        if self._viewport is not None and self._index is not None:
+            rect = self._viewport.rect(self.app.renderer)
+            if rect is not None:
+                return self._objects.sort(self._index.query_rect(rect))
+
+        return self._objects
 
     # TODO: [object-system]
     #  * implement GameObject common class for using in states
@@ -88,11 +231,32 @@ class State:
         """Add GameObject to State's list of objects.
 
         State will call GameObject.update() and pass to render all it's objects
-        every frame.
+        every frame. Inside `deferred` block addition is postponed.
         """
 
+        if self._deferring:
+            self._pending.append((self._add, obj))
+        else:
+            self._add(obj)
+
+    def spawn(self, pool: Pool[R], *args: typing.Any, **kwargs: typing.Any) -> R:  # noqa: ANN401
+        """Take object from pool and add it to state.
+
+        Object is returned to the pool when it's removed from state.
+        """
+
+        obj = pool.acquire(*args, **kwargs)
+        obj._pool = pool
+        self.add(obj)
+
+        return obj
+
+    def _add(self, obj: Renderable | list[Renderable]) -> None:
+        """Add objects to State's list of objects immediately."""
+
         obj = list(obj) if isinstance(obj, list) else [obj]
-        self._objects += obj
+        for item in obj:
+            self._attach(item)
         LOG.debug(f"Adding {obj} to state {self}")
 
         # TODO: Because we don't have common GameObject interface
@@ -101,14 +265,98 @@ class State:
             if item.compound:
                 subitems = item.get_renderable_objects()
                 LOG.debug(f"Adding subitems: {subitems}")
-                self._objects += subitems
+                for subitem in subitems:
+                    self._attach(subitem)
+
+    def _attach(self, obj: Renderable) -> None:
+        """Put renderable with its descendants to state's containers.
+
+        Descendants follow their ancestors in render list, so within the same
+        render priority children are rendered over their parents.
+        """
+
+        # Most objects are leaves, don't walk them
+        self._attach_nodes(obj.walk() if obj._children else (obj,))
+
+    def _attach_nodes(self, nodes: Iterable[Renderable]) -> None:
+        for node in nodes:
+            self._objects.add(node)
+            node._observer = self
+            if self._damage is not None:
+                self._damage.add(node)
+            if self._index is not None:
+                self._index.insert(node)
+
+    def _detach(self, obj: Renderable) -> None:
+        """Remove renderable with its descendants from state's containers.
+
+        :raises ValueError: if object is not in state
+        """
+
+        self._detach_nodes(obj.walk() if obj._children else (obj,))
+
+    def _detach_nodes(self, nodes: Iterable[Renderable]) -> None:
+        for node in nodes:
+            self._objects.remove(node)
+            node._observer = None
+            if self._damage is not None:
+                self._damage.remove(node)
+            if self._index is not None:
+                self._index.remove(node)
+
+    def renderable_changed(self, obj: Renderable) -> None:
+        """Track change of position or image of state's object."""
+
+        if self._damage is not None:
+            self._damage.mark(obj)
+        if self._index is not None:
+            self._index.update(obj)
+
+    def renderable_attached(self, obj: Renderable) -> None:
+        """Add child attached to state's object with its descendants."""
+
+        self._apply(self._attach_child, obj)
+
+    def renderable_detached(self, obj: Renderable) -> None:
+        """Remove child detached from state's object with its descendants."""
+
+        self._apply(self._detach_child, obj)
+
+    def _attach_child(self, obj: Renderable) -> None:
+        """Add nodes of attached subtree which are not in state yet.
+
+        Postponed attachment is skipped if parent left the state meanwhile.
+        """
+
+        parent = obj._parent
+        if parent is not None and parent._observer is self:
+            self._attach_nodes([node for node in obj.walk() if node._observer is not self])
+
+    def _detach_child(self, obj: Renderable) -> None:
+        """Remove nodes of detached subtree which are still in state.
 
-        self._objects.sort(key=attrgetter("render_priority"))
+        Nodes may be already removed, e.g. if child was removed from state
+        and detached from parent in the same deferred block.
+        """
+
+        self._detach_nodes([node for node in obj.walk() if node._observer is self])
 
     def remove(self, obj: Renderable) -> None:
         """Remove object from State's list of objects.
 
-        Removed objects should be collected by GC.
+        Removed objects should be collected by GC, spawned ones are returned
+        to their pools. Inside `deferred` block removal is postponed.
+        """
+
+        if self._deferring:
+            self._pending.append((self._remove, obj))
+        else:
+            self._remove(obj)
+
+    def _remove(self, obj: Renderable) -> None:
+        """Remove object from State's list of objects immediately.
+
+        Child object is detached from its parent.
         """
 
         LOG.debug("%s", obj)
@@ -116,13 +364,61 @@ class State:
         try:
             if obj.compound:
                 for subobj in obj.get_renderable_objects():
-                    self._objects.remove(subobj)
+                    self._detach(subobj)
                     del subobj
-            self._objects.remove(obj)
+            self._detach(obj)
+            if obj._parent is not None:
+                obj._parent._unlink(obj)
         except ValueError:
             LOG.exception("Object %s is not in State's object list.", obj)
+        else:
+            if obj._pool is not None:
+                obj._pool.release(obj)
         finally:
             del obj
 
+    def _apply(self, change: Callable[[typing.Any], None], obj: typing.Any) -> None:  # noqa: ANN401
+        """Apply change of objects now or postpone it inside `deferred` block."""
+
+        if self._deferring:
+            self._pending.append((change, obj))
+        else:
+            change(obj)
+
+    @contextlib.contextmanager
+    def deferred(self) -> Iterator[None]:
+        """Postpone additions and removals of objects until the block exits.
+
+        Blocks can be nested, changes are applied on the outermost exit in the
+        order they were requested.
+        """
+
+        self._deferring += 1
+        try:
+            yield
+        finally:
+            self._deferring -= 1
+            if not self._deferring:
+                self.flush()
+
+    def flush(self) -> None:
+        """Apply postponed additions and removals of objects.
+
+        Failed change doesn't prevent the rest from being applied, the first
+        error is raised after all changes are processed.
+        """
+
+        pending, self._pending = self._pending, []
+        error: Exception | None = None
+        for apply, obj in pending:
+            try:
+                apply(obj)
+            except Exception as exc:
+                if error is None:
+                    error = exc
+
+        if error is not None:
+            raise error
+
     def __str__(self) -> str:
         return f"{self.__class__.__name__}"
@@ -1,66 +1,293 @@
-"""Simple timer that must be updated in loop."""
+"""Timers that must be updated in loop.
 
+Scheduler keeps deadlines of all its timers in a heap, so advancing it costs
+time proportional to the number of expired timers, not to the number of
+pending ones. Application owns a scheduler and advances it every frame.
+
+Time is measured in seconds, loop deltas are passed in milliseconds.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
 from collections.abc import Callable
 
 
+class TimerHandle:
+    """Handle of the callback scheduled in Scheduler."""
+
+    __slots__ = (
+        "_cancelled",
+        "_deadline",
+        "_func",
+        "_interval",
+        "_remaining",
+        "_scheduler",
+        "_seq",
+    )
+
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        func: Callable[[], None],
+        interval: float | None,
+    ) -> None:
+        self._scheduler = scheduler
+        self._func = func
+        self._interval = interval
+        self._deadline = 0.0
+        self._seq = -1
+        self._remaining: float | None = None
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        """Cancel callback, handle can't be used after that."""
+
+        if not self._cancelled:
+            self._cancelled = True
+            self._scheduler._discard(self)
+
+    def pause(self) -> None:
+        """Stop time counting for callback until resumed."""
+
+        if self.active:
+            self._remaining = self._deadline - self._scheduler.time
+            self._scheduler._discard(self)
+
+    def resume(self) -> None:
+        """Continue counting time for paused callback."""
+
+        if self._remaining is not None and not self._cancelled:
+            remaining, self._remaining = self._remaining, None
+            self._scheduler._push(self, self._scheduler.time + remaining)
+
+    @property
+    def active(self) -> bool:
+        """Whether callback is waiting for its deadline."""
+
+        return not self._cancelled and self._remaining is None
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether callback was cancelled or fired without repeating."""
+
+        return self._cancelled
+
+    @property
+    def paused(self) -> bool:
+        """Whether callback is paused."""
+
+        return self._remaining is not None and not self._cancelled
+
+    @property
+    def deadline(self) -> float:
+        """Scheduler time callback will be called at."""
+
+        return self._deadline
+
+    @property
+    def remaining(self) -> float:
+        """Time left until callback is called."""
+
+        if self._remaining is not None:
+            return self._remaining
+
+        return self._deadline - self._scheduler.time
+
+
+class Scheduler:
+    """Calls functions at given time. Doesn't have own loop.
+
+    Cancelled and paused callbacks are removed from heap lazily.
+    """
+
+    def __init__(self) -> None:
+        self._time = 0.0
+        self._heap: list[tuple[float, int, TimerHandle]] = []
+        self._counter = itertools.count()
+        self._active = 0
+        self._paused = False
+
+    def __len__(self) -> int:
+        """Number of active callbacks."""
+
+        return self._active
+
+    def _push(self, handle: TimerHandle, deadline: float) -> None:
+        """Put handle to heap with new deadline."""
+
+        handle._deadline = deadline
+        handle._seq = next(self._counter)
+        heapq.heappush(self._heap, (deadline, handle._seq, handle))
+        self._active += 1
+
+    def _discard(self, handle: TimerHandle) -> None:
+        """Invalidate heap entry of handle."""
+
+        if handle._seq < 0:
+            return
+
+        handle._seq = -1
+        self._active -= 1
+
+        # Drop stale entries when they prevail
+        if len(self._heap) > 64 and self._active < len(self._heap) // 2:
+            self._heap[:] = [entry for entry in self._heap if entry[1] == entry[2]._seq]
+            heapq.heapify(self._heap)
+
+    def call_later(
+        self,
+        delay: float,
+        func: Callable[[], None],
+        interval: float | None = None,
+    ) -> TimerHandle:
+        """Call function after delay seconds.
+
+        :param delay: time before the first call
+        :param func: callback
+        :param interval: repeat callback with interval if set
+        """
+
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Repeat interval must be positive: {interval}")
+
+        handle = TimerHandle(self, func, interval)
+        self._push(handle, self._time + delay)
+        return handle
+
+    def call_every(self, interval: float, func: Callable[[], None]) -> TimerHandle:
+        """Call function every interval seconds."""
+
+        return self.call_later(interval, func, interval)
+
+    def advance(self, dt: float) -> int:
+        """Move time forward and call expired callbacks in deadline order.
+
+        Callbacks see scheduler time equal to their deadline.
+
+        :param dt: time delta in milliseconds
+        :return: number of calls made
+        """
+
+        if self._paused:
+            return 0
+
+        target = self._time + dt / 1000
+        heap = self._heap
+        calls = 0
+
+        while heap and heap[0][0] <= target:
+            deadline, seq, handle = heapq.heappop(heap)
+            if seq != handle._seq:
+                continue
+
+            handle._seq = -1
+            self._active -= 1
+            self._time = deadline
+
+            if handle._interval is not None:
+                self._push(handle, deadline + handle._interval)
+            else:
+                handle._cancelled = True
+
+            handle._func()
+            calls += 1
+
+        self._time = target
+        return calls
+
+    def pause(self) -> None:
+        """Freeze time for all callbacks."""
+
+        self._paused = True
+
+    def resume(self) -> None:
+        """Unfreeze time."""
+
+        self._paused = False
+
+    @property
+    def paused(self) -> bool:
+        """Whether scheduler is paused."""
+
+        return self._paused
+
+    @property
+    def time(self) -> float:
+        """Current scheduler time in seconds."""
+
+        return self._time
+
+
 class Timer:
-    """Simple timer, calls callback when time's up. Doesn't have own loop."""
+    """Simple timer, calls callback when time's up. Doesn't have own loop.
+
+    Timer is a facade over Scheduler. Without scheduler it owns private one
+    which is advanced by `update`. Timers bound to shared scheduler (e.g.
+    `Application.scheduler`) are advanced by its owner, `update` does nothing.
+    """
 
-    def __init__(self, end_time: int | float, func: Callable[[], None]) -> None:
+    def __init__(
+        self,
+        end_time: int | float,
+        func: Callable[[], None],
+        scheduler: Scheduler | None = None,
+    ) -> None:
         self._end = float(end_time)
         self._func = func
+        self._own_scheduler = scheduler is None
+        self._scheduler = Scheduler() if scheduler is None else scheduler
+        self._handle: TimerHandle | None = None
         self._start = 0.0
-        self._current = self._start
+        self._elapsed = 0.0
         self._running = False
 
-    def _tick(self, dt: int) -> None:
-        """Refresh counter."""
+    def _fire(self) -> None:
+        """Call function and stop when time's up."""
 
-        if self.running:
-            self._current += dt / 1000
-
-    def _time_is_up(self) -> bool:
-        """return is it time to fire fuction or not."""
-
-        return self._current - self._start >= self._end
+        self._running = False
+        self._handle = None
+        self._elapsed = self._end
+        self._func()
 
     def start(self) -> None:
         """Start timer."""
 
+        self.reset()
         self._running = True
-        self._start = 0.0
-        self._current = 0.0
+        self._start = self._scheduler.time
+        self._handle = self._scheduler.call_later(self._end, self._fire)
 
     def stop(self) -> None:
         """Stop timer."""
 
+        if self._handle is not None:
+            self._elapsed = self.elapsed
+            self._handle.cancel()
+            self._handle = None
+
         self._running = False
 
     def restart(self) -> None:
         """Restart timer."""
 
-        self._start = 0.0
-        self._current = 0.0
         self.start()
 
     def reset(self) -> None:
         """Reset timer."""
 
-        self._running = False
-        self._start = 0.0
-        self._current = 0.0
+        self.stop()
+        self._elapsed = 0.0
 
-    def update(self, dt: int) -> None:
+    def update(self, dt: int | float) -> None:
         """Public method for using in loops."""
 
-        if not self.running:
+        if not self.running or not self._own_scheduler:
             return
 
         # Timer's accuracy depends on owner's loop
-        self._tick(dt)
-        if self._time_is_up() and self.running:
-            self._func()
-            self.stop()
+        self._scheduler.advance(dt)
 
     @property
     def running(self) -> bool:
@@ -72,7 +299,10 @@ class Timer:
     def elapsed(self) -> float:
         """Elapsed time from start."""
 
-        return self._current - self._start
+        if self._running:
+            return self._scheduler.time - self._start
+
+        return self._elapsed
 
     @property
     def remaining(self) -> float:
@@ -0,0 +1,237 @@
+"""Batches of 3D vectors backed by NumPy arrays.
+
+Requires numpy, install eaf with `numpy` extra.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Any, overload
+
+import numpy as np
+import numpy.typing as npt
+
+from eaf.core import Vec3
+
+
+class Vec3Array:
+    """Batch of 3D vectors stored as structure of arrays.
+
+    Components are kept in one (3, n) array, so x, y and z are contiguous
+    rows and each operator processes the whole batch at once. Operands may be
+    Vec3Array, Vec3 (applied to every vector), numbers or arrays broadcastable
+    to (3, n), e.g. per-vector factors of shape (n,).
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, size: int = 0, dtype: npt.DTypeLike = np.float64) -> None:
+        self._data: npt.NDArray[Any] = np.zeros((3, size), dtype=dtype)
+
+    @classmethod
+    def from_array(cls, data: npt.NDArray[Any]) -> Vec3Array:
+        """Wrap existing (3, n) array without copying."""
+
+        if data.ndim != 2 or data.shape[0] != 3:
+            raise ValueError(f"Expected array of shape (3, n), got {data.shape}")
+
+        array = cls.__new__(cls)
+        array._data = data
+        return array
+
+    @classmethod
+    def from_vecs(cls, vecs: Iterable[Vec3], dtype: npt.DTypeLike = np.float64) -> Vec3Array:
+        """Create batch from Vec3 objects."""
+
+        data = np.array([vec.as_tuple3() for vec in vecs], dtype=dtype).reshape(-1, 3)
+        return cls.from_array(np.ascontiguousarray(data.T))
+
+    def to_vecs(self) -> list[Vec3]:
+        """Return batch as list of independent Vec3 objects."""
+
+        return [Vec3(x, y, z) for x, y, z in self._data.T.tolist()]
+
+    def copy(self) -> Vec3Array:
+        """Return batch with copied data."""
+
+        return Vec3Array.from_array(self._data.copy())
+
+    @property
+    def data(self) -> npt.NDArray[Any]:
+        """Underlying (3, n) array."""
+
+        return self._data
+
+    def _row(self, axis: int) -> npt.NDArray[Any]:
+        row: npt.NDArray[Any] = self._data[axis]
+        return row
+
+    @property
+    def x(self) -> npt.NDArray[Any]:
+        """View of x components."""
+
+        return self._row(0)
+
+    @x.setter
+    def x(self, val: npt.ArrayLike) -> None:
+        self._data[0] = val
+
+    @property
+    def y(self) -> npt.NDArray[Any]:
+        """View of y components."""
+
+        return self._row(1)
+
+    @y.setter
+    def y(self, val: npt.ArrayLike) -> None:
+        self._data[1] = val
+
+    @property
+    def z(self) -> npt.NDArray[Any]:
+        """View of z components."""
+
+        return self._row(2)
+
+    @z.setter
+    def z(self, val: npt.ArrayLike) -> None:
+        self._data[2] = val
+
+    def __len__(self) -> int:
+        return int(self._data.shape[1])
+
+    def __repr__(self) -> str:
+        return f"Vec3Array(size={len(self)}, dtype={self._data.dtype})"
+
+    __str__ = __repr__
+
+    def __iter__(self) -> Iterator[Vec3Proxy]:
+        for index in range(len(self)):
+            yield Vec3Proxy(self._data, index)
+
+    @overload
+    def __getitem__(self, index: int) -> Vec3Proxy: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Vec3Array: ...
+
+    def __getitem__(self, index: int | slice) -> Vec3Proxy | Vec3Array:
+        """Return proxy to single vector or batch view for slice."""
+
+        if isinstance(index, slice):
+            return Vec3Array.from_array(self._data[:, index])
+
+        size = len(self)
+        if not -size <= index < size:
+            raise IndexError(f"Vec3Array index out of range: {index}")
+
+        return Vec3Proxy(self._data, index % size)
+
+    def __setitem__(self, index: int | slice, value: Vec3 | Vec3Array) -> None:
+        operand = self._operand("assign", value)
+        if isinstance(index, int) and isinstance(operand, np.ndarray):
+            operand = operand.reshape(3)
+
+        self._data[:, index] = operand
+
+    def _operand(self, operation: str, value: object) -> Any:  # noqa: ANN401
+        """Convert operand to something broadcastable to data array."""
+
+        if isinstance(value, Vec3Array):
+            return value._data
+        elif isinstance(value, Vec3):
+            return np.array(value.as_tuple3(), dtype=self._data.dtype).reshape(3, 1)
+        elif isinstance(value, int | float | np.ndarray | np.number):
+            return value
+        else:
+            raise ValueError(f"Wrong type to {operation} {type(value)}: {value}")
+
+    def _scalar(self, operation: str, value: object) -> Any:  # noqa: ANN401
+        """Convert operand of multiplication or division, vectors are not allowed."""
+
+        if isinstance(value, Vec3 | Vec3Array):
+            raise ValueError(f"Wrong type to {operation} {type(value)}: {value}")
+
+        return self._operand(operation, value)
+
+    def __add__(self, other: object) -> Vec3Array:
+        return Vec3Array.from_array(self._data + self._operand("add", other))
+
+    def __sub__(self, other: object) -> Vec3Array:
+        return Vec3Array.from_array(self._data - self._operand("sub", other))
+
+    def __mul__(self, other: object) -> Vec3Array:
+        return Vec3Array.from_array(self._data * self._scalar("mul", other))
+
+    def __truediv__(self, other: object) -> Vec3Array:
+        return Vec3Array.from_array(self._data / self._scalar("div", other))
+
+    def __iadd__(self, other: object) -> Vec3Array:
+        self._data += self._operand("add", other)
+        return self
+
+    def __isub__(self, other: object) -> Vec3Array:
+        self._data -= self._operand("sub", other)
+        return self
+
+    def __imul__(self, other: object) -> Vec3Array:
+        self._data *= self._scalar("mul", other)
+        return self
+
+    def __itruediv__(self, other: object) -> Vec3Array:
+        self._data /= self._scalar("div", other)
+        return self
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Vec3Array):
+            return NotImplemented
+
+        return bool(np.array_equal(self._data, other._data))
+
+    __hash__ = None  # type: ignore
+
+    def add_scaled(self, other: Vec3Array | Vec3, k: float | npt.NDArray[Any]) -> Vec3Array:
+        """Add other multiplied by k in place, e.g. `pos.add_scaled(vel, dt)`."""
+
+        self._data += self._operand("add", other) * k
+        return self
+
+
+class Vec3Proxy(Vec3):
+    """Vec3 compatible view of single vector stored in Vec3Array.
+
+    Reading and writing components goes directly to the array.
+    """
+
+    __slots__ = ("_data", "_index")
+
+    def __init__(self, data: npt.NDArray[Any], index: int) -> None:
+        self._data = data
+        self._index = index
+
+    def _get(self, axis: int) -> int | float:
+        value: int | float = self._data[axis, self._index].item()
+        return value
+
+    @property
+    def x(self) -> int | float:
+        return self._get(0)
+
+    @x.setter
+    def x(self, val: int | float) -> None:
+        self._data[0, self._index] = val
+
+    @property
+    def y(self) -> int | float:
+        return self._get(1)
+
+    @y.setter
+    def y(self, val: int | float) -> None:
+        self._data[1, self._index] = val
+
+    @property
+    def z(self) -> int | float:
+        return self._get(2)
+
+    @z.setter
+    def z(self, val: int | float) -> None:
+        self._data[2, self._index] = val
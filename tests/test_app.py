@@ -1,10 +1,16 @@
 """Unittests for eaf.app module."""
 
+import threading
+import time
+
 import pytest
+from tornado import ioloop
 
 import eaf.app
 import eaf.errors
 from eaf.app import Application
+from eaf.events import Event, EventQueue
+from eaf.loop import ManualLoop
 
 from .common import AnotherStateMock, StateMock
 
@@ -76,6 +82,13 @@ def test_multiple_state_application(monkeypatch):
     assert hasattr(app.state, "marker") is False
 
     assert pytest.raises(ValueError, lambda: setattr(app, "fps", "thirty"))
+    fps = app.fps
+    for invalid in (0, -1):
+        with pytest.raises(ValueError):
+            app.fps = invalid
+        # Invalid value doesn't leave application half-updated
+        assert app.fps == fps
+        assert app.pacer.period == pytest.approx(1 / fps)
 
 
 def test_application_loop():
@@ -89,3 +102,248 @@ def test_application_loop():
     # FIXME: test loop properly
     # assert app.start() is None
     assert app.stop() is None
+
+
+def test_fixed_timestep(monkeypatch):
+    updates = []
+    renders = []
+
+    class FixedStepState(StateMock):
+        def update(self, dt):
+            updates.append(dt)
+
+        def render(self, alpha=1.0):
+            renders.append(alpha)
+
+    app = Application(fixed_step=10, max_steps=3)
+    app.register(FixedStepState)
+    assert app.fixed_step == 10
+
+    monkeypatch.setattr(app.clock, "tick", lambda: 25)
+    app.tick()
+    assert updates == [10, 10]
+    assert renders == [0.5]
+    assert app.alpha == 0.5
+
+    # Accumulated 5 + 25 = 30 -> exactly 3 steps, nothing left
+    app.tick()
+    assert updates == [10] * 5
+    assert renders[-1] == 0.0
+
+    # Catch-up is capped by max_steps, the backlog is dropped
+    monkeypatch.setattr(app.clock, "tick", lambda: 1005)
+    app.tick()
+    assert updates == [10] * 8
+    assert renders[-1] == 0.5
+
+    app.fixed_step = None
+    app.tick()
+    assert updates[-1] == 1005
+    assert renders[-1] == 1.0
+
+    with pytest.raises(ValueError):
+        app.fixed_step = 0
+
+    app.stop()
+
+
+def test_deadline_pacing():
+    # Applications left by previous tests share the current IOLoop
+    loop = ioloop.IOLoop()
+    loop.make_current()
+
+    frames = []
+    callbacks = []
+
+    class PacedState(StateMock):
+        def update(self, dt):
+            # IOLoop must be free to run other callbacks between frames
+            count = len(frames)
+            self.app.loop.call_soon(lambda: callbacks.append(count))
+
+        def render(self, alpha=1.0):
+            frames.append(self.app.loop.time())
+            if len(frames) == 3:
+                self.app.stop()
+
+    app = Application(fps=100, pacing="deadline")
+    assert app.pacing == "deadline"
+    app.register(PacedState)
+    app.start()
+
+    assert app.frame_count == 3
+    assert callbacks == [0, 1, 2]
+    # Frames are kept on the grid, a late frame may shorten the next gap
+    assert frames[-1] - frames[0] >= 2 * 0.01 - 0.002
+
+    with pytest.raises(ValueError):
+        Application(pacing="sleep")
+
+    loop.clear_current()
+    loop.close()
+
+
+def test_application_scheduler(monkeypatch):
+    fired = []
+
+    class TimerState(StateMock):
+        def update(self, dt):
+            pass
+
+        def render(self, alpha=1.0):
+            pass
+
+    app = Application()
+    app.register(TimerState)
+    app.scheduler.call_later(0.05, lambda: fired.append(app.frame_count))
+
+    monkeypatch.setattr(app.clock, "tick", lambda: 30)
+    app.tick()
+    assert fired == []
+    app.tick()
+    assert fired == [1]
+
+    app.stop()
+
+
+def test_application_events():
+    class Key(Event):
+        __slots__ = ("code",)
+
+        def __init__(self, code):
+            self.code = code
+
+    handled = []
+
+    class InputState(StateMock):
+        def postinit(self):
+            self.app.event_queue.subscribe(Key, lambda event: handled.append(event.code))
+
+        def events(self):
+            # Queue is dispatched before state polls its own input
+            handled.append("events")
+
+        def update(self, dt):
+            pass
+
+        def render(self, alpha=1.0):
+            pass
+
+    queue = EventQueue(capacity=4)
+    app = Application(event_queue=queue)
+    assert app.event_queue is queue
+    app.register(InputState)
+
+    queue.push_many([Key(1), Key(2)])
+    app.tick()
+    assert handled == [1, 2, "events"]
+    assert len(queue) == 0
+
+    app.stop()
+
+
+def test_application_inbox():
+    handled = []
+
+    class InboxState(StateMock):
+        def events(self):
+            handled.append("events")
+
+        def update(self, dt):
+            pass
+
+        def render(self, alpha=1.0):
+            pass
+
+    app = Application()
+    app.register(InboxState)
+
+    def worker(start):
+        app.inbox.post_many((handled.append, (i,)) for i in range(start, start + 3))
+
+    threads = [threading.Thread(target=worker, args=(start,)) for start in (0, 10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    app.tick()
+    # Batches are not interleaved and are handled before state events
+    assert sorted(handled[:3]) == handled[:3]
+    assert sorted(handled[:6]) == [0, 1, 2, 10, 11, 12]
+    assert handled[6:] == ["events"]
+    assert app.inbox.handled == 6
+
+    app.stop()
+
+
+def test_frame_rate():
+    class BusyState(StateMock):
+        busy = 0.0
+
+        def update(self, dt):
+            time.sleep(self.busy)
+
+        def render(self, alpha=1.0):
+            pass
+
+    loop = ManualLoop()
+    app = Application(fps=10, loop=loop)
+    app.register(BusyState)
+
+    # fps is frames per second, not milliseconds between frames
+    loop.advance(1.0)
+    assert app.frame_count == 10
+
+    # Changed rate is applied to running loop
+    app.fps = 20
+    loop.advance(1.001)
+    assert app.frame_count == 30
+    assert app.frame_rate.target == 20
+
+    app.stop()
+
+    # Overrunning frames lower the rate down to the floor
+    loop = ManualLoop()
+    app = Application(fps=100, min_fps=50, pacing="deadline", loop=loop)
+    app.register(BusyState)
+    app.state.busy = 0.012
+    loop.advance(0.1)
+    assert app.frame_rate.rate < 100
+    assert app.pacer.period == pytest.approx(app.frame_rate.period)
+    assert app.achieved_fps > 0
+
+    app.stop()
+
+
+def test_application_activate():
+    first = Application()
+    second = Application()
+    # The first created application stays the global one
+    base = Application.current()
+    assert base is not second
+
+    with second.activate() as active:
+        assert active is second
+        assert Application.current() is second
+        with first.activate():
+            assert eaf.app.current() is first
+        assert Application.current() is second
+    assert Application.current() is base
+
+    seen = []
+
+    class CurrentState(StateMock):
+        def update(self, dt):
+            seen.append((Application.current(), dt))
+
+        def render(self, alpha=1.0):
+            pass
+
+    second.register(CurrentState)
+    second.tick(16)
+    assert seen == [(second, 16)]
+    assert Application.current() is base
+
+    first.stop()
+    second.stop()
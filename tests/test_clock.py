@@ -1,18 +1,143 @@
 import math
 import time
 
-from eaf.clock import Clock
+import pytest
+
+from eaf.clock import Clock, FramePacer, FrameRateController, RingBuffer
 
 
 def test_clock():
+    t1 = time.perf_counter_ns()
     clock = Clock()
-    t1 = int(time.monotonic())
 
     assert clock.delta == 0
     assert clock.fps == 0
 
+    time.sleep(0.002)
     dt = clock.tick()
-    t2 = int(time.monotonic())
+    t2 = time.perf_counter_ns()
 
-    assert math.isclose(t2 - t1, dt)
+    assert 2.0 <= dt <= (t2 - t1) / 1_000_000
     assert clock.delta == dt
+    assert clock.delta_ns == clock.frame_times.max
+    assert math.isclose(clock.delta_s * 1000, dt)
+    assert math.isclose(clock.fps, 1000 / dt)
+
+    # Sub-millisecond frames are not collapsed to zero
+    assert clock.tick_ns() > 0
+    assert clock.fps > 0
+    assert len(clock.frame_times) == 2
+
+
+def test_clock_framerate():
+    clock = Clock()
+    assert clock.tick(framerate=100) >= 10.0
+
+
+def test_clock_framerate_overrun():
+    clock = Clock()
+    time.sleep(0.01)
+    # Frame took longer than 1000 FPS allows, clock must not try to sleep
+    assert clock.tick(framerate=1000) >= 10.0
+
+
+def test_ring_buffer():
+    buffer = RingBuffer(4)
+    assert len(buffer) == 0
+    assert buffer.mean == 0
+    assert buffer.min == buffer.max == buffer.percentile(50) == 0
+
+    for value in (5, 1, 3):
+        buffer.append(value)
+
+    assert len(buffer) == 3
+    assert buffer.total == 9
+    assert buffer.mean == 3
+    assert buffer.min == 1
+    assert buffer.max == 5
+
+    # Oldest value is overwritten
+    buffer.append(7)
+    buffer.append(9)
+    assert len(buffer) == 4
+    assert buffer.total == 20
+    assert buffer.max == 9
+    assert buffer.min == 1
+    assert buffer.percentile(0) == 1
+    assert buffer.percentile(50) == 3
+    assert buffer.percentile(75) == 7
+    assert buffer.percentile(100) == 9
+
+    with pytest.raises(ValueError):
+        buffer.percentile(101)
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+    # Oldest to newest, 5 was overwritten
+    assert list(buffer) == [1, 3, 7, 9]
+    assert buffer.histogram([2, 8]) == [1, 2, 1]
+
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.total == 0
+    assert list(buffer) == []
+
+
+def test_frame_pacer():
+    pacer = FramePacer(fps=10)
+    assert math.isclose(pacer.period, 0.1)
+
+    assert math.isclose(pacer.next_deadline(100.0), 100.1)
+    # Late callback doesn't shift the grid
+    assert math.isclose(pacer.next_deadline(100.13), 100.2)
+    assert pacer.skipped == 0
+
+    # Overrun: missed frames are skipped, grid is kept
+    assert math.isclose(pacer.next_deadline(100.55), 100.6)
+    assert pacer.skipped == 3
+
+    pacer.reset()
+    assert math.isclose(pacer.next_deadline(200.0), 200.1)
+
+
+def test_frame_rate_controller():
+    controller = FrameRateController(target=100)
+    assert controller.rate == 100
+    assert math.isclose(controller.period, 0.01)
+
+    # Without floor rate never adapts
+    for _ in range(10):
+        assert not controller.record(20_000_000)
+    assert controller.rate == 100
+    assert math.isclose(controller.load, 2.0)
+
+    controller.floor = 60
+    overrun = 20_000_000
+    assert not controller.record(overrun)
+    assert not controller.record(overrun)
+    assert controller.record(overrun)
+    assert controller.rate == 80
+
+    # Lowered step by step down to the floor
+    for _ in range(6):
+        controller.record(overrun)
+    assert controller.rate == 60
+
+    # Raised back after enough frames with headroom
+    idle = 1_000_000
+    changes = sum(controller.record(idle) for _ in range(controller.UP_AFTER * 3))
+    assert changes == 3
+    assert controller.rate == 100
+
+    # Changing target resets rate, floor follows lower target
+    controller.record(overrun)
+    controller.target = 50
+    assert controller.rate == 50
+    assert controller.floor == 50
+
+    with pytest.raises(ValueError):
+        controller.target = 0
+    with pytest.raises(ValueError):
+        controller.floor = 51
+    with pytest.raises(ValueError):
+        FrameRateController(target=-1)
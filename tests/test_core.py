@@ -1,3 +1,5 @@
+import math
+
 import pytest
 
 from eaf.core import Vec3
@@ -33,8 +35,8 @@ def test_vec3_operationa():
         assert a * "a"
     with pytest.raises(ValueError):
         assert a / "a"
-    with pytest.raises(ValueError):
-        assert a == "a"
+    assert (a == "a") is False
+    assert a != "a"
 
     a.x = bx
     a.y = by
@@ -52,3 +54,64 @@ def test_vec3_operationa():
     assert a + Vec3(-50, -50, -50) == Vec3(-30, -30, -30)
 
     assert Vec3(1.9, 1.9)[int] == Vec3(1, 1, 0)
+
+
+def test_vec3_inplace_operations():
+    a = Vec3(1, 2, 3)
+    b = Vec3(10, 20, 30)
+    a_id = id(a)
+
+    a += b
+    assert a == Vec3(11, 22, 33)
+    a -= Vec3(1, 2, 3)
+    assert a == Vec3(10, 20, 30)
+    a += 1
+    a -= 1
+    a *= 2
+    assert a == Vec3(20, 40, 60)
+    a /= 4
+    assert a == Vec3(5, 10, 15)
+    assert id(a) == a_id
+    # Operand is not changed
+    assert b == Vec3(10, 20, 30)
+
+    assert a.add_scaled(b, 0.5) is a
+    assert a == Vec3(10, 20, 30)
+    assert a.set(1, 2) is a
+    assert a == Vec3(1, 2, 0)
+
+    for operand in ("a", None):
+        with pytest.raises(ValueError):
+            a += operand
+        with pytest.raises(ValueError):
+            a -= operand
+        with pytest.raises(ValueError):
+            a *= operand
+        with pytest.raises(ValueError):
+            a /= operand
+    with pytest.raises(ValueError):
+        a *= b
+
+
+def test_vec3_math():
+    x = Vec3(1, 0, 0)
+    y = Vec3(0, 1, 0)
+
+    assert x.dot(y) == 0
+    assert Vec3(1, 2, 3).dot(Vec3(4, 5, 6)) == 32
+    assert x.cross(y) == Vec3(0, 0, 1)
+    assert y.cross(x) == Vec3(0, 0, -1)
+
+    v = Vec3(3, 4, 0)
+    assert v.length_sq() == 25
+    assert v.length() == 5
+    assert v.distance_sq(Vec3(0, 0, 0)) == 25
+
+    assert v.normalize() is v
+    assert math.isclose(v.length(), 1.0)
+    assert Vec3().normalize() == Vec3()
+
+
+def test_vec3_hash():
+    assert hash(Vec3(1, 2, 3)) == hash(Vec3(1, 2, 3))
+    assert len({Vec3(1, 2, 3), Vec3(1, 2, 3), Vec3()}) == 2
@@ -0,0 +1,151 @@
+"""Tests for eaf.ecs module."""
+
+import pytest
+
+from eaf.core import Vec3
+from eaf.ecs import System, World
+from eaf.render import Renderable, Renderer
+from eaf.state import State
+
+
+class Velocity(Vec3):
+    pass
+
+
+class Sprite(Renderable):
+    render_priority = 1
+
+
+class Background(Renderable):
+    render_priority = 0
+
+
+class Health:
+    def __init__(self, value):
+        self.value = value
+
+
+class Movement(System):
+    components = (Sprite, Velocity)
+
+    def process(self, dt, sprites, velocities):
+        for sprite, velocity in zip(sprites, velocities, strict=True):
+            sprite.pos.add_scaled(velocity, dt)
+
+
+class Reaper(System):
+    components = (Health,)
+
+    def __init__(self, world):
+        self.world = world
+
+    def process(self, dt, healths):
+        for entity in list(self.world.entities(Health)):
+            if self.world.get(entity, Health).value <= 0:
+                self.world.destroy(entity)
+                # Destroying is deferred until systems finish
+                assert entity in self.world
+
+
+def test_world_components():
+    world = World()
+    a = world.create(Sprite(Vec3()), Velocity(1, 0, 0))
+    b = world.create(Sprite(Vec3()))
+    c = world.create(Health(10))
+
+    assert len(world) == 3
+    assert world.has(a, Velocity)
+    assert not world.has(b, Velocity)
+    assert sorted(world.entities(Sprite)) == [a, b]
+    assert len(list(world.query(Sprite))) == 2
+    assert len(list(world.query(Sprite, Velocity))) == 1
+
+    world.add_component(b, Velocity(0, 1, 0))
+    assert world.get(b, Velocity) == Vec3(0, 1, 0)
+    assert sorted(world.entities(Sprite, Velocity)) == [a, b]
+
+    world.add_component(b, Velocity(0, 2, 0))
+    assert world.get(b, Velocity) == Vec3(0, 2, 0)
+
+    world.remove_component(a, Velocity)
+    assert not world.has(a, Velocity)
+    assert world.get(c, Health).value == 10
+
+    world.destroy(a)
+    assert a not in world
+    assert world.get(b, Velocity) == Vec3(0, 2, 0)
+    assert list(world.entities(Sprite)) == [b]
+
+    with pytest.raises(KeyError):
+        world.destroy(a)
+    with pytest.raises(KeyError):
+        world.get(c, Velocity)
+
+
+def test_world_systems():
+    world = World()
+    movement = Movement()
+    world.add_system(movement)
+    world.add_system(Reaper(world))
+
+    sprite = Sprite(Vec3())
+    world.create(sprite, Velocity(1, 2, 0))
+    alive = world.create(Health(1))
+    dead = world.create(Health(0))
+
+    world.update(2)
+    assert sprite.pos == Vec3(2, 4, 0)
+    assert alive in world
+    assert dead not in world
+
+    world.remove_system(movement)
+    world.update(2)
+    assert sprite.pos == Vec3(2, 4, 0)
+
+    with pytest.raises(NotImplementedError):
+        System().process(0)
+
+
+def test_world_failed_change():
+    world = World()
+    doomed = world.create(Health(0))
+    created = []
+
+    class Clumsy(System):
+        components = (Health,)
+
+        def process(self, dt, healths):
+            # The second destroy fails when changes are applied
+            world.destroy(doomed)
+            world.destroy(doomed)
+            created.append(world.create(Health(1)))
+
+    world.add_system(Clumsy())
+    with pytest.raises(KeyError):
+        world.update(1)
+
+    # Changes queued after the failed one are applied anyway
+    assert doomed not in world
+    assert created[0] in world
+    world.flush()
+
+
+def test_state_world(mock_application, monkeypatch):
+    app = mock_application()
+    state = State(app)
+    assert state.world is None
+
+    state.world = World()
+    state.world.add_system(Movement())
+
+    background = Background(Vec3())
+    sprite = Sprite(Vec3())
+    state.world.create(sprite, Velocity(1, 1, 1))
+    state.world.create(background)
+    state.update(1)
+    assert sprite.pos == Vec3(1, 1, 1)
+
+    rendered = []
+    monkeypatch.setattr(Renderer, "render_objects", lambda self, objects: rendered.extend(objects))
+    state.render()
+    assert rendered == [background, sprite]
@@ -0,0 +1,153 @@
+"""Tests for eaf.events module."""
+
+import threading
+import time
+
+import pytest
+
+from eaf.events import Event, EventQueue
+
+
+class Key(Event):
+    __slots__ = ("code",)
+
+    def __init__(self, code):
+        self.code = code
+
+
+class KeyUp(Key):
+    __slots__ = ()
+
+
+class MouseMove(Event):
+    __slots__ = ("x", "y")
+
+    coalesce = True
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def codes(events):
+    return [event.code for event in events]
+
+
+def test_event_queue():
+    queue = EventQueue(capacity=4)
+    assert queue.capacity == 4
+    assert queue.overflow == "drop_oldest"
+    assert repr(Key(1)) == "Key(code=1)"
+
+    assert queue.push_many([Key(1), Key(2), Key(3)]) == 3
+    assert len(queue) == 3
+    assert codes(queue.drain(limit=2)) == [1, 2]
+
+    # Wraps around the end of buffer
+    queue.push_many([Key(4), Key(5), Key(6)])
+    assert codes(queue.drain()) == [3, 4, 5, 6]
+    assert queue.drain() == []
+
+    queue.push(Key(7))
+    queue.clear()
+    assert len(queue) == 0
+
+    with pytest.raises(ValueError):
+        EventQueue(capacity=0)
+    with pytest.raises(ValueError):
+        EventQueue(overflow="ignore")
+
+
+def test_overflow():
+    queue = EventQueue(capacity=2)
+    queue.push_many([Key(1), Key(2), Key(3)])
+    assert codes(queue.drain()) == [2, 3]
+    assert queue.dropped == 1
+
+    queue = EventQueue(capacity=2, overflow="drop_newest")
+    assert queue.push_many([Key(1), Key(2), Key(3)]) == 2
+    assert codes(queue.drain()) == [1, 2]
+    assert queue.dropped == 1
+
+    queue = EventQueue(capacity=1, overflow="block")
+    queue.push(Key(1))
+    assert not queue.push(Key(2), timeout=0.01)
+    assert queue.dropped == 1
+
+    # Producer thread waits until consumer frees space
+    producer = threading.Thread(target=queue.push, args=(Key(3),))
+    producer.start()
+    assert codes(queue.drain()) == [1]
+    producer.join()
+    assert codes(queue.drain()) == [3]
+
+    # Batch waits no longer than timeout in total
+    queued = []
+    producer = threading.Thread(
+        target=lambda: queued.append(queue.push_many([Key(4), Key(5), Key(6)], timeout=0.05))
+    )
+    start = time.monotonic()
+    producer.start()
+    producer.join()
+    assert time.monotonic() - start < 1
+    assert queued == [1]
+    assert queue.dropped == 3
+
+    # Consumer thread would wait for itself forever, so it doesn't wait
+    queue = EventQueue(capacity=1, overflow="block")
+    queue.drain()
+    queue.push(Key(1))
+    assert not queue.push(Key(2))
+    assert queue.push_many([Key(3)]) == 0
+    assert queue.dropped == 2
+
+
+def test_coalescing():
+    queue = EventQueue(capacity=3)
+    queue.push_many([MouseMove(0, 0), Key(1), MouseMove(1, 1), MouseMove(2, 2)])
+    assert queue.coalesced == 2
+
+    # Coalesced event keeps position of the first one and data of the last
+    events = queue.drain()
+    assert [type(event) for event in events] == [MouseMove, Key]
+    assert (events[0].x, events[0].y) == (2, 2)
+
+    # Drained event is not replaced
+    queue.push(MouseMove(3, 3))
+    queue.drain(limit=1)
+    queue.push(MouseMove(4, 4))
+    assert [event.x for event in queue.drain()] == [4]
+
+    # Dropped event is not replaced either
+    queue.push_many([MouseMove(5, 5), Key(2), Key(3), Key(4), MouseMove(6, 6)])
+    events = queue.drain()
+    assert [type(event) for event in events] == [Key, Key, MouseMove]
+    assert events[-1].x == 6
+
+
+def test_dispatch():
+    queue = EventQueue()
+    keys = []
+    ups = []
+
+    def on_key(event):
+        keys.append(event.code)
+
+    queue.subscribe(Key, on_key)
+    queue.subscribe(KeyUp, lambda event: ups.append(event.code))
+    assert len(queue.handlers(KeyUp)) == 2
+    assert queue.handlers(MouseMove) == ()
+
+    queue.push_many([Key(1), KeyUp(2), MouseMove(0, 0)])
+    assert queue.process() == 3
+    assert keys == [1, 2]
+    assert ups == [2]
+
+    queue.unsubscribe(Key, on_key)
+    queue.push(KeyUp(3))
+    queue.process()
+    assert keys == [1, 2]
+    assert ups == [2, 3]
+
+    with pytest.raises(ValueError):
+        queue.unsubscribe(Key, on_key)
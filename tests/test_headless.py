@@ -0,0 +1,62 @@
+"""Tests for eaf.headless module."""
+
+import pytest
+
+from eaf.app import Application
+from eaf.headless import Batch, Runner
+from eaf.state import State
+
+
+class Counter(State):
+    """Counts simulated time of its application."""
+
+    def postinit(self):
+        self.elapsed = 0
+        # Registration runs with application activated
+        self.owner = Application.current()
+
+    def events(self):
+        pass
+
+    def update(self, dt):
+        assert Application.current() is self.app
+        self.elapsed += dt
+
+    def result(self):
+        return self.elapsed
+
+
+def test_batch():
+    batch = Batch(Counter, apps=3, dt=10)
+    assert all(app.state.owner is app for app in batch.apps)
+
+    batch.step(5)
+    stats = batch.stats(shard=2)
+    assert stats.shard == 2
+    assert stats.apps == 3
+    assert stats.frames == 5
+    assert len(stats.frame_times) == 5
+    assert stats.fps > 0
+    assert stats.results == [50, 50, 50]
+    assert stats.as_dict()["results"] == [50, 50, 50]
+
+    batch.close()
+    assert batch.apps == []
+
+
+@pytest.mark.parametrize("mode", ["lockstep", "free"])
+def test_runner(mode):
+    runner = Runner(Counter, shards=2, apps=2, dt=5, mode=mode)
+    assert runner.mode == mode
+
+    stats = runner.run(frames=4)
+    assert [shard.shard for shard in stats] == [0, 1]
+    assert all(shard.frames == 4 for shard in stats)
+    assert all(shard.results == [20, 20] for shard in stats)
+
+
+def test_runner_arguments():
+    with pytest.raises(ValueError):
+        Runner(Counter, shards=1, mode="async")
+    with pytest.raises(ValueError):
+        Runner(Counter, shards=0)
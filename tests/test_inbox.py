@@ -0,0 +1,28 @@
+"""Tests for eaf.inbox module."""
+
+from eaf.inbox import Inbox
+
+
+def test_inbox():
+    inbox = Inbox(history=4)
+    handled = []
+
+    assert inbox.drain() == 0
+
+    inbox.post(handled.append, 1)
+    inbox.post_many([(handled.append, (2,)), (handled.extend, ([3, 4],))])
+    assert len(inbox) == 3
+
+    # Calls posted while draining wait for the next drain
+    inbox.post(lambda: inbox.post(handled.append, 5))
+    assert inbox.drain() == 4
+    assert handled == [1, 2, 3, 4]
+    assert len(inbox) == 1
+
+    assert inbox.drain() == 1
+    assert handled == [1, 2, 3, 4, 5]
+    assert inbox.handled == 5
+
+    assert list(inbox.depth) == [0, 4, 1]
+    assert len(inbox.latency) == 4
+    assert inbox.latency.min >= 0
@@ -0,0 +1,138 @@
+"""Tests for eaf.loop module."""
+
+import asyncio
+import gc
+
+import pytest
+
+from eaf.app import Application
+from eaf.loop import AsyncioLoop, ManualLoop, TornadoLoop, create_loop
+
+from .common import StateMock
+
+
+class CountingState(StateMock):
+    def update(self, dt):
+        pass
+
+    def render(self, alpha=1.0):
+        pass
+
+
+def test_manual_loop():
+    loop = ManualLoop(start=10.0)
+    calls = []
+
+    loop.call_at(10.5, lambda: calls.append(("at", loop.time())))
+    cancelled = loop.call_at(10.2, lambda: calls.append("cancelled"))
+    loop.call_soon(lambda: calls.append("soon"))
+    cancelled.cancel()
+
+    loop.advance(0.4)
+    assert calls == ["soon"]
+    assert loop.time() == pytest.approx(10.4)
+
+    loop.advance(1.0)
+    assert calls == ["soon", ("at", 10.5)]
+    assert loop.time() == pytest.approx(11.4)
+
+    # Nothing is scheduled, run returns right away
+    loop.run()
+
+
+def test_periodic():
+    loop = ManualLoop()
+    runs = []
+
+    handle = loop.call_every(0.1, lambda: runs.append(round(loop.time(), 3)))
+    loop.advance(0.35)
+    assert runs == [0.1, 0.2, 0.3]
+
+    handle.cancel()
+    loop.advance(1.0)
+    assert runs == [0.1, 0.2, 0.3]
+
+    # Missed runs are skipped, grid is kept
+    def slow():
+        runs.append(round(loop.time(), 3))
+        loop._time += 0.25
+
+    runs.clear()
+    loop = ManualLoop()
+    handle = loop.call_every(0.1, slow)
+    loop.advance(0.5)
+    assert runs == [0.1, 0.4]
+    handle.cancel()
+
+
+def test_application_on_manual_loop():
+    loop = ManualLoop()
+    app = Application(fps=10, pacing="deadline", loop=loop)
+    assert app.loop is loop
+    app.register(CountingState)
+
+    loop.advance(0.05)
+    assert app.frame_count == 1
+    loop.advance(0.3)
+    assert app.frame_count == 4
+
+    app.stop()
+    loop.advance(1.0)
+    assert app.frame_count == 4
+
+    # Run jumps through deadlines without waiting
+    stop_at = []
+
+    class StoppingState(CountingState):
+        def render(self, alpha=1.0):
+            if self.app.frame_count == 9:
+                stop_at.append(self.app.loop.time())
+                self.app.stop()
+
+    app.register(StoppingState)
+    app.state = StoppingState.__name__
+    app.start()
+    assert app.frame_count == 10
+    assert stop_at == [pytest.approx(loop.time())]
+
+
+def test_asyncio_loop():
+    loop = AsyncioLoop()
+    assert isinstance(loop.asyncio_loop, asyncio.AbstractEventLoop)
+    app = Application(fps=100, pacing="deadline", loop=loop)
+    results = []
+
+    class AwaitingState(CountingState):
+        def postinit(self):
+            self.app.spawn(self.load())
+
+        async def load(self):
+            await asyncio.sleep(0.02)
+            results.append(self.app.frame_count)
+            self.app.stop()
+
+    app.register(AwaitingState)
+    app.start()
+
+    # Frames kept running while coroutine was waiting
+    assert results and results[0] >= 1
+
+    # Application must not outlive closed loop as the current one
+    del app
+    gc.collect()
+    loop.asyncio_loop.close()
+
+
+def test_create_loop():
+    assert isinstance(create_loop("manual"), ManualLoop)
+    assert isinstance(create_loop("tornado"), TornadoLoop)
+    asyncio_loop = create_loop("asyncio")
+    assert isinstance(asyncio_loop, AsyncioLoop)
+    asyncio_loop.asyncio_loop.close()
+
+    with pytest.raises(ValueError):
+        create_loop("twisted")
+    coro = asyncio.sleep(0)
+    with pytest.raises(NotImplementedError):
+        ManualLoop().create_task(coro)
+    coro.close()
@@ -0,0 +1,121 @@
+"""Tests for eaf.pipeline module."""
+
+import io
+import threading
+
+import pytest
+
+from eaf.app import Application
+from eaf.core import Vec3
+from eaf.loop import ManualLoop
+from eaf.pipeline import RenderPipeline
+from eaf.render import DrawCommand, Renderable, Renderer, TextImage, TextRenderer
+from eaf.state import State
+
+
+class Scene(State):
+    def postinit(self):
+        self.obj = Renderable(Vec3(0, 0))
+        self.obj.image = TextImage("@")
+        self.add(self.obj)
+
+    def events(self):
+        pass
+
+    def update(self, dt):
+        pass
+
+
+class GatedRenderer(Renderer):
+    """Draws only when allowed, records drawn positions."""
+
+    def __init__(self):
+        super().__init__("gated")
+        self.started = threading.Event()
+        self.allowed = threading.Event()
+        self.drawn = []
+
+    def render_batch(self, key, commands):
+        self.started.set()
+        assert self.allowed.wait(5)
+        self.drawn.extend((command.x, command.y) for command in commands)
+
+
+def command(x):
+    return DrawCommand(x, 0, None, None)
+
+
+def test_application_pipeline():
+    screen = io.StringIO()
+    app = Application(
+        renderer=TextRenderer(screen, 3, 1),
+        loop=ManualLoop(),
+        pipeline_depth=2,
+    )
+    assert app.pipeline.depth == 2
+    app.register(Scene)
+
+    app.tick(1)
+    # Snapshot keeps position object had at the end of the frame
+    app.state.obj.pos = Vec3(2, 0)
+    assert app.pipeline.wait(5)
+    assert screen.getvalue() == "\x1b[1;1H\x1b[0m@  "
+    assert app.pipeline.rendered == 1
+    assert len(app.pipeline.latency) == 1
+
+    app.tick(1)
+    app.stop()
+    # Pending snapshots are rendered on stop
+    assert screen.getvalue().endswith("\x1b[1;1H\x1b[0m  @")
+    assert app.pipeline.rendered == 2
+
+
+def test_pipeline_drops_oldest():
+    renderer = GatedRenderer()
+    pipeline = RenderPipeline(renderer, depth=2)
+
+    pipeline.submit(((None, [command(1)]),))
+    assert renderer.started.wait(5)
+    pipeline.submit(((None, [command(2)]),))
+    pipeline.submit(((None, [command(3)]),))
+    assert pipeline.dropped == 1
+    assert not pipeline.wait(0.01)
+
+    renderer.allowed.set()
+    assert pipeline.wait(5)
+    assert renderer.drawn == [(1, 0), (3, 0)]
+    assert pipeline.rendered == 2
+
+    # Closed pipeline starts render thread again
+    pipeline.close()
+    pipeline.submit(((None, [command(4)]),))
+    pipeline.close()
+    assert renderer.drawn[-1] == (4, 0)
+
+
+def test_pipeline_errors():
+    class Broken(Renderer):
+        def render_batch(self, key, commands):
+            raise RuntimeError("broken")
+
+    pipeline = RenderPipeline(Broken("broken"))
+    pipeline.submit(((None, [command(1)]),))
+    with pytest.raises(RuntimeError):
+        pipeline.wait(5)
+    # Error is raised once
+    assert pipeline.wait(5)
+    pipeline.close()
+
+    class Retained(Renderer):
+        retained = True
+
+    class Legacy(Renderer):
+        def render_objects(self, objects):
+            pass
+
+    with pytest.raises(ValueError):
+        RenderPipeline(Retained("retained"))
+    with pytest.raises(ValueError):
+        RenderPipeline(Legacy("legacy"))
+    with pytest.raises(ValueError):
+        RenderPipeline(Renderer("dummy"), depth=1)
@@ -0,0 +1,121 @@
+"""Tests for eaf.pool module."""
+
+import gc
+
+import pytest
+
+from eaf.app import Application
+from eaf.core import Vec3
+from eaf.pool import Pool, gc_tuned
+from eaf.render import Renderable
+from eaf.state import State
+
+
+class Bullet(Renderable):
+    def __init__(self, pos, speed=1):
+        super().__init__(pos)
+        self.speed = speed
+        self.target = None
+
+    def reset(self):
+        self.target = None
+
+
+def test_pool():
+    pool = Pool(Bullet, limit=2)
+    pool.preallocate(1, Vec3())
+    assert len(pool) == 1
+    assert pool.created == 1
+
+    first = pool.acquire(Vec3(1, 1), speed=5)
+    assert first.pos == Vec3(1, 1)
+    assert first.speed == 5
+    assert pool.reused == 1
+
+    second = pool.acquire(Vec3(2, 2))
+    third = pool.acquire(Vec3(3, 3))
+    assert pool.created == 3
+    assert pool.in_use == 3
+    assert pool.high_water == 3
+
+    first.target = second
+    pool.release(first)
+    assert first.target is None
+    pool.release(second)
+    # Free objects above limit are left to GC
+    pool.release(third)
+    assert len(pool) == 2
+    assert pool.in_use == 0
+    assert pool.high_water == 3
+
+    with pytest.raises(ValueError):
+        pool.release(first)
+    # Objects dropped above limit are still known as released
+    with pytest.raises(ValueError):
+        pool.release(third)
+    with pytest.raises(ValueError):
+        pool.release(Bullet(Vec3()))
+    assert pool.in_use == 0
+
+    # The last released object is reused first
+    assert pool.acquire(Vec3(4, 4)) is second
+    assert second.speed == 1
+
+
+def test_pool_without_free_objects():
+    pool = Pool(Bullet, limit=0)
+    bullet = pool.acquire(Vec3())
+    pool.release(bullet)
+    with pytest.raises(ValueError):
+        pool.release(bullet)
+    assert (pool.in_use, pool.high_water, len(pool)) == (0, 1, 0)
+
+
+def test_state_spawn():
+    app = Application()
+    state = State(app)
+    pool = Pool(Bullet)
+
+    bullet = state.spawn(pool, Vec3(1, 2), speed=3)
+    assert list(state._objects) == [bullet]
+    assert pool.in_use == 1
+
+    state.remove(bullet)
+    assert len(state._objects) == 0
+    assert pool.in_use == 0
+    assert len(pool) == 1
+
+    # Removal in deferred block returns object when it's applied
+    again = state.spawn(pool, Vec3(5, 5))
+    assert again is bullet
+    with state.deferred():
+        state.remove(again)
+        assert pool.in_use == 1
+    assert pool.in_use == 0
+
+    # Objects not spawned from pool are left alone
+    plain = Bullet(Vec3())
+    state.add(plain)
+    state.remove(plain)
+    assert len(pool) == 1
+
+    app.stop()
+
+
+def test_gc_tuned():
+    threshold = gc.get_threshold()
+    with gc_tuned(threshold=(1000, 20, 30)):
+        assert gc.get_threshold() == (1000, 20, 30)
+        assert gc.get_freeze_count() > 0
+    assert gc.get_threshold() == threshold
+    assert gc.get_freeze_count() == 0
+
+    # Objects frozen before the block stay frozen
+    gc.freeze()
+    try:
+        frozen = gc.get_freeze_count()
+        with gc_tuned(threshold=None):
+            assert gc.get_threshold() == threshold
+        assert gc.get_freeze_count() >= frozen
+    finally:
+        gc.unfreeze()
@@ -0,0 +1,85 @@
+"""Tests for eaf.profiler module."""
+
+import io
+import json
+
+from eaf.app import Application
+from eaf.core import Vec3
+from eaf.profiler import PHASES, FrameProfiler, JsonLinesExporter
+from eaf.render import Renderable
+from eaf.state import State
+
+
+class ProfiledState(State):
+    def events(self):
+        pass
+
+
+class Moving(Renderable):
+    def update(self, dt):
+        self.pos += Vec3(1, 0, 0)
+
+
+def test_profiler_phases(monkeypatch):
+    app = Application()
+    app.register(ProfiledState)
+    assert app.profiler is None
+
+    profiler = FrameProfiler(history=10)
+    app.profiler = profiler
+    records = []
+    profiler.add_listener(records.append)
+
+    for _ in range(3):
+        app.tick()
+
+    assert profiler.frames == 3
+    assert len(records) == 3
+    assert records[0].state == "ProfiledState"
+    assert tuple(records[0].phases) == PHASES
+    assert records[-1].total >= sum(records[-1].phases.values())
+    assert records[-1].objects == {}
+
+    assert len(profiler.total) == 3
+    assert len(profiler.phase("update")) == 3
+    assert len(profiler.phase("update", state="ProfiledState")) == 3
+    assert len(profiler.phase("update", state="Missing")) == 0
+    assert profiler.states == ["ProfiledState"]
+    assert set(profiler.summary()) == {"total", *PHASES}
+
+    profiler.remove_listener(records.append)
+    app.profiler = None
+    app.tick()
+    assert profiler.frames == 3
+
+    app.stop()
+
+
+def test_profiler_objects_and_export():
+    app = Application()
+    app.register(ProfiledState)
+    app.state.add([Moving(Vec3()), Moving(Vec3())])
+
+    stream = io.StringIO()
+    profiler = FrameProfiler(track_objects=True)
+    profiler.add_listener(JsonLinesExporter(stream))
+    app.profiler = profiler
+
+    app.tick()
+    app.tick()
+
+    assert profiler.object_types == ["Moving"]
+    assert len(profiler.object_type("Moving")) == 2
+    assert len(profiler.object_type("Missing")) == 0
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["frame"] for line in lines] == [0, 1]
+    assert set(lines[0]["objects"]) == {"Moving"}
+    assert set(lines[0]["phases"]) == set(PHASES)
+
+    # Nothing is recorded outside of frame
+    profiler.lap("update")
+    profiler.record_object("Moving", 10)
+    assert profiler.end_frame() is None
+
+    app.stop()
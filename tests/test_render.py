@@ -0,0 +1,331 @@
+"""Tests for eaf.render module."""
+
+import io
+
+import pytest
+
+from eaf.core import Vec3
+from eaf.render import (
+    CellBuffer,
+    DamageTracker,
+    DrawCommand,
+    Image,
+    ImageCache,
+    Renderable,
+    Renderer,
+    RenderList,
+    TextImage,
+    TextRenderer,
+)
+
+
+class Background(Renderable):
+    render_priority = -1
+
+
+class Foreground(Renderable):
+    render_priority = 10
+
+
+def test_render_list():
+    fg = Foreground(Vec3())
+    bg = Background(Vec3())
+    first = Renderable(Vec3())
+    second = Renderable(Vec3())
+
+    objects = RenderList([fg, first])
+    objects.extend([bg, second])
+
+    assert len(objects) == 4
+    assert list(objects) == [bg, first, second, fg]
+    assert second in objects
+
+    # Adding the same object twice doesn't duplicate it
+    objects.add(first)
+    assert len(objects) == 4
+
+    objects.remove(first)
+    assert list(objects) == [bg, second, fg]
+    assert first not in objects
+
+    objects.remove(bg)
+    objects.add(first)
+    assert list(objects) == [second, first, fg]
+
+    with pytest.raises(ValueError):
+        objects.remove(bg)
+
+    objects.clear()
+    assert len(objects) == 0
+    assert list(objects) == []
+
+
+class Sprite(Image):
+    width = 2
+    height = 3
+
+
+def test_renderable_bounds():
+    obj = Renderable(Vec3(1, 2))
+    assert obj.bounds() == (1, 2, 0, 0)
+
+    obj.image = Sprite()
+    assert obj.bounds() == (1, 2, 2, 3)
+
+
+def test_scene_graph():
+    ship = Renderable(Vec3(10, 10))
+    turret = Renderable(Vec3(12, 10))
+    barrel = Renderable(Vec3())
+
+    ship.attach(turret)
+    turret.attach(barrel, local_pos=Vec3(1, 0))
+    assert turret.parent is ship
+    assert ship.children == (turret,)
+    assert list(ship.walk()) == [ship, turret, barrel]
+    assert turret.local_pos == Vec3(2, 0)
+    assert barrel.pos == Vec3(13, 10)
+
+    # World position is cached until an ancestor moves
+    assert barrel.pos is barrel.pos
+    ship.pos = Vec3(0, 5)
+    assert turret.pos == Vec3(2, 5)
+    assert barrel.pos == Vec3(3, 5)
+
+    # Setting world position of child changes its offset
+    turret.pos = Vec3(0, 0)
+    assert turret.local_pos == Vec3(0, -5)
+    assert barrel.pos == Vec3(1, 0)
+
+    barrel.local_pos = Vec3(0, 1)
+    assert barrel.pos == Vec3(0, 1)
+
+    with pytest.raises(ValueError):
+        barrel.attach(ship)
+    with pytest.raises(ValueError):
+        ship.detach(barrel)
+
+    # Detached child keeps its world position
+    ship.detach(turret)
+    assert turret.parent is None
+    assert turret.pos == Vec3(0, 0)
+    assert barrel.pos == Vec3(0, 1)
+
+    # Reattaching moves child from its old parent
+    ship.attach(barrel)
+    assert turret.children == ()
+    assert barrel.pos == Vec3(0, 1)
+    assert barrel.local_pos == Vec3(0, -4)
+
+
+class Blob(Image):
+    nbytes = 10
+
+    def __init__(self, key):
+        self.key = key
+
+
+def test_image_cache():
+    loaded = []
+
+    def load(key):
+        loaded.append(key)
+        return Blob(key)
+
+    cache = ImageCache(load, budget=25)
+    ship = cache.get("ship")
+    assert cache.get("ship") is ship
+    assert loaded == ["ship"]
+    assert (cache.hits, cache.misses, cache.resident) == (1, 1, 10)
+
+    cache.get("rock")
+    cache.get("ship")
+    # The least recently used image is evicted
+    cache.get("star")
+    assert "rock" not in cache
+    assert len(cache) == 2
+    assert (cache.resident, cache.evictions) == (20, 1)
+
+    # Evicted image is loaded again
+    assert cache.get("rock") is not None
+    assert loaded == ["ship", "rock", "star", "rock"]
+
+    big = Blob("big")
+    big.nbytes = 100
+    cache.put("big", big)
+    assert list(cache._images) == ["big"]
+    assert cache.resident == 100
+
+    # Loader may be passed per request
+    assert cache.get("other", Blob).key == "other"
+
+    cache.discard("other")
+    cache.clear()
+    assert cache.resident == 0
+    with pytest.raises(KeyError):
+        ImageCache().get("ship")
+    with pytest.raises(ValueError):
+        ImageCache(budget=0)
+
+
+def test_damage_tracker():
+    tracker = DamageTracker()
+    obj = Renderable(Vec3(1, 1))
+    obj.image = Sprite()
+    other = Renderable(Vec3(5, 5))
+
+    tracker.add(obj)
+    tracker.add(other)
+    assert tracker.take() == ([obj, other], [], [(1, 1, 2, 3), (5, 5, 0, 0)])
+    assert tracker.take() == ([], [], [])
+
+    # Moved object damages both old and new place
+    obj.pos = Vec3(2, 1)
+    tracker.mark(obj)
+    tracker.mark(obj)
+    assert tracker.take() == ([obj], [], [(1, 1, 2, 3), (2, 1, 2, 3)])
+
+    tracker.remove(other)
+    assert tracker.take() == ([], [other], [(5, 5, 0, 0)])
+
+    # Object removed before it was rendered doesn't damage anything
+    new = Renderable(Vec3())
+    tracker.add(new)
+    tracker.remove(new)
+    assert tracker.take() == ([], [], [])
+
+
+class BatchRenderer(Renderer):
+    def __init__(self):
+        super().__init__("batch")
+        self.batches = []
+
+    def batch_key(self, obj):
+        return obj._image
+
+    def render_batch(self, key, commands):
+        self.batches.append((key, commands))
+
+
+class LegacyRenderer(Renderer):
+    def __init__(self):
+        super().__init__("legacy")
+        self.frames = []
+
+    def render_objects(self, objects):
+        self.frames.append(list(objects))
+
+
+def test_renderer_submit():
+    renderer = BatchRenderer()
+    rock, ship = Sprite(), Sprite()
+
+    bg = Background(Vec3())
+    bg.image = rock
+    first = Renderable(Vec3(1, 2))
+    first.image = rock
+    second = Renderable(Vec3(3, 4))
+    second.image = ship
+    third = Renderable(Vec3(5, 6))
+    third.image = rock
+
+    renderer.begin_frame()
+    renderer.submit([bg, first, second, third])
+    # Objects are grouped by key within layer only
+    assert renderer.batches == [
+        (rock, [DrawCommand(0, 0, rock, bg)]),
+        (rock, [DrawCommand(1, 2, rock, first), DrawCommand(5, 6, rock, third)]),
+        (ship, [DrawCommand(3, 4, ship, second)]),
+    ]
+    assert renderer.draw_calls == 3
+    assert renderer.state_switches == 2
+
+    renderer.begin_frame()
+    assert (renderer.draw_calls, renderer.state_switches) == (0, 0)
+
+    # Renderers without render_batch receive the whole frame
+    legacy = LegacyRenderer()
+    legacy.submit([bg, first, second])
+    assert legacy.frames == [[bg, first, second]]
+    assert legacy.draw_calls == 1
+
+
+def test_cell_buffer():
+    buffer = CellBuffer(5, 2)
+    assert buffer.get(0, 0) == (" ", 0)
+
+    buffer.put(1, 1, "x", 3)
+    buffer.put(10, 10, "y")
+    assert buffer.get(1, 1) == ("x", 3)
+
+    # Text is clipped by grid
+    buffer.write(-1, 0, "abcdefg", 1)
+    assert [buffer.get(x, 0)[0] for x in range(5)] == list("bcdef")
+    buffer.write(0, 5, "abc")
+
+    previous = CellBuffer(5, 2)
+    previous.copy_from(buffer)
+    assert list(buffer.diff(previous)) == []
+
+    buffer.clear()
+    assert buffer.get(1, 1) == (" ", 0)
+
+
+def test_cell_buffer_diff():
+    previous = CellBuffer(10, 2)
+    buffer = CellBuffer(10, 2)
+    buffer.write(0, 0, "ab")
+    buffer.write(4, 0, "cd")
+    buffer.write(8, 1, "e", 2)
+
+    assert list(buffer.diff(previous)) == [(0, 0, "ab", 0), (4, 0, "cd", 0), (8, 1, "e", 2)]
+    # Short unchanged gaps are rewritten instead of moving cursor
+    assert list(buffer.diff(previous, gap=2)) == [(0, 0, "ab  cd", 0), (8, 1, "e", 2)]
+
+    # Gap with other attribute can't be merged
+    previous.put(2, 0, " ", 5)
+    buffer.put(2, 0, " ", 5)
+    assert list(buffer.diff(previous, gap=2))[:2] == [(0, 0, "ab", 0), (4, 0, "cd", 0)]
+
+
+def test_text_renderer():
+    screen = io.StringIO()
+    renderer = TextRenderer(screen, 6, 2)
+    assert renderer.get_width() == 6
+    assert renderer.get_height() == 2
+
+    obj = Renderable(Vec3(1, 0))
+    obj.image = TextImage("ab\ncd", attr=31)
+    assert (obj.image.width, obj.image.height) == (2, 2)
+
+    renderer.clear()
+    renderer.render_objects([obj, Renderable(Vec3())])
+    renderer.present()
+    # The first frame is written fully
+    assert screen.getvalue() == (
+        "\x1b[1;1H\x1b[0m \x1b[0;31mab\x1b[0m   \x1b[2;1H \x1b[0;31mcd\x1b[0m   "
+    )
+
+    # Unchanged frame produces no output, submitted objects are drawn the same
+    screen.truncate(0)
+    screen.seek(0)
+    renderer.clear()
+    renderer.submit([obj])
+    renderer.present()
+    assert screen.getvalue() == ""
+    assert renderer.written == 0
+
+    obj.pos = Vec3(2, 0)
+    renderer.clear()
+    renderer.render_objects([obj])
+    renderer.present()
+    assert screen.getvalue() == "\x1b[1;2H\x1b[0m \x1b[0;31mab\x1b[2;2H\x1b[0m \x1b[0;31mcd"
+
+    screen.truncate(0)
+    screen.seek(0)
+    renderer.invalidate()
+    renderer.present()
+    assert screen.getvalue() == (
+        "\x1b[1;1H\x1b[0m  \x1b[0;31mab\x1b[0m  \x1b[2;1H  \x1b[0;31mcd\x1b[0m  "
+    )
+    assert renderer.written == len(screen.getvalue())
@@ -0,0 +1,258 @@
+"""Tests for eaf.spatial module."""
+
+import pytest
+
+from eaf.app import Application
+from eaf.core import Vec3
+from eaf.render import Image, Renderable, Renderer
+from eaf.spatial import SpatialHash, Viewport, overlaps
+from eaf.state import State
+
+
+class Big(Image):
+    width = 30
+    height = 30
+
+
+def test_overlaps():
+    assert overlaps((0, 0, 10, 10), (5, 5, 10, 10))
+    assert not overlaps((0, 0, 10, 10), (10, 0, 10, 10))
+    assert overlaps((5, 5, 0, 0), (0, 0, 10, 10))
+    assert not overlaps((10, 5, 0, 0), (0, 0, 10, 10))
+    assert overlaps((0, 0, 10, 10), (0, 0, 0, 0))
+    assert overlaps((1, 1, 0, 0), (1, 1, 0, 0))
+    assert not overlaps((1, 1, 0, 0), (1, 2, 0, 0))
+
+
+def test_spatial_hash():
+    index = SpatialHash(cell_size=10)
+    near = Renderable(Vec3(1, 1))
+    far = Renderable(Vec3(100, 100))
+    big = Renderable(Vec3(-5, -5))
+    big.image = Big()
+
+    for obj in (near, far, big):
+        index.insert(obj)
+
+    assert len(index) == 3
+    assert far in index
+    assert set(map(id, index.query_rect((0, 0, 20, 20)))) == {id(near), id(big)}
+    assert index.query_rect((90, 90, 20, 20)) == [far]
+    assert index.query_rect((50, 50, 5, 5)) == []
+    # Query larger than the number of occupied cells
+    assert len(index.query_rect((-1000, -1000, 2000, 2000))) == 3
+
+    far.pos = Vec3(2, 2)
+    index.update(far)
+    index.insert(far)
+    assert index.query_rect((90, 90, 20, 20)) == []
+    assert len(index.query_rect((0, 0, 5, 5))) == 3
+
+    index.remove(big)
+    assert big not in index
+    assert len(index.query_rect((20, 20, 5, 5))) == 0
+    with pytest.raises(KeyError):
+        index.remove(big)
+
+    index.clear()
+    assert len(index) == 0
+
+    with pytest.raises(ValueError):
+        SpatialHash(0)
+
+
+def test_query_radius():
+    index = SpatialHash(cell_size=10)
+    center = Renderable(Vec3(0, 0))
+    diagonal = Renderable(Vec3(8, 8))
+    big = Renderable(Vec3(12, -15))
+    big.image = Big()
+
+    for obj in (center, diagonal, big):
+        index.insert(obj)
+
+    # Square around center contains diagonal, circle doesn't
+    assert index.query_radius(Vec3(0, 0), 10) == [center]
+    # Distance is measured to the closest point of bounds
+    assert set(map(id, index.query_radius(Vec3(0, 0), 13))) == {id(center), id(diagonal), id(big)}
+    assert index.query_radius(Vec3(100, 100), 5) == []
+
+
+def test_pairs():
+    index = SpatialHash(cell_size=10)
+    first = Renderable(Vec3(5, 5))
+    first.image = Big()
+    second = Renderable(Vec3(20, 20))
+    second.image = Big()
+    lone = Renderable(Vec3(200, 200))
+    neighbour = Renderable(Vec3(6, 6))
+
+    for obj in (first, second, lone, neighbour):
+        index.insert(obj)
+
+    # First and second share many cells but are reported once
+    pairs = {frozenset((id(a), id(b))) for a, b in index.pairs()}
+    assert pairs == {frozenset((id(first), id(second))), frozenset((id(first), id(neighbour)))}
+    assert len(list(index.pairs())) == 2
+
+    neighbour.pos = Vec3(2, 2)
+    index.update(neighbour)
+    first.pos = Vec3(40, 40)
+    index.update(first)
+    assert len(list(index.pairs())) == 1
+    # Neighbour shares cell with nobody but doesn't intersect second either
+    second.pos = Vec3(5, 5)
+    index.update(second)
+    assert len(list(index.pairs(exact=False))) == 1
+    assert len(list(index.pairs())) == 0
+
+
+def test_refresh():
+    index = SpatialHash(cell_size=10)
+    obj = Renderable(Vec3(100, 0))
+    index.insert(obj)
+
+    # In-place change doesn't reach the index until refresh
+    obj.pos.add_scaled(Vec3(-1, 0), 92)
+    assert index.query_radius(Vec3(8, 0), 1) == []
+    index.refresh()
+    assert index.query_radius(Vec3(8, 0), 1) == [obj]
+
+
+class SizedRenderer(Renderer):
+    def __init__(self):
+        super().__init__("sized")
+        self.rendered = []
+
+    def render_objects(self, objects):
+        self.rendered = list(objects)
+
+    def get_width(self):
+        return 80
+
+    def get_height(self):
+        return 24
+
+
+class Foreground(Renderable):
+    render_priority = 1
+
+
+def test_viewport():
+    viewport = Viewport()
+    assert viewport.rect(SizedRenderer()) == (0, 0, 80, 24)
+    assert viewport.rect(Renderer("dummy")) is None
+    assert Viewport(Vec3(5, 5), 10, 10).rect(Renderer("dummy")) == (5, 5, 10, 10)
+
+
+def test_state_culling():
+    renderer = SizedRenderer()
+    app = Application(renderer=renderer)
+    state = State(app)
+
+    top = Foreground(Vec3(10, 10))
+    visible = Renderable(Vec3(10, 10))
+    hidden = Renderable(Vec3(100, 10))
+    state.add([top, visible, hidden])
+
+    state.render()
+    assert renderer.rendered == [visible, hidden, top]
+
+    state.viewport = Viewport()
+    assert state.spatial_index is not None
+    state.render()
+    assert renderer.rendered == [visible, top]
+
+    # Index follows moving objects
+    hidden.pos = Vec3(20, 20)
+    visible.pos = Vec3(-1, 0)
+    state.render()
+    assert renderer.rendered == [hidden, top]
+
+    state.viewport.pos = Vec3(-10, 0)
+    state.render()
+    assert renderer.rendered == [visible, hidden, top]
+
+    state.remove(top)
+    state.render()
+    assert renderer.rendered == [visible, hidden]
+
+    state.viewport = None
+    state.render()
+    assert renderer.rendered == [visible, hidden]
+
+    app.stop()
+
+
+class Drifter(Renderable):
+    """Moves in place, without calling pos setter."""
+
+    def update(self, dt):
+        self.pos.add_scaled(Vec3(-1, 0), dt)
+
+
+def test_state_index_in_place_movement():
+    renderer = SizedRenderer()
+    app = Application(renderer=renderer)
+    state = State(app)
+    state.viewport = Viewport(width=10, height=10)
+
+    drifter = Drifter(Vec3(100, 0))
+    state.add(drifter)
+    state.render()
+    assert renderer.rendered == []
+
+    state.update(92)
+    assert drifter.pos == Vec3(8, 0)
+    assert state.spatial_index.query_radius(Vec3(8, 0), 1) == [drifter]
+    state.render()
+    assert renderer.rendered == [drifter]
+
+    # Moved in place outside of update is picked up by the next update
+    drifter.pos.x = 50
+    state.update(0)
+    state.render()
+    assert renderer.rendered == []
+
+    app.stop()
+
+
+class Cargo(Renderable):
+    """Moves only with its parent."""
+
+    def update(self, dt):
+        pass
+
+
+def test_state_index_children_moved_in_place():
+    renderer = SizedRenderer()
+    app = Application(renderer=renderer)
+    state = State(app)
+    state.viewport = Viewport(width=10, height=10)
+
+    drifter = Drifter(Vec3(100, 0))
+    cargo = Cargo(Vec3(0, 0))
+    drifter.attach(cargo, local_pos=Vec3(1, 1))
+    state.add(drifter)
+
+    # Parent moved in place takes its child with it
+    state.update(92)
+    assert cargo.pos == Vec3(9, 1)
+    assert state.spatial_index.query_radius(Vec3(9, 1), 0.5) == [cargo]
+    state.render()
+    assert renderer.rendered == [drifter, cargo]
+
+    drifter.pos.set(50, 0)
+    state.update(0)
+    state.render()
+    assert renderer.rendered == []
+
+    # Child moved in place keeps its new offset when parent moves
+    drifter.pos = Vec3(5, 0)
+    cargo.pos.add_scaled(Vec3(0, 1), 2)
+    state.update(1)
+    assert cargo.local_pos == Vec3(1, 3)
+    assert cargo.pos == Vec3(5, 3)
+    assert state.spatial_index.query_radius(Vec3(5, 3), 0.5) == [cargo]
+
+    app.stop()
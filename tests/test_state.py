@@ -2,9 +2,24 @@
 
 import pytest
 
+from eaf.app import Application
+from eaf.core import Vec3
+from eaf.render import Renderable, Renderer
 from eaf.state import State
 
 
+class Compound(Renderable):
+    compound = True
+    render_priority = 1
+
+    def __init__(self, pos):
+        super().__init__(pos)
+        self.parts = [Renderable(pos), Renderable(pos)]
+
+    def get_renderable_objects(self):
+        return self.parts
+
+
 def test_state(mock_application):
     app = mock_application()
     state = State(app)
@@ -21,5 +36,203 @@ def test_state(mock_application):
     state.update(0)
     state.render()
 
-    assert state._objects == []
-    # TODO: add tests for add and remove
+    assert list(state._objects) == []
+
+
+def test_state_add_remove(mock_application):
+    state = State(mock_application())
+
+    compound = Compound(Vec3())
+    simple = Renderable(Vec3())
+
+    state.add(compound)
+    state.add([simple])
+    assert list(state._objects) == [*compound.parts, simple, compound]
+
+    state.remove(compound)
+    assert list(state._objects) == [simple]
+
+    # Removing missing object is logged, not raised
+    state.remove(compound)
+    assert list(state._objects) == [simple]
+
+
+def test_state_deferred_changes(mock_application):
+    state = State(mock_application())
+
+    class Spawner(Renderable):
+        def update(self, dt):
+            bullet = Bullet(self.pos)
+            state.add(bullet)
+            assert bullet not in state._objects
+
+    class Bullet(Renderable):
+        def update(self, dt):
+            state.remove(self)
+            assert self in state._objects
+
+    spawner = Spawner(Vec3())
+    state.add(spawner)
+
+    state.update(0)
+    assert len(state._objects) == 2
+
+    # New bullet is spawned, the old one removes itself
+    state.update(0)
+    assert len(state._objects) == 2
+
+    with state.deferred():
+        with state.deferred():
+            state.remove(spawner)
+        assert spawner in state._objects
+    assert spawner not in state._objects
+
+
+class Part(Renderable):
+    def update(self, dt):
+        pass
+
+
+def test_state_scene_graph(mock_application):
+    state = State(mock_application())
+
+    ship = Part(Vec3())
+    turret = Part(Vec3())
+    ship.attach(turret)
+    state.add(ship)
+    assert list(state._objects) == [ship, turret]
+
+    # Children attached to state's objects are added to state
+    barrel = Part(Vec3())
+    turret.attach(barrel)
+    assert list(state._objects) == [ship, turret, barrel]
+
+    ship.detach(turret)
+    assert list(state._objects) == [ship]
+
+    # During update attachments are applied after all objects are updated
+    class Launcher(Renderable):
+        def update(self, dt):
+            self.attach(turret)
+            assert turret not in state._objects
+
+    launcher = Launcher(Vec3())
+    state.add(launcher)
+    state.update(0)
+    assert list(state._objects) == [ship, launcher, turret, barrel]
+
+    # Removed child is detached from parent
+    state.remove(turret)
+    assert launcher.children == ()
+    assert list(state._objects) == [ship, launcher]
+
+
+def test_state_deferred_detach(mock_application):
+    state = State(mock_application())
+
+    ship = Part(Vec3())
+    turret = Part(Vec3())
+    ship.attach(turret)
+    other = Part(Vec3())
+
+    class Wrecker(Renderable):
+        def update(self, dt):
+            # Child removed from state and detached in the same frame
+            state.remove(turret)
+            ship.detach(turret)
+            state.add(other)
+            state.remove(self)
+
+    wrecker = Wrecker(Vec3())
+    state.add([ship, wrecker])
+    state.update(0)
+    assert list(state._objects) == [ship, other]
+    assert turret.parent is None
+
+    # Attachment to object removed in the same frame is skipped
+    class Loader(Renderable):
+        def update(self, dt):
+            other.attach(turret)
+            state.remove(other)
+
+    state.add(Loader(Vec3()))
+    state.update(0)
+    assert turret not in state._objects
+    assert turret._observer is None
+
+
+def test_state_flush_failed_change(mock_application):
+    state = State(mock_application())
+
+    class Broken(Renderable):
+        @property
+        def render_priority(self):
+            raise RuntimeError("broken")
+
+    first, second = Renderable(Vec3()), Renderable(Vec3())
+    with pytest.raises(RuntimeError):
+        with state.deferred():
+            state.add(first)
+            state.add(Broken(Vec3()))
+            state.add(second)
+    # Changes after the failed one are applied too
+    assert list(state._objects) == [first, second]
+
+
+class RetainedRenderer(Renderer):
+    retained = True
+
+    def __init__(self):
+        super().__init__("retained")
+        self.frames = []
+
+    def clear(self):
+        raise AssertionError("Retained renderer must not be cleared")
+
+    def render_changes(self, changed, removed, regions):
+        self.frames.append((changed, removed, regions))
+
+
+def test_state_retained_render():
+    renderer = RetainedRenderer()
+    app = Application(renderer=renderer)
+    state = State(app)
+
+    moving = Renderable(Vec3(0, 0))
+    still = Renderable(Vec3(5, 5))
+    state.add([moving, still])
+    state.render()
+    assert renderer.frames == [([moving, still], [], [(0, 0, 0, 0), (5, 5, 0, 0)])]
+
+    # Nothing changed, nothing rendered
+    state.render()
+    assert len(renderer.frames) == 1
+
+    moving.pos += Vec3(1, 0)
+    state.render()
+    assert renderer.frames[-1] == ([moving], [], [(0, 0, 0, 0), (1, 0, 0, 0)])
+
+    state.remove(still)
+    state.render()
+    assert renderer.frames[-1] == ([], [still], [(5, 5, 0, 0)])
+
+    # Removed objects are not tracked anymore
+    still.pos = Vec3()
+    state.render()
+    assert len(renderer.frames) == 3
+
+    # Moving parent damages its children
+    parent = Renderable(Vec3())
+    child = Renderable(Vec3(1, 1))
+    parent.attach(child)
+    state.add(parent)
+    state.render()
+    parent.pos = Vec3(2, 0)
+    state.render()
+    assert renderer.frames[-1] == (
+        [parent, child],
+        [],
+        [(0, 0, 0, 0), (2, 0, 0, 0), (1, 1, 0, 0), (3, 1, 0, 0)],
+    )
+
+    app.stop()
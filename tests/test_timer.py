@@ -1,6 +1,10 @@
 """Tests for eaf.timer module."""
 
-from eaf.timer import Timer
+import math
+
+import pytest
+
+from eaf.timer import Scheduler, Timer
 
 
 def test_timer_elapsed() -> None:
@@ -10,3 +14,104 @@ def test_timer_elapsed() -> None:
         assert timer.elapsed >= 0.0
         timer.update(13)
         assert timer.elapsed >= 0.0
+
+
+def test_timer_lifecycle() -> None:
+    fired = []
+    timer = Timer(1.0, lambda: fired.append(True))
+    assert not timer.running
+    assert timer.remaining == 1.0
+
+    timer.start()
+    timer.update(400)
+    assert timer.running
+    assert math.isclose(timer.elapsed, 0.4)
+
+    timer.stop()
+    timer.update(1000)
+    assert not fired
+    assert math.isclose(timer.remaining, 0.6)
+
+    timer.restart()
+    timer.update(999)
+    assert not fired
+    timer.update(1)
+    assert fired == [True]
+    assert not timer.running
+    assert timer.elapsed == 1.0
+
+    timer.reset()
+    assert timer.elapsed == 0.0
+
+    timer.fire_function()
+    assert fired == [True, True]
+
+
+def test_timer_shared_scheduler() -> None:
+    scheduler = Scheduler()
+    fired = []
+    timer = Timer(1.0, lambda: fired.append(scheduler.time), scheduler=scheduler)
+    timer.start()
+
+    # Owner advances shared scheduler, update is a no-op
+    timer.update(5000)
+    assert not fired
+    scheduler.advance(1500)
+    assert fired == [1.0]
+
+
+def test_scheduler() -> None:
+    scheduler = Scheduler()
+    calls = []
+
+    first = scheduler.call_later(0.5, lambda: calls.append(("first", scheduler.time)))
+    scheduler.call_later(0.2, lambda: calls.append(("second", scheduler.time)))
+    repeating = scheduler.call_every(0.3, lambda: calls.append(("repeat", scheduler.time)))
+    cancelled = scheduler.call_later(0.1, lambda: calls.append(("cancelled", scheduler.time)))
+    assert len(scheduler) == 4
+
+    cancelled.cancel()
+    assert cancelled.cancelled
+    assert len(scheduler) == 3
+
+    assert scheduler.advance(700) == 4
+    assert [name for name, _ in calls] == ["second", "repeat", "first", "repeat"]
+    assert [round(t, 6) for _, t in calls] == [0.2, 0.3, 0.5, 0.6]
+    assert math.isclose(scheduler.time, 0.7)
+    assert first.cancelled
+    assert repeating.active
+    assert len(scheduler) == 1
+
+    repeating.pause()
+    assert repeating.paused
+    assert math.isclose(repeating.remaining, 0.2)
+    assert scheduler.advance(1000) == 0
+
+    repeating.resume()
+    assert repeating.active
+    assert math.isclose(repeating.deadline, 1.9)
+
+    scheduler.pause()
+    assert scheduler.advance(1000) == 0
+    scheduler.resume()
+    assert not scheduler.paused
+    assert scheduler.advance(200) == 1
+
+    repeating.cancel()
+    assert len(scheduler) == 0
+    assert scheduler.advance(10000) == 0
+
+    with pytest.raises(ValueError):
+        scheduler.call_every(0, lambda: None)
+
+
+def test_scheduler_many_cancelled() -> None:
+    scheduler = Scheduler()
+    handles = [scheduler.call_later(1.0, lambda: None) for _ in range(1000)]
+    for handle in handles[:900]:
+        handle.cancel()
+
+    assert len(scheduler) == 100
+    # Stale heap entries are dropped
+    assert len(scheduler._heap) < 1000
+    assert scheduler.advance(1000) == 100
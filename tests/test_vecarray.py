@@ -0,0 +1,87 @@
+"""Tests for eaf.vecarray module."""
+
+import pytest
+
+from eaf.core import Vec3
+
+
+np = pytest.importorskip("numpy")
+
+from eaf.vecarray import Vec3Array, Vec3Proxy  # noqa: E402
+
+
+def test_vec3array_conversion():
+    vecs = [Vec3(1, 2, 3), Vec3(4, 5, 6)]
+    array = Vec3Array.from_vecs(vecs)
+
+    assert len(array) == 2
+    assert array.data.shape == (3, 2)
+    assert array.x.tolist() == [1, 4]
+    assert array.to_vecs() == vecs
+    assert repr(array) == "Vec3Array(size=2, dtype=float64)"
+
+    assert len(Vec3Array.from_vecs([])) == 0
+    assert Vec3Array(3, dtype=np.float32).data.dtype == np.float32
+
+    with pytest.raises(ValueError):
+        Vec3Array.from_array(np.zeros((2, 3)))
+
+
+def test_vec3array_operations():
+    a = Vec3Array.from_vecs([Vec3(1, 1, 1), Vec3(2, 2, 2)])
+    b = Vec3Array.from_vecs([Vec3(10, 20, 30), Vec3(10, 20, 30)])
+
+    assert (a + b).to_vecs() == [Vec3(11, 21, 31), Vec3(12, 22, 32)]
+    assert (b - a).to_vecs() == [Vec3(9, 19, 29), Vec3(8, 18, 28)]
+    assert (a + Vec3(1, 2, 3)).to_vecs() == [Vec3(2, 3, 4), Vec3(3, 4, 5)]
+    assert (a - 1).to_vecs() == [Vec3(0, 0, 0), Vec3(1, 1, 1)]
+    assert (a * 2).to_vecs() == [Vec3(2, 2, 2), Vec3(4, 4, 4)]
+    assert (a / 2).to_vecs() == [Vec3(0.5, 0.5, 0.5), Vec3(1, 1, 1)]
+    # Per-vector factors
+    assert (a * np.array([3, 0])).to_vecs() == [Vec3(3, 3, 3), Vec3(0, 0, 0)]
+
+    data = a.data
+    a += b
+    a -= Vec3(10, 20, 30)
+    a *= 3
+    a /= 3
+    assert a.data is data
+    assert a.to_vecs() == [Vec3(1, 1, 1), Vec3(2, 2, 2)]
+
+    a.add_scaled(b, 0.5)
+    assert a.to_vecs() == [Vec3(6, 11, 16), Vec3(7, 12, 17)]
+    assert a == a.copy()
+    assert a != b
+
+    for operand in ("a", [1, 2, 3]):
+        with pytest.raises(ValueError):
+            a + operand
+    with pytest.raises(ValueError):
+        a * Vec3(1, 1, 1)
+    with pytest.raises(ValueError):
+        a /= b
+
+
+def test_vec3array_views():
+    array = Vec3Array.from_vecs([Vec3(1, 2, 3), Vec3(4, 5, 6), Vec3(7, 8, 9)])
+
+    proxy = array[1]
+    assert isinstance(proxy, Vec3Proxy)
+    assert isinstance(proxy, Vec3)
+    assert proxy == Vec3(4, 5, 6)
+    assert proxy + Vec3(1, 1, 1) == Vec3(5, 6, 7)
+    assert array[-1] == Vec3(7, 8, 9)
+
+    proxy.x = 40
+    assert array.x[1] == 40
+
+    array[0] = Vec3(0, 0, 0)
+    assert array[0] == Vec3(0, 0, 0)
+
+    tail = array[1:]
+    tail += 1
+    assert array.to_vecs() == [Vec3(0, 0, 0), Vec3(41, 6, 7), Vec3(8, 9, 10)]
+    assert [vec.z for vec in array] == [0, 7, 10]
+
+    with pytest.raises(IndexError):
+        array[3]